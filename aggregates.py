@@ -0,0 +1,152 @@
+import heapq, time
+
+# ════════════════════════════════════════════════════════
+#        AGGREGATES (leaderboard + rolling time buckets)
+# ════════════════════════════════════════════════════════
+# প্রতিটি "t" / "o" রেকর্ডেই আপডেট হয় (লাইভ আর journal replay দুটোতেই), তাই snapshot এ
+# রাখলে restart এর পরেও থাকে। স্ক্রিন শুধু নির্দিষ্ট সংখ্যক bucket পড়ে — ইউজার সংখ্যার
+# সাথে খরচ বাড়ে না।
+#   নম্বর দেওয়া: key "service|country"      OTP: key service
+MINUTES = 60    # শেষ ৬০ মিনিট, মিনিট প্রতি
+HOURS   = 48    # শেষ ৪৮ ঘণ্টা, ঘণ্টা প্রতি
+DAYS    = 30    # শেষ ৩০ দিন, দিন প্রতি
+TOP_N   = 10
+
+
+class Rolling:
+    """width সেকেন্ডের n টা bucket এর ring; প্রতিটি bucket {key: গণনা}"""
+    __slots__ = ("width", "idx", "counts")
+
+    def __init__(self, width, n):
+        self.width  = width
+        self.idx    = [-1] * n     # slot এ কোন bucket (ts // width) আছে
+        self.counts = [None] * n
+
+    def add(self, ts, key, n=1):
+        b = int(ts) // self.width
+        j = b % len(self.idx)
+        if self.idx[j] != b:
+            if self.idx[j] > b:
+                return   # window এর বাইরের পুরনো ইভেন্ট
+            self.idx[j], self.counts[j] = b, {}
+        c = self.counts[j]
+        c[key] = c.get(key, 0) + n
+
+    def series(self, k, now=None):
+        """শেষ k টা bucket, পুরনো থেকে নতুন — প্রতিটি {key: গণনা}"""
+        b = int(time.time() if now is None else now) // self.width
+        out = []
+        for i in range(b - min(k, len(self.idx)) + 1, b + 1):
+            j = i % len(self.idx)
+            out.append(self.counts[j] if self.idx[j] == i >= 0 else {})   # -1 = খালি slot
+        return out
+
+    def sum(self, k, now=None):
+        """শেষ k টা bucket মিলিয়ে {key: গণনা}"""
+        out = {}
+        for c in self.series(k, now):
+            for key, n in c.items():
+                out[key] = out.get(key, 0) + n
+        return out
+
+    def __getstate__(self):
+        return self.width, self.idx, self.counts
+
+    def __setstate__(self, st):
+        self.width, self.idx, self.counts = st
+
+
+class TopN:
+    """
+    মোট নম্বর অনুযায়ী শীর্ষ n ইউজার। মোট শুধু বাড়ে, তাই শীর্ষ n এর বাইরের কেউ ভেতরে
+    ঢুকলে সবচেয়ে ছোটটা বের হয় — পুরো USER_STATS আর sort করতে হয় না।
+    """
+
+    def __init__(self, n=TOP_N):
+        self.n     = n
+        self.items = {}   # uid → total
+
+    def update(self, uid, total):
+        items = self.items
+        if uid in items or len(items) < self.n:
+            items[uid] = total
+            return
+        low = min(items, key=items.get)
+        if total > items[low]:
+            del items[low]
+            items[uid] = total
+
+    def rebuild(self, stats):
+        self.items = dict(heapq.nlargest(self.n, ((s, st.get("total", 0)) for s, st in stats.items()),
+                                         key=lambda x: x[1]))
+
+    def top(self, k):
+        return sorted(self.items.items(), key=lambda x: x[1], reverse=True)[:k]
+
+
+class Aggregates:
+    def __init__(self):
+        self.assigned = {"minute": Rolling(60, MINUTES), "hour": Rolling(3600, HOURS), "day": Rolling(86400, DAYS)}
+        self.otps     = {"minute": Rolling(60, MINUTES), "hour": Rolling(3600, HOURS), "day": Rolling(86400, DAYS)}
+        self.assigned_total = {}   # service → সব সময়ের মোট নম্বর
+        self.otp_total      = {}   # service → সব সময়ের মোট OTP
+        self.top = TopN()           # snapshot এ যায় না — লোডের পর USER_STATS থেকে rebuild
+
+    def on_assign(self, ts, service, country, n):
+        key = f"{service}|{country}"
+        for r in self.assigned.values():
+            r.add(ts, key, n)
+        self.assigned_total[service] = self.assigned_total.get(service, 0) + n
+
+    def on_otp(self, ts, service):
+        for r in self.otps.values():
+            r.add(ts, service)
+        self.otp_total[service] = self.otp_total.get(service, 0) + 1
+
+    def hit_rate(self, service=None):
+        """OTP পাওয়া / নম্বর দেওয়া (সব সময়ের)"""
+        if service is None:
+            a, o = sum(self.assigned_total.values()), sum(self.otp_total.values())
+        else:
+            a, o = self.assigned_total.get(service, 0), self.otp_total.get(service, 0)
+        return o / a if a else 0.0
+
+    def __getstate__(self):
+        return {"assigned": self.assigned, "otps": self.otps,
+                "assigned_total": self.assigned_total, "otp_total": self.otp_total}
+
+    def __setstate__(self, st):
+        self.__dict__.update(st)
+        self.top = TopN()
+
+    # SQLite settings এ JSON হিসেবে রাখার জন্য
+    def dump(self):
+        return {
+            "assigned": {k: r.__getstate__() for k, r in self.assigned.items()},
+            "otps":     {k: r.__getstate__() for k, r in self.otps.items()},
+            "assigned_total": self.assigned_total, "otp_total": self.otp_total,
+        }
+
+    @classmethod
+    def restore(cls, d):
+        """Aggregates (pickle snapshot থেকে), dump() এর dict, বা None → Aggregates"""
+        if isinstance(d, cls):
+            return d
+        agg = cls()
+        if d:
+            for name in ("assigned", "otps"):
+                for k, st in d.get(name, {}).items():
+                    getattr(agg, name)[k].__setstate__(tuple(st))
+            agg.assigned_total = dict(d.get("assigned_total", {}))
+            agg.otp_total      = dict(d.get("otp_total", {}))
+        return agg
+
+
+SPARK = "▁▂▃▄▅▆▇█"
+
+
+def sparkline(values):
+    hi = max(values, default=0)
+    if not hi:
+        return SPARK[0] * len(values)
+    return "".join(SPARK[min(int(v / hi * (len(SPARK) - 1) + 0.5), len(SPARK) - 1)] for v in values)
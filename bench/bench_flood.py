@@ -0,0 +1,92 @@
+"""
+Flood control — (১) প্রতি update এ flood_guard এর খরচ, (২) একজন ইউজার একটানা
+"🔄 নতুন নম্বর" (country_ callback) চাপছে আর বাকিরা স্বাভাবিকভাবে নম্বর নিচ্ছে:
+কতগুলো চাপ আসলে নম্বর বরাদ্দ পর্যন্ত গেল, আর বাকিদের latency। FLOOD_CONTROL বন্ধ/চালু দুইভাবেই।
+
+    python bench/bench_flood.py [--spam 2000] [--users 50] [--n 200000]
+"""
+import argparse, asyncio, os, sys, tempfile, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import stubs
+from bench_suite import make_inventory, pct
+
+SPAMMER = 555
+
+
+async def dispatch(bot, update, ctx):
+    """Application এর মতো: group -1 এ guard, থামালে আসল handler বাদ"""
+    try:
+        await bot.flood_guard(update, ctx)
+    except bot.ApplicationHandlerStop:
+        return False
+    await bot.callback_handler(update, ctx)
+    return True
+
+
+async def scenario(bot, a, services, on):
+    bot.config.FLOOD_CONTROL = on
+    bot.FLOOD = bot.KeyedLimiter(bot.config.FLOOD_LIMITS)
+    ctx    = stubs.context()
+    target = f"country_{services[0]}|Country00"
+    passed = 0
+    lat    = []
+
+    async def spam():
+        nonlocal passed
+        for _ in range(a.spam):
+            passed += await dispatch(bot, stubs.callback_update(SPAMMER, target), ctx)
+            await asyncio.sleep(0)
+
+    async def user(uid):
+        for i in range(4):
+            t0 = time.perf_counter()
+            await dispatch(bot, stubs.callback_update(uid, f"country_{services[i % len(services)]}|Country01"), ctx)
+            lat.append((time.perf_counter() - t0) * 1000)
+            await asyncio.sleep(0.01)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(spam(), *(user(2_000_000 + u) for u in range(a.users)))
+    wall = time.perf_counter() - t0
+    lat.sort()
+    print(f"flood {'on ' if on else 'off'}   spam {a.spam} → handler এ {passed:5d}   "
+          f"অন্যদের p50 {pct(lat, 0.5):7.2f}  p95 {pct(lat, 0.95):7.2f} ms   wall {wall:.2f}s")
+
+
+def guard_cost(bot, n):
+    bot.config.FLOOD_CONTROL = True
+    bot.FLOOD = bot.KeyedLimiter({"default": (1e9, 1e9)})   # সব ALLOW — শুধু guard এর খরচ
+    ctx = stubs.context()
+    ups = [stubs.callback_update(1_000 + i % 5000, "svc_x") for i in range(n)]
+
+    async def go():
+        t0 = time.perf_counter_ns()
+        for u in ups:
+            await bot.flood_guard(u, ctx)
+        return (time.perf_counter_ns() - t0) / n
+    print(f"flood_guard (allow)  {asyncio.run(go()):6.0f} ns/update  |  buckets {len(bot.FLOOD)}")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--spam",  type=int, default=2000)
+    ap.add_argument("--users", type=int, default=50)
+    ap.add_argument("--n",     type=int, default=200_000)
+    a = ap.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="flood_")
+    services = make_inventory(workdir, 2, 2, a.spam * 2 + a.users * 10)
+    os.chdir(workdir)
+    import bot
+    bot.print = lambda *x, **kw: None
+    bot.load_data()
+    bot.SERVICES[:] = services
+    guard_cost(bot, a.n)
+    for on in (False, True):
+        asyncio.run(scenario(bot, a, services, on))
+
+
+if __name__ == "__main__":
+    main()
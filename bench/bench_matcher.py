@@ -0,0 +1,82 @@
+"""
+পুরনো linear find_users বনাম suffix-indexed OtpIndex.find — গতি ও ফলাফল মিলিয়ে দেখা।
+
+    python bench/bench_matcher.py [--users 30000] [--queries 2000]
+"""
+import argparse, os, random, sys, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from matcher import OtpIndex, clean, is_match
+
+
+def legacy_find_users(last_numbers, prefix, hidden, suffix):
+    out = []
+    for uid_s, nums in last_numbers.items():
+        for n in (nums or []):
+            if is_match(prefix, hidden, suffix, clean(n)):
+                out.append((int(uid_s), n))
+                break
+    return out
+
+
+def make_users(n, per_user=4, seed=1):
+    rnd = random.Random(seed)
+    last = {}
+    for i in range(n):
+        nums = []
+        for _ in range(per_user):
+            cc = rnd.choice(["880", "20", "234", "0"])
+            nums.append(cc + "".join(rnd.choice("0123456789") for _ in range(10)))
+        last[str(1_000_000 + i)] = nums
+    return last
+
+
+def make_queries(last, n, seed=2):
+    rnd = random.Random(seed)
+    all_nums = [x for nums in last.values() for x in nums]
+    qs = []
+    for _ in range(n):
+        real = clean(rnd.choice(all_nums)) if rnd.random() < 0.8 else "".join(rnd.choice("0123456789") for _ in range(12))
+        hidden = rnd.choice([3, 4])
+        slen   = rnd.choice([2, 3, 4])
+        plen   = rnd.choice([4, 6])
+        if len(real) < plen + hidden + slen:
+            continue
+        start = rnd.choice([0, 1]) if real.startswith("0") else 0
+        v = real[start:]
+        qs.append((v[:plen], hidden, v[len(v) - slen:]))
+    return qs
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--users",   type=int, default=30000)
+    ap.add_argument("--queries", type=int, default=2000)
+    args = ap.parse_args()
+
+    last = make_users(args.users)
+    qs   = make_queries(last, args.queries)
+
+    t0  = time.perf_counter()
+    idx = OtpIndex()
+    idx.rebuild(last)
+    build = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    old = [legacy_find_users(last, *q) for q in qs]
+    t_old = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    new = [idx.find(*q) for q in qs]
+    t_new = time.perf_counter() - t0
+
+    mismatch = sum(a != b for a, b in zip(old, new))
+    print(f"users={args.users}  queries={len(qs)}  index build={build * 1e3:.1f} ms")
+    print(f"legacy : {t_old / len(qs) * 1e3:9.3f} ms/query")
+    print(f"indexed: {t_new / len(qs) * 1e3:9.3f} ms/query  ({t_old / max(t_new, 1e-9):.0f}x)")
+    print(f"mismatches: {mismatch}")
+    sys.exit(1 if mismatch else 0)
+
+
+if __name__ == "__main__":
+    main()
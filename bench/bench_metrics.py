@@ -0,0 +1,74 @@
+"""
+Instrumentation এর overhead — (১) counter/histogram/handler wrapper প্রতি কলে কত ns,
+(২) bench_suite একবার METRICS=0 আর একবার METRICS=1 দিয়ে চালিয়ে প্রতিটি scenario র p50 তুলনা।
+
+    python bench/bench_metrics.py [--n 200000] [--suite-args "--countries 10 --users 20000"]
+"""
+import argparse, asyncio, json, os, shlex, subprocess, sys, tempfile, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+import metrics
+
+
+def per_call(fn, n):
+    t0 = time.perf_counter_ns()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter_ns() - t0) / n
+
+
+def micro(n):
+    c = metrics.Counter("bench_counter", "bench", ("kind",))
+    h = metrics.Histogram("bench_seconds", "bench", ("kind",))
+
+    async def noop(update, context):
+        return None
+    wrapped = metrics.handler("bench", action=lambda u: "x")(noop)
+
+    async def loop(fn):
+        t0 = time.perf_counter_ns()
+        for _ in range(n):
+            await fn(None, None)
+        return (time.perf_counter_ns() - t0) / n
+
+    base = asyncio.run(loop(noop))
+    wrap = asyncio.run(loop(wrapped))
+    print(f"Counter.inc        {per_call(lambda: c.inc('a'), n):8.0f} ns")
+    print(f"Histogram.observe  {per_call(lambda: h.observe(0.003, 'a'), n):8.0f} ns")
+    print(f"handler wrapper    {wrap - base:8.0f} ns  (async call {base:.0f} → {wrap:.0f} ns)")
+    t0 = time.perf_counter()
+    text = metrics.render()
+    print(f"render /metrics    {(time.perf_counter() - t0) * 1000:8.2f} ms  ({len(text):,} bytes)")
+
+
+def suite(args):
+    rows = {}
+    for flag in ("0", "1"):
+        out = os.path.join(tempfile.mkdtemp(prefix="metrics_"), "r.json")
+        env = dict(os.environ, METRICS=flag, METRICS_PORT="0")
+        cmd = [sys.executable, os.path.join(ROOT, "bench", "bench_suite.py"), "--out", out] + shlex.split(args)
+        subprocess.run(cmd, env=env, check=True, stdout=subprocess.DEVNULL)
+        with open(out) as f:
+            rows[flag] = json.load(f)["scenarios"]
+    print(f"\n{'scenario':<18} {'off p50':>10} {'on p50':>10}  overhead")
+    for name, off in rows["0"].items():
+        on = rows["1"][name]
+        print(f"{name:<18} {off['p50_ms']:>9.3f}  {on['p50_ms']:>9.3f}   {(on['p50_ms'] / off['p50_ms'] - 1) * 100 if off['p50_ms'] else 0:+6.1f}%")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=200_000)
+    ap.add_argument("--suite-args", default="--countries 10 --users 20000 --iters 300 --upload-lines 20000")
+    ap.add_argument("--no-suite", action="store_true")
+    a = ap.parse_args()
+    if not metrics.ENABLED:
+        sys.exit("METRICS=0 সেট আছে — micro benchmark এর জন্য instrumentation চালু রাখো")
+    micro(a.n)
+    if not a.no_suite:
+        suite(a.suite_args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+পুরনো parse_masked/get_otp, দুই-scan (parse_masked_all + get_otp) বনাম এক-পাসের otp_parse.parse — রেকর্ড করা গ্রুপ পোস্টের corpus এ গতি (msg/s)।
+ফলাফল একই কিনা সেটা tests/test_otp_parse.py তে।
+
+    python bench/bench_otp_parse.py [--corpus bench/otp_corpus.jsonl] [--rounds 50]
+"""
+import argparse, json, os, re, sys, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from otp_parse import get_otp, parse, parse_masked_all
+
+
+def legacy_parse_masked(text):
+    results = []
+    for m in re.finditer(r'(\d+)([Ⓐ-ⓩ]+)(\d+)', text):
+        results.append((m.group(1), len(m.group(2)), m.group(3)))
+    return results
+
+
+def legacy_get_otp(text):
+    for p in [
+        r'(?i)(?:otp|code|verification|pin|কোড)[:\s\-]+(\d{4,8})',
+        r'(?i)(?:is|হলো)\s*[:\-]?\s*(\d{4,8})',
+        r'\b(\d{4,8})\b',
+    ]:
+        m = re.search(p, text)
+        if m:
+            return m.group(1)
+    return None
+
+
+def legacy(text):
+    masked = legacy_parse_masked(text)
+    return masked, (legacy_get_otp(text) if masked else None)
+
+
+def two_scans(text):
+    """parse() এর এক-পাসের আগের রূপ: mask এর scan, তারপর কোডের জন্য আবার পুরো লেখা"""
+    masked = parse_masked_all(text)
+    return masked, (get_otp(text) if masked else None)
+
+
+def rate(fn, texts, rounds, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(rounds):
+            for t in texts:
+                fn(t)
+        best = min(best, time.perf_counter() - t0)
+    return rounds * len(texts) / best
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--corpus", default=os.path.join(ROOT, "bench", "otp_corpus.jsonl"))
+    ap.add_argument("--rounds", type=int, default=50)
+    a = ap.parse_args()
+
+    with open(a.corpus, encoding="utf-8") as f:
+        texts = [json.loads(line)["text"] for line in f if line.strip()]
+
+    circled = [t for t in texts if legacy_parse_masked(t)]
+    found   = sum(1 for t in texts if parse(t)[0])
+    print(f"corpus: {len(texts)} msg  |  masked: legacy {len(circled)}  new {found}")
+
+    # পুরো corpus এ নতুন parser বেশি মেসেজে OTP খোঁজে, তাই একই কাজের তুলনা circled subset এ
+    for label, sample in (("all", texts), ("circled", circled)):
+        old = rate(legacy, sample, a.rounds)
+        two = rate(two_scans, sample, a.rounds)
+        new = rate(parse, sample, a.rounds)
+        print(f"{label:<8} legacy {old:>10,.0f} msg/s  |  two scans {two:>10,.0f}  |  "
+              f"parse {new:>10,.0f} msg/s  ({new / old:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
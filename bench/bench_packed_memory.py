@@ -0,0 +1,70 @@
+"""
+প্রতি নম্বরে কত মেমোরি লাগে: str ভিত্তিক pool বনাম packed (array / mmap) pool।
+
+    python bench/bench_packed_memory.py [--numbers 1000000] [--seen 0.3]
+"""
+import argparse, gc, os, random, sys, tempfile, time, tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from packed import load_txt_packed
+from pool import NumberPool
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    t0  = time.perf_counter()
+    obj = build()
+    dt  = time.perf_counter() - t0
+    cur, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, cur, dt
+
+
+def str_pool(numbers, seen):
+    # আগের রূপ: stock set + shuffled unseen list + seen dict, সব str
+    stock = set(numbers)
+    sd    = dict(seen)
+    queue = [n for n in stock if n not in sd]
+    random.shuffle(queue)
+    return stock, sd, queue
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--numbers", type=int,   default=1_000_000)
+    ap.add_argument("--seen",    type=float, default=0.3)
+    args = ap.parse_args()
+
+    rnd     = random.Random(0)
+    numbers = [f"8801{rnd.randrange(10**9):09d}" for _ in range(args.numbers)]
+    now     = time.time()
+    seen    = {n: now for n in rnd.sample(numbers, int(args.numbers * args.seen))}
+
+    with tempfile.TemporaryDirectory() as d:
+        txt, binp = os.path.join(d, "BD.txt"), os.path.join(d, "BD.bin")
+        with open(txt, "w") as f:
+            f.write("\n".join(numbers))
+        load_txt_packed(txt, binp)   # .bin ক্যাশ তৈরি
+
+        fresh = lambda: [x.strip() for x in open(txt) if x.strip()]
+        rows = []
+        _, m, t = measure(lambda: str_pool(fresh(), seen))
+        rows.append(("str set/list", m, t))
+        nums = fresh()
+        _, m, t = measure(lambda: NumberPool(nums, seen))
+        rows.append(("packed array", m, t))
+        del nums
+        _, m, t = measure(lambda: NumberPool(load_txt_packed(txt, binp), seen))
+        rows.append(("packed mmap", m, t))
+        size = os.path.getsize(binp)
+
+    n = args.numbers
+    print(f"numbers={n:,}  seen={len(seen):,}  (.bin on disk {size / 2**20:.1f} MiB, page cache, heap এ গোনা হয়নি)")
+    print(f"{'layout':<14} {'heap MiB':>9} {'bytes/number':>13} {'build s':>8}")
+    for name, m, t in rows:
+        print(f"{name:<14} {m / 2**20:>9.1f} {m / n:>13.1f} {t:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
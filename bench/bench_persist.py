@@ -0,0 +1,90 @@
+"""
+প্রতি ক্লিকে save_data() বনাম WriteBehind.mark_dirty() বনাম journal রেকর্ডের খরচ, ইউজার সংখ্যা অনুযায়ী।
+শেষ কলামে ডিস্কে লেখার খরচও ধরা (fsync সহ, ক্লিক প্রতি ভাগ করে) — snapshot এ সেটা ইউজার সংখ্যার
+সাথে বাড়ে, journal এ বাড়ে না।
+
+    python bench/bench_persist.py [--users 1000,10000,50000] [--clicks 200]
+"""
+import argparse, asyncio, json, os, sys, tempfile, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from journal import Journal
+from persist import WriteBehind, atomic_write
+
+
+def make_state(n_users):
+    stats, last, hist = {}, {}, {}
+    for i in range(n_users):
+        s = str(1_000_000 + i)
+        stats[s] = {"total": 8, "services": {"WhatsApp": {"Bangladesh": 8}}}
+        last[s]  = [f"88017{i:08d}"[:13], f"88018{i:08d}"[:13]]
+        hist[s]  = [{"service": "WhatsApp", "country": "Bangladesh",
+                     "number": f"+88017{i:08d}"[:14], "time": "01 Jan 2026 10:00"}] * 4
+    return {"USER_STATS": stats, "USER_LAST_NUMBERS": last, "USER_HISTORY": hist,
+            "USERS": list(range(n_users))}
+
+
+def per_click_old(state, path, clicks):
+    t0 = time.perf_counter()
+    for _ in range(clicks):
+        with open(path, "w") as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+    return (time.perf_counter() - t0) / clicks
+
+
+async def per_click_new(state, path, clicks):
+    def serialize(keys):
+        blob = json.dumps(state, ensure_ascii=False, separators=(",", ":"))
+        return lambda: atomic_write(path, blob)
+    store = WriteBehind(serialize, interval=2.0, batch=10_000)
+    store.start()
+    t0 = time.perf_counter()
+    for i in range(clicks):
+        store.mark_dirty(str(i))
+        await asyncio.sleep(0)   # হ্যান্ডলারের মধ্যে লুপে ফিরে যাওয়ার মতো
+    elapsed = (time.perf_counter() - t0) / clicks
+    await store.stop()
+    return elapsed
+
+
+async def per_click_journal(state, path, clicks):
+    """(loop এ প্রতি ক্লিকের খরচ, ডিস্ক সহ মোট খরচ/ক্লিক)"""
+    journal = Journal(path, lambda d, rec: None)
+    atomic_write(path, json.dumps(state, ensure_ascii=False, separators=(",", ":")))
+    journal.load()
+    store = WriteBehind(lambda keys: journal.take(), interval=0.05, batch=10_000)
+    store.start()
+    t0 = time.perf_counter()
+    loop_s = 0.0
+    for i in range(clicks):
+        c0 = time.perf_counter()
+        journal.append(("t", str(i), "WhatsApp", "Bangladesh", 2, ["8801700000000", "8801800000000"],
+                        "01 Jan 2026 10:00", "01 Jan 2026  10:00"))
+        store.mark_dirty(str(i))
+        loop_s += time.perf_counter() - c0
+        await asyncio.sleep(0.001)   # ক্লিকের মাঝে বিরতি, যাতে batch গুলো আসলেই লেখা হয়
+    await store.stop()
+    total = time.perf_counter() - t0 - clicks * 0.001
+    journal.close(compact=False)
+    return loop_s / clicks, max(total, 0) / clicks
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--users",  default="1000,10000,50000")
+    ap.add_argument("--clicks", type=int, default=50)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "user_data.json")
+        print(f"{'users':>8}  {'save_data/click':>16}  {'mark_dirty/click':>17}  {'journal/click':>14}  {'journal+disk/click':>19}")
+        for n in map(int, args.users.split(",")):
+            state = make_state(n)
+            old = per_click_old(state, path, args.clicks)
+            new = asyncio.run(per_click_new(state, path, args.clicks))
+            jl, jt = asyncio.run(per_click_journal(state, path, args.clicks))
+            print(f"{n:>8}  {old * 1e3:>13.2f} ms  {new * 1e6:>14.2f} µs  {jl * 1e6:>11.2f} µs  {jt * 1e6:>16.2f} µs")
+
+
+if __name__ == "__main__":
+    main()
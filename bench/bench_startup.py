@@ -0,0 +1,112 @@
+"""
+Cold start — বড় user_data নিয়ে bot.py আলাদা প্রসেসে চালিয়ে মাপে:
+  প্রথম getUpdates পর্যন্ত (update নেওয়া শুরু) আর আগে থেকেই অপেক্ষমাণ একটা OTP পোস্ট
+  ইউজারের কাছে পৌঁছানো পর্যন্ত সময়। প্রথম রান পুরনো user_data.json থেকে (shutdown এ
+  user_data.bin লেখা হয়), দ্বিতীয় রান সেই .bin থেকে।
+
+    python bench/bench_startup.py [--users 50000] [--history 5] [--runs 2]
+"""
+import argparse, asyncio, json, os, random, re, shutil, signal, sys, tempfile, time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+from bench_suite import CIRCLED
+from fake_api import FakeBotApi
+
+TOKEN    = "123:FAKE"
+GROUP_ID = -1001234567890
+TARGET   = 4242
+NUMBER   = "4479001234567"   # বাকিদের নম্বর 88017… — mask শুধু এই ইউজারের সাথে মেলে
+LOAD_RE  = re.compile(r"\[LOAD\] ⚡ startup state (\d+) ms")
+
+
+def make_state(path, users, history):
+    rnd, uids = random.Random(3), list(range(1_000_000, 1_000_000 + users))
+    stats, hist, active, last = {}, {}, {}, {}
+    for u in uids:
+        s, n = str(u), rnd.randint(1, 40)
+        stats[s]  = {"total": n, "services": {"WhatsApp": {f"Country{rnd.randrange(20):02d}": n}}}
+        hist[s]   = [{"service": "WhatsApp", "country": "Country01", "number": f"+88017{rnd.randrange(10**8):08d}",
+                      "time": "01 Jan 2026 10:00"} for _ in range(history)]
+        active[s] = "01 Jan 2026  10:00"
+        last[s]   = [f"88017{rnd.randrange(10**8):08d}" for _ in range(2)]
+    last[str(TARGET)] = [NUMBER]
+    hist[str(TARGET)] = [{"service": "WhatsApp", "country": "UK", "number": NUMBER, "time": "01 Jan 2026 10:00"}]
+    state = {
+        "USER_STATS": stats, "USER_LAST_NUMBERS": last, "USER_LAST_ACTIVE": active, "USER_HISTORY": hist,
+        "BANNED": [], "ADMINS": [], "USERS": uids + [TARGET], "OTP_LOG": [], "NUMBER_LIMIT": 4,
+        "SERVICES": ["WhatsApp", "Telegram"],
+    }
+    with open(path, "w") as f:
+        json.dump(state, f, ensure_ascii=False)
+
+
+async def run_once(workdir, label):
+    api = await FakeBotApi(TOKEN).start()
+    mask = "".join(random.choice(CIRCLED) for _ in range(len(NUMBER) - 7))
+    api.group_post(GROUP_ID, f"🔔 WhatsApp\n📱 {NUMBER[:4]}{mask}{NUMBER[-3:]}\n🔑 Code: 123456")
+    got = {}
+
+    def on_call(ts, method, params, result):
+        if method == "getUpdates":
+            got.setdefault("updates", ts)
+        elif method == "sendMessage" and str(params.get("chat_id")) == str(TARGET):
+            got.setdefault("otp", ts)
+    api.listeners.append(on_call)
+
+    env = dict(os.environ, BOT_TOKEN=TOKEN, BOT_API_URL=api.base_url, BOT_FILE_URL=api.base_file_url,
+               OTP_GROUP_ID=str(GROUP_ID), METRICS_PORT="0", PYTHONUNBUFFERED="1")
+    t0   = time.monotonic()
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable, os.path.join(os.path.dirname(ROOT), "bot.py"), cwd=workdir, env=env,
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT)
+    state_ms = None
+
+    async def read():
+        nonlocal state_ms
+        async for line in proc.stdout:
+            m = LOAD_RE.search(line.decode(errors="replace"))
+            if m:
+                state_ms = int(m.group(1))
+    reader = asyncio.create_task(read())
+    deadline = t0 + 120
+    while "otp" not in got and time.monotonic() < deadline and proc.returncode is None:
+        await asyncio.sleep(0.005)
+    proc.send_signal(signal.SIGINT)
+    t_stop = time.monotonic()
+    await proc.wait()
+    shutdown = time.monotonic() - t_stop
+    await reader
+    await api.stop()
+
+    def ms(k):
+        return f"{(got[k] - t0) * 1000:8.0f}" if k in got else "       —"
+    print(f"{label:<22} {state_ms if state_ms is not None else '—':>8}  {ms('updates')}  {ms('otp')}  {shutdown * 1000:8.0f}")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--users",   type=int, default=50_000)
+    ap.add_argument("--history", type=int, default=5, help="প্রতি ইউজারের History এন্ট্রি")
+    ap.add_argument("--runs",    type=int, default=2, help="প্রথমটা JSON থেকে, বাকিগুলো .bin থেকে")
+    ap.add_argument("--workdir")
+    a = ap.parse_args()
+
+    workdir = os.path.abspath(a.workdir or tempfile.mkdtemp(prefix="botstart_"))
+    os.makedirs(workdir, exist_ok=True)
+    data = os.path.join(workdir, "user_data.json")
+    make_state(data, a.users, a.history)
+    print(f"{a.users:,} users, user_data.json {os.path.getsize(data) / 1024 / 1024:.1f} MB  ({workdir})\n")
+    print(f"{'run':<22} {'state ms':>8}  {'polling':>8}  {'otp sent':>8}  {'shutdown':>8}   (ms, spawn থেকে)")
+    bin_path = os.path.join(workdir, "user_data.bin")
+    for _ in range(a.runs):
+        label = "user_data.bin" if os.path.exists(bin_path) else "user_data.json"
+        asyncio.run(run_once(workdir, label))
+    if os.path.exists(bin_path):
+        print(f"\nuser_data.bin {os.path.getsize(bin_path) / 1024 / 1024:.1f} MB")
+    if not a.workdir:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+"""
+নেটওয়ার্ক ছাড়া bot.py এর hot path গুলোর benchmark — synthetic inventory আর ইউজার বানিয়ে
+stub Update/Bot দিয়ে handler চালায়। প্রতিটি scenario র p50/p95/p99 latency আর
+memory peak JSON এ লেখে, আগের রানের JSON দিলে regression দেখায়।
+
+    python bench/bench_suite.py [--services 10] [--countries 50] [--numbers 2000] [--users 100000]
+                                [--backend json|sqlite] [--out result.json] [--baseline old.json]
+    পুরো স্কেল: --numbers 100000  (১০ × ৫০ × ১ লাখ নম্বর, কয়েক GB ডিস্ক লাগে)
+"""
+import argparse, asyncio, gc, json, os, platform, random, resource, sys, tempfile, time, tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import stubs
+
+CODES   = ["880", "20", "234", "62", "91", "92", "94", "977", "855", "84"]
+CIRCLED = [chr(c) for c in range(0x24B6, 0x24EA)]
+
+
+# ════════════════════════════════════════════════════════
+#                 SYNTHETIC DATA
+# ════════════════════════════════════════════════════════
+def rand_number(rnd):
+    return rnd.choice(CODES) + str(rnd.getrandbits(34) % 10**10).zfill(10)
+
+
+def make_inventory(workdir, services, countries, per_country, seed=1):
+    rnd = random.Random(seed)
+    names = [f"Service{i}" for i in range(services)]
+    for svc in names:
+        d = os.path.join(workdir, "numbers", svc)
+        os.makedirs(d, exist_ok=True)
+        for c in range(countries):
+            with open(os.path.join(d, f"Country{c:02d}.txt"), "w") as f:
+                f.write("\n".join(rand_number(rnd) for _ in range(per_country)) + "\n")
+    return names
+
+
+def make_users(workdir, n, services, seed=2):
+    rnd = random.Random(seed)
+    last, stats, active, history = {}, {}, {}, {}
+    for i in range(n):
+        uid = str(1_000_000 + i)
+        nums = [rand_number(rnd) for _ in range(4)]
+        last[uid]   = nums
+        svc         = rnd.choice(services)
+        stats[uid]  = {"total": rnd.randint(1, 500), "services": {svc: {"Country00": 4}}}
+        active[uid] = "01 Jan 2026  10:00"
+        history[uid] = [
+            {"service": svc, "country": "Country00", "number": f"+{x}", "time": "01 Jan 2026 10:00"}
+            for x in nums
+        ]
+    state = {
+        "USER_STATS": stats, "USER_LAST_NUMBERS": last, "USER_LAST_ACTIVE": active,
+        "USER_HISTORY": history, "BANNED": [], "ADMINS": [], "USERS": [int(u) for u in last],
+        "OTP_LOG": [], "NUMBER_LIMIT": 4, "SERVICES": services,
+    }
+    with open(os.path.join(workdir, "user_data.json"), "w") as f:
+        json.dump(state, f)
+    return last
+
+
+def make_otp_posts(last, count, seed=3):
+    """অর্ধেক পোস্ট কোনো ইউজারের নম্বরে মিলবে, বাকিগুলো মিলবে না"""
+    rnd  = random.Random(seed)
+    uids = list(last)
+    posts = []
+    for i in range(count):
+        n = rnd.choice(last[rnd.choice(uids)]) if i % 2 == 0 else rand_number(rnd)
+        mask = "".join(rnd.choice(CIRCLED) for _ in range(len(n) - 7))
+        posts.append(f"🔔 WhatsApp OTP\n📱 {n[:4]}{mask}{n[-3:]}\n🔑 Code: {rnd.randint(1000, 999999)}")
+    return posts
+
+
+def make_upload(path, lines, seed=4):
+    """৫% ভুল লাইন, ৫% আগের লাইনের ডুপ্লিকেট (+ সহ)"""
+    rnd  = random.Random(seed)
+    prev = rand_number(rnd)
+    with open(path, "w") as f:
+        for i in range(lines):
+            r = i % 20
+            if r == 0:
+                f.write("not-a-number\n")
+            elif r == 1:
+                f.write(f"+{prev}\n")
+            else:
+                prev = rand_number(rnd)
+                f.write(prev + "\n")
+
+
+# ════════════════════════════════════════════════════════
+#                 MEASUREMENT
+# ════════════════════════════════════════════════════════
+def pct(sorted_ms, q):
+    return sorted_ms[min(len(sorted_ms) - 1, int(q * len(sorted_ms)))]
+
+
+async def measure(name, fn, iters, mem_iters=5):
+    """fn(i) sync বা async; timing আর memory আলাদা পাসে, যাতে tracemalloc টাইমিং না বাড়ায়"""
+    async def call(i):
+        r = fn(i)
+        if asyncio.iscoroutine(r):
+            await r
+
+    await call(0)   # warmup
+    lat = []
+    for i in range(1, iters + 1):
+        t0 = time.perf_counter_ns()
+        await call(i)
+        lat.append((time.perf_counter_ns() - t0) / 1e6)
+
+    gc.collect()
+    tracemalloc.start()
+    for i in range(iters + 1, iters + 1 + mem_iters):
+        await call(i)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    lat.sort()
+    row = {
+        "iters":  iters,
+        "p50_ms": round(pct(lat, 0.50), 4),
+        "p95_ms": round(pct(lat, 0.95), 4),
+        "p99_ms": round(pct(lat, 0.99), 4),
+        "max_ms": round(lat[-1], 4),
+        "mem_peak_kb": round(peak / 1024, 1),
+    }
+    print(f"{name:<18} p50 {row['p50_ms']:>9.3f}  p95 {row['p95_ms']:>9.3f}  p99 {row['p99_ms']:>9.3f} ms"
+          f"  |  peak {row['mem_peak_kb']:>10,.1f} KB")
+    return row
+
+
+def compare(results, baseline_path, tolerance):
+    with open(baseline_path) as f:
+        base = json.load(f)["scenarios"]
+    worse = 0
+    print(f"\n── vs {baseline_path} (p95, >{tolerance:.0%} = regression) ──")
+    for name, row in results.items():
+        if name not in base:
+            continue
+        old, new = base[name]["p95_ms"], row["p95_ms"]
+        ratio = new / old if old else 1.0
+        flag = "❌" if ratio > 1 + tolerance else "✅"
+        worse += flag == "❌"
+        print(f"{name:<18} {old:>9.3f} → {new:>9.3f} ms  ({ratio:.2f}x) {flag}")
+    return worse
+
+
+# ════════════════════════════════════════════════════════
+#                 SCENARIOS
+# ════════════════════════════════════════════════════════
+async def run(a, workdir):
+    import config
+    import bot
+    from storage_sqlite import migrate
+
+    services  = [f"Service{i}" for i in range(a.services)]
+    countries = [f"Country{c:02d}" for c in range(a.countries)]
+    admin     = config.ADMIN_IDS[0]
+    rnd       = random.Random(5)
+    results   = {}
+
+    if bot.DB:
+        t0 = time.perf_counter()
+        migrate(bot.DB, bot.JOURNAL, config.NUMBER_DIR, config.SEEN_DIR)
+        print(f"sqlite migrate: {time.perf_counter() - t0:.1f}s")
+
+    t0 = time.perf_counter()
+    bot.load_data()
+    bot.POOLS.warm(bot.SERVICES, bot.get_countries)
+    print(f"load + warm: {time.perf_counter() - t0:.1f}s\n")
+
+    # প্রতি OTP তে bot.py এর লগ লাইন আউটপুট ভরিয়ে ফেলে
+    bot.print = lambda *a, **kw: None
+    ctx = stubs.context()
+    bot.OUTBOX.start(ctx.bot)
+    posts = make_otp_posts(bot.USER_LAST_NUMBERS, 2000)
+
+    results["show_service_list"] = await measure(
+        "show_service_list", lambda i: bot.show_service_list(stubs.callback_update(1, "refresh_services"), ctx), a.iters)
+
+    results["show_country_list"] = await measure(
+        "show_country_list", lambda i: bot.callback_handler(
+            stubs.callback_update(1, f"svc_{services[i % len(services)]}"), ctx), a.iters)
+
+    def take(i):
+        svc, c = rnd.choice(services), rnd.choice(countries)
+        return bot.callback_handler(stubs.callback_update(2_000_000 + i, f"country_{svc}|{c}"), ctx)
+    results["show_numbers"] = await measure("show_numbers", take, a.iters)
+
+    # বাস্তব ব্রাউজিং — প্রতি ৫টা Back/Refresh এ একটা allocation, render cache কতটা টেকে
+    def browse(i):
+        if i % 5 == 4:
+            return take(a.iters + i)
+        return bot.callback_handler(stubs.callback_update(1, f"svc_{services[i % len(services)]}"), ctx)
+    hits0, miss0 = bot.SCREENS.hits, bot.SCREENS.misses
+    results["browse_mixed"] = await measure("browse_mixed", browse, a.iters)
+    hits, miss = bot.SCREENS.hits - hits0, bot.SCREENS.misses - miss0
+    results["browse_mixed"]["cache_hit_rate"] = round(hits / max(hits + miss, 1), 3)
+    print(f"{'':<18} render cache hit rate {results['browse_mixed']['cache_hit_rate']:.1%}")
+
+    results["statistics"] = await measure(
+        "statistics", lambda i: bot.callback_handler(stubs.callback_update(admin, "statistics"), ctx), max(a.iters // 10, 20))
+    results["trends"] = await measure(
+        "trends", lambda i: bot.callback_handler(stubs.callback_update(admin, "trends"), ctx), max(a.iters // 10, 20))
+
+    def find(i):
+        masked, _ = bot.parse_otp(posts[i % len(posts)])
+        for p, h, s, _ in masked:
+            bot.find_users(p, h, s)
+    results["find_users"] = await measure("find_users", find, a.iters)
+
+    results["handle_otp"] = await measure(
+        "handle_otp", lambda i: bot.handle_otp(ctx, posts[i % len(posts)], time.monotonic()), a.iters)
+    while bot.OUTBOX.pending:
+        await asyncio.sleep(0.01)
+    print(f"{'':<18} delivered {ctx.bot.sent}  |  {bot.OUTBOX.stats()}")
+    await bot.OUTBOX.stop()
+
+    results["save_data"] = await measure("save_data", lambda i: bot.save_data(), a.io_iters, mem_iters=1)
+    results["load_data"] = await measure("load_data", lambda i: bot.load_data(), a.io_iters, mem_iters=1)
+
+    upload = os.path.join(workdir, "upload.txt")
+    make_upload(upload, a.upload_lines)
+    def receive(i):
+        svc = services[i % len(services)]
+        bot.UPLOAD_MODE[admin] = svc
+        doc = stubs.StubDocument(upload, f"Upload{i}.txt")
+        return bot.receive_file(stubs.message_update(admin, document=doc), ctx)
+    results["receive_file"] = await measure("receive_file", receive, a.io_iters, mem_iters=1)
+
+    return results
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--services",     type=int, default=10)
+    ap.add_argument("--countries",    type=int, default=50)
+    ap.add_argument("--numbers",      type=int, default=2000, help="প্রতি দেশে নম্বর")
+    ap.add_argument("--users",        type=int, default=100_000)
+    ap.add_argument("--iters",        type=int, default=500)
+    ap.add_argument("--io-iters",     type=int, default=5, help="save/load/receive_file এর রান")
+    ap.add_argument("--upload-lines", type=int, default=100_000)
+    ap.add_argument("--backend",      choices=("json", "sqlite"), default="json")
+    ap.add_argument("--workdir",      help="ডিফল্ট: temp ফোল্ডার")
+    ap.add_argument("--out",          default="bench_result.json")
+    ap.add_argument("--baseline",     help="আগের রানের JSON")
+    ap.add_argument("--tolerance",    type=float, default=0.10)
+    a = ap.parse_args()
+
+    out = os.path.abspath(a.out)
+    baseline = os.path.abspath(a.baseline) if a.baseline else None
+    workdir = os.path.abspath(a.workdir or tempfile.mkdtemp(prefix="botbench_"))
+    os.makedirs(workdir, exist_ok=True)
+
+    t0 = time.perf_counter()
+    services = make_inventory(workdir, a.services, a.countries, a.numbers)
+    make_users(workdir, a.users, services)
+    print(f"synthetic data: {a.services}×{a.countries}×{a.numbers:,} numbers, {a.users:,} users "
+          f"({time.perf_counter() - t0:.1f}s) → {workdir}")
+
+    # bot.py আপেক্ষিক path ব্যবহার করে, তাই import এর আগেই workdir এ যাই
+    os.chdir(workdir)
+    os.environ["STORAGE_BACKEND"]  = a.backend
+    os.environ["SQLITE_PATH"]      = os.path.join(workdir, "bench.db")
+    os.environ["SEND_GLOBAL_RATE"] = "1e9"
+    os.environ["SEND_CHAT_RATE"]   = "1e9"
+    os.environ.setdefault("SAVE_INTERVAL", "3600")
+
+    results = asyncio.run(run(a, workdir))
+
+    report = {
+        "time":     time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python":   platform.python_version(),
+        "params":   {k: getattr(a, k) for k in ("services", "countries", "numbers", "users", "iters", "io_iters", "upload_lines", "backend")},
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "scenarios": results,
+    }
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"\nmax RSS {report['max_rss_mb']} MB  →  {out}")
+
+    if baseline and compare(results, baseline, a.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
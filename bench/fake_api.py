@@ -0,0 +1,249 @@
+"""
+লোকাল fake Telegram Bot API — ApplicationBuilder().base_url(...) একে দেখালে বট আসল সার্ভার
+ছাড়াই চলে। getUpdates / sendMessage / editMessageText / answerCallbackQuery / getFile সার্ভ করে,
+ইচ্ছামতো 429 RetryAfter দিতে পারে, আর প্রতিটি outbound কল টাইমস্ট্যাম্প সহ রেকর্ড করে।
+
+    python bench/fake_api.py [--port 8081] [--token 123:FAKE]
+    তারপর: BOT_API_URL=http://127.0.0.1:8081/bot BOT_FILE_URL=http://127.0.0.1:8081/file/bot python bot.py
+
+    setWebhook এর পর update গুলো getUpdates এ না রেখে সরাসরি webhook URL এ POST করে
+    (secret token হেডার সহ, max_connections পর্যন্ত একসাথে)।
+"""
+import argparse, asyncio, itertools, json, os, sys, time
+from collections import deque
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from httpserver import HttpServer
+
+BOT_USER = {"id": 100000, "is_bot": True, "first_name": "FakeBot", "username": "fake_bot"}
+
+
+class FakeBotApi:
+    def __init__(self, token="123:FAKE", host="127.0.0.1", port=0,
+                 retry_every=0, retry_after=1, retry_methods=("sendMessage",)):
+        self.token         = token
+        self.server        = HttpServer(self._handle, host, port)
+        self.calls         = []          # (monotonic ts, method, params)
+        self.listeners     = []          # fn(ts, method, params, result)
+        self.retry_every   = retry_every # প্রতি N টা কলে একটা 429 (0 = বন্ধ)
+        self.retry_after   = retry_after
+        self.retry_methods = set(retry_methods)
+        self.injected_429  = 0
+        self.files         = {}          # file_id → bytes
+        self.pushed        = {}          # update_id → monotonic ts (queue এ ঢোকার সময়)
+        self.delivered     = 0
+        self._updates      = deque()
+        self._ids          = itertools.count(1)
+        self._msg_ids      = itertools.count(1)
+        self._counter      = 0
+        self._new          = None
+        self.webhook       = None        # (url, secret)
+        self.webhook_fail  = 0
+        self._client       = None
+        self._slots        = None
+        self._posts        = set()
+
+    # ── lifecycle ───────────────────────────
+    async def start(self):
+        self._new = asyncio.Event()
+        await self.server.start()
+        return self
+
+    async def stop(self):
+        for t in list(self._posts):
+            t.cancel()
+        if self._client is not None:
+            await self._client.aclose()
+        await self.server.stop()
+
+    @property
+    def base_url(self):
+        return f"{self.server.url}/bot"
+
+    @property
+    def base_file_url(self):
+        return f"{self.server.url}/file/bot"
+
+    # ── update injection ────────────────────
+    def push(self, **update):
+        uid = next(self._ids)
+        update["update_id"] = uid
+        self.pushed[uid] = time.monotonic()
+        if self.webhook:
+            t = asyncio.get_running_loop().create_task(self._post(update))
+            self._posts.add(t)
+            t.add_done_callback(self._posts.discard)
+        else:
+            self._updates.append(update)
+            self._new.set()
+        return uid
+
+    async def _post(self, update):
+        url, secret = self.webhook
+        async with self._slots:
+            for attempt in range(5):
+                try:
+                    r = await self._client.post(url, json=update, headers={"X-Telegram-Bot-Api-Secret-Token": secret})
+                    if r.status_code == 200:
+                        return
+                except httpx.HTTPError:
+                    pass
+                await asyncio.sleep(0.2 * (attempt + 1))
+        self.webhook_fail += 1
+
+    def _message(self, chat, text=None, sender=None, **extra):
+        m = {"message_id": next(self._msg_ids), "date": int(time.time()), "chat": chat, **extra}
+        if sender is not None:
+            m["from"] = sender
+        if text is not None:
+            m["text"] = text
+        return m
+
+    @staticmethod
+    def user(uid):
+        return {"id": uid, "is_bot": False, "first_name": f"User{uid}"}
+
+    def user_message(self, uid, text):
+        chat = {"id": uid, "type": "private", "first_name": f"User{uid}"}
+        return self.push(message=self._message(chat, text, self.user(uid)))
+
+    def user_document(self, uid, filename, data):
+        fid = f"file{len(self.files) + 1}"
+        self.files[fid] = data
+        chat = {"id": uid, "type": "private", "first_name": f"User{uid}"}
+        doc  = {"file_id": fid, "file_unique_id": fid, "file_name": filename, "file_size": len(data)}
+        return self.push(message=self._message(chat, None, self.user(uid), document=doc))
+
+    def group_post(self, chat_id, text, sender_id=777):
+        chat = {"id": chat_id, "type": "supergroup", "title": "OTP Group"}
+        return self.push(message=self._message(chat, text, self.user(sender_id)))
+
+    def callback(self, uid, data, message_id):
+        chat = {"id": uid, "type": "private", "first_name": f"User{uid}"}
+        msg  = {"message_id": message_id, "date": int(time.time()), "chat": chat, "from": BOT_USER, "text": "…"}
+        return self.push(callback_query={
+            "id": str(next(self._ids)), "from": self.user(uid), "chat_instance": str(uid),
+            "message": msg, "data": data,
+        })
+
+    # ── HTTP ────────────────────────────────
+    async def _handle(self, req):
+        prefix = f"/bot{self.token}/"
+        if req.path.startswith(f"/file/bot{self.token}/"):
+            fid = req.path.rsplit("/", 1)[1]
+            return (200, self.files[fid]) if fid in self.files else (404, "not found")
+        if not req.path.startswith(prefix):
+            return 404, {"ok": False, "error_code": 404, "description": "Not Found"}
+        method = req.path[len(prefix):]
+        params = {k: _value(v) for k, v in req.form().items()}
+        now    = time.monotonic()
+        self.calls.append((now, method, params))
+
+        if method in self.retry_methods and self.retry_every:
+            self._counter += 1
+            if self._counter % self.retry_every == 0:
+                self.injected_429 += 1
+                return 429, {"ok": False, "error_code": 429, "parameters": {"retry_after": self.retry_after},
+                             "description": f"Too Many Requests: retry after {self.retry_after}"}
+
+        fn = getattr(self, "_m_" + method, None)
+        result = await fn(params) if fn else True
+        for cb in self.listeners:
+            cb(now, method, params, result)
+        return 200, {"ok": True, "result": result}
+
+    async def _m_getMe(self, p):
+        return BOT_USER
+
+    async def _m_getUpdates(self, p):
+        offset  = int(p.get("offset") or 0)
+        timeout = float(p.get("timeout") or 0)
+        limit   = int(p.get("limit") or 100)
+        while self._updates and self._updates[0]["update_id"] < offset:
+            self._updates.popleft()
+        if not self._updates and timeout:
+            self._new.clear()
+            try:
+                await asyncio.wait_for(self._new.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        out = list(itertools.islice(self._updates, limit))
+        self.delivered += len(out)
+        # পরের getUpdates এর offset এ ack হবে; ততক্ষণ queue তেই থাকে
+        return out
+
+    async def _m_sendMessage(self, p):
+        chat = {"id": int(p["chat_id"]), "type": "private"}
+        return self._message(chat, p.get("text"), BOT_USER)
+
+    async def _m_editMessageText(self, p):
+        chat = {"id": int(p.get("chat_id") or 0), "type": "private"}
+        m = self._message(chat, p.get("text"), BOT_USER)
+        if p.get("message_id"):
+            m["message_id"] = int(p["message_id"])
+        return m
+
+    async def _m_setWebhook(self, p):
+        self.webhook = (p["url"], p.get("secret_token", ""))
+        self._slots  = asyncio.Semaphore(int(p.get("max_connections") or 40))
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=30, limits=httpx.Limits(max_connections=100))
+        return True
+
+    async def _m_deleteWebhook(self, p):
+        self.webhook = None
+        return True
+
+    async def _m_answerCallbackQuery(self, p):
+        return True
+
+    async def _m_getFile(self, p):
+        fid = p["file_id"]
+        return {"file_id": fid, "file_unique_id": fid, "file_size": len(self.files.get(fid, b"")), "file_path": fid}
+
+    # ── report ──────────────────────────────
+    def method_counts(self):
+        out = {}
+        for _, m, _ in self.calls:
+            out[m] = out.get(m, 0) + 1
+        return out
+
+
+def _value(v):
+    """PTB urlencoded body তে nested অবজেক্ট JSON স্ট্রিং হিসেবে পাঠায়"""
+    if v[:1] in ("{", "["):
+        try:
+            return json.loads(v)
+        except ValueError:
+            pass
+    return v
+
+
+async def _serve(a):
+    api = await FakeBotApi(a.token, a.host, a.port, a.retry_every, a.retry_after).start()
+    print(f"fake Bot API: {api.base_url}  (file: {api.base_file_url})")
+    try:
+        while True:
+            await asyncio.sleep(10)
+            print(f"calls: {api.method_counts()}  |  429: {api.injected_429}")
+    finally:
+        await api.stop()
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--host",        default="127.0.0.1")
+    ap.add_argument("--port",        type=int, default=8081)
+    ap.add_argument("--token",       default="123:FAKE")
+    ap.add_argument("--retry-every", type=int, default=0, help="প্রতি N টা sendMessage এ একটা 429")
+    ap.add_argument("--retry-after", type=int, default=1)
+    try:
+        asyncio.run(_serve(ap.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""
+End-to-end লোড টেস্ট — fake Bot API চালিয়ে আসল bot.main() কে তার দিকে পয়েন্ট করে।
+হাজারো ইউজার "📱 Get Number" → service → country চাপে, আর OTP গ্রুপে নির্দিষ্ট হারে
+masked নম্বর পোস্ট হয়। শেষে updates/s, প্রতিটি ধাপের latency, OTP end-to-end latency
+আর error হার দেখায় (JSON এও লেখে)।
+
+    python bench/loadgen.py [--users 2000] [--rounds 2] [--otp-rate 10] [--retry-every 0]
+                            [--mode polling|webhook] [--out loadgen.json]
+"""
+import argparse, asyncio, json, logging, os, random, re, resource, signal, socket, sys, tempfile, threading, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_suite import CIRCLED, make_inventory, pct
+from fake_api import FakeBotApi
+
+TOKEN    = "123:FAKE"
+GROUP_ID = -1001234567890
+NUM_RE   = re.compile(r"📲  `\+?(\d+)`")
+CODE_RE  = re.compile(r"🔢 OTP কোড\n┗ `(\d+)`")
+
+
+def summary(ms):
+    if not ms:
+        return {"n": 0}
+    ms = sorted(ms)
+    return {"n": len(ms), "p50_ms": round(pct(ms, .5), 2), "p95_ms": round(pct(ms, .95), 2),
+            "p99_ms": round(pct(ms, .99), 2), "max_ms": round(ms[-1], 2)}
+
+
+class ErrorCounter(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.ERROR)
+        self.count = 0
+
+    def emit(self, record):
+        self.count += 1
+
+
+class Load:
+    def __init__(self, a, services, countries):
+        self.a         = a
+        self.services  = services
+        self.countries = countries
+        self.api       = None
+        self.waiters   = {}    # chat_id → [future]
+        self.steps     = {"menu": [], "service": [], "country": []}
+        self.timeouts  = 0
+        self.latest    = {}    # uid → সর্বশেষ পাওয়া নম্বর
+        self.otp_sent  = {}    # code → (uid, posted ts)
+        self.otp_lat   = []
+        self.handled   = 0
+        self.user_wall = 0.0
+
+    # ── fake API থেকে আসা কল ─────────────────
+    def on_call(self, ts, method, params, result):
+        if method not in ("sendMessage", "editMessageText"):
+            return
+        chat = int(params.get("chat_id") or 0)
+        text = params.get("text", "")
+        m = CODE_RE.search(text) if method == "sendMessage" else None
+        if m:
+            hit = self.otp_sent.pop(m.group(1), None)
+            if hit and hit[0] == chat:
+                self.otp_lat.append((ts - hit[1]) * 1000)
+            return
+        q = self.waiters.get(chat)
+        if q:
+            fut = q.pop(0)
+            if not fut.done():
+                fut.set_result((ts, text, result))
+
+    async def step(self, uid, name, push):
+        fut = asyncio.get_running_loop().create_future()
+        self.waiters.setdefault(uid, []).append(fut)
+        upd = push()
+        try:
+            ts, text, result = await asyncio.wait_for(fut, self.a.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            q = self.waiters.get(uid)
+            if q and fut in q:
+                q.remove(fut)
+            return None
+        self.steps[name].append((ts - self.api.pushed[upd]) * 1000)
+        self.handled += 1
+        return text, result
+
+    # ── ইউজার ───────────────────────────────
+    async def user(self, uid, rnd):
+        await asyncio.sleep(rnd.random() * self.a.ramp)
+        for _ in range(self.a.rounds):
+            r = await self.step(uid, "menu", lambda: self.api.user_message(uid, "📱 Get Number"))
+            if r is None:
+                continue
+            mid = r[1]["message_id"]
+            svc, c = rnd.choice(self.services), rnd.choice(self.countries)
+            if await self.step(uid, "service", lambda: self.api.callback(uid, f"svc_{svc}", mid)) is None:
+                continue
+            r = await self.step(uid, "country", lambda: self.api.callback(uid, f"country_{svc}|{c}", mid))
+            if r is not None:
+                nums = NUM_RE.findall(r[0])
+                if nums:
+                    self.latest[uid] = nums
+            await asyncio.sleep(rnd.random() * self.a.think)
+
+    # ── OTP গ্রুপ ───────────────────────────
+    async def otp_poster(self, stop, rnd):
+        gap = 1.0 / self.a.otp_rate
+        while not stop.is_set():
+            if self.latest:
+                uid  = rnd.choice(list(self.latest))
+                n    = rnd.choice(self.latest[uid])
+                code = str(rnd.randint(100000, 999999))
+                mask = "".join(rnd.choice(CIRCLED) for _ in range(len(n) - 7))
+                self.otp_sent[code] = (uid, time.monotonic())
+                self.api.group_post(GROUP_ID, f"🔔 WhatsApp\n📱 {n[:4]}{mask}{n[-3:]}\n🔑 Code: {code}")
+            await asyncio.sleep(gap)
+
+    async def run(self, ready, bot_done):
+        self.api = await FakeBotApi(TOKEN, retry_every=self.a.retry_every, retry_after=self.a.retry_after).start()
+        self.api.listeners.append(self.on_call)
+        ready["api"] = self.api
+        ready["event"].set()
+
+        # বট update নিতে শুরু করা পর্যন্ত অপেক্ষা
+        first = "setWebhook" if self.a.mode == "webhook" else "getUpdates"
+        while not any(m == first for _, m, _ in self.api.calls):
+            await asyncio.sleep(0.05)
+        if self.a.mode == "webhook":
+            await asyncio.sleep(0.2)   # app.start() শেষ হওয়ার সময়
+
+        rnd  = random.Random(7)
+        stop = asyncio.Event()
+        poster = asyncio.create_task(self.otp_poster(stop, random.Random(8)))
+        t0 = time.monotonic()
+        await asyncio.gather(*(self.user(1_000_000 + i, random.Random(rnd.random())) for i in range(self.a.users)))
+        self.user_wall = time.monotonic() - t0
+        stop.set()
+        await poster
+
+        # বাকি OTP গুলো পৌঁছানোর সময় দাও
+        deadline = time.monotonic() + self.a.drain
+        while self.otp_sent and time.monotonic() < deadline:
+            await asyncio.sleep(0.1)
+
+        os.kill(os.getpid(), signal.SIGINT)
+        await asyncio.to_thread(bot_done.wait)
+        await self.api.stop()
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--users",       type=int,   default=2000)
+    ap.add_argument("--rounds",      type=int,   default=2, help="প্রতি ইউজার কতবার নম্বর নেবে")
+    ap.add_argument("--ramp",        type=float, default=5.0, help="ইউজাররা এই সময়ের মধ্যে ছড়িয়ে শুরু করে (s)")
+    ap.add_argument("--think",       type=float, default=1.0, help="দুই রাউন্ডের মাঝে সর্বোচ্চ বিরতি (s)")
+    ap.add_argument("--otp-rate",    type=float, default=10, help="OTP পোস্ট/সেকেন্ড")
+    ap.add_argument("--services",    type=int,   default=3)
+    ap.add_argument("--countries",   type=int,   default=20)
+    ap.add_argument("--numbers",     type=int,   default=5000)
+    ap.add_argument("--retry-every", type=int,   default=0, help="প্রতি N টা sendMessage এ একটা 429")
+    ap.add_argument("--retry-after", type=int,   default=1)
+    ap.add_argument("--timeout",     type=float, default=30.0)
+    ap.add_argument("--drain",       type=float, default=15.0)
+    ap.add_argument("--mode",        choices=("polling", "webhook"), default="polling")
+    ap.add_argument("--workdir")
+    ap.add_argument("--out",         default="loadgen.json")
+    a = ap.parse_args()
+
+    out     = os.path.abspath(a.out)
+    workdir = os.path.abspath(a.workdir or tempfile.mkdtemp(prefix="botload_"))
+    os.makedirs(workdir, exist_ok=True)
+    services  = make_inventory(workdir, a.services, a.countries, a.numbers)
+    countries = [f"Country{c:02d}" for c in range(a.countries)]
+    with open(os.path.join(workdir, "user_data.json"), "w") as f:
+        json.dump({"SERVICES": services}, f)
+    os.chdir(workdir)
+
+    load     = Load(a, services, countries)
+    ready    = {"event": threading.Event()}
+    bot_done = threading.Event()
+    th = threading.Thread(target=lambda: asyncio.run(load.run(ready, bot_done)), daemon=True)
+    th.start()
+    ready["event"].wait()
+    api = ready["api"]
+
+    os.environ.update({
+        "BOT_TOKEN": TOKEN, "BOT_API_URL": api.base_url, "BOT_FILE_URL": api.base_file_url,
+        "OTP_GROUP_ID": str(GROUP_ID),
+    })
+    if a.mode == "webhook":
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            port = s.getsockname()[1]
+        os.environ.update({"WEBHOOK_URL": f"http://127.0.0.1:{port}", "WEBHOOK_LISTEN": "127.0.0.1",
+                           "WEBHOOK_PORT": str(port)})
+    errors = ErrorCounter()
+    logging.getLogger("telegram").addHandler(errors)
+
+    import bot
+    bot.print = lambda *x, **kw: None
+    t0 = time.monotonic()
+    try:
+        bot.main()
+    finally:
+        bot_done.set()
+        th.join(30)
+    wall = time.monotonic() - t0
+
+    otp_posted = len(load.otp_lat) + len(load.otp_sent)
+    report = {
+        "params":        vars(a),
+        "wall_s":        round(wall, 2),
+        "user_phase_s":  round(load.user_wall, 2),
+        # বট আর fake API একই প্রসেসে — cpu_s ≈ wall হলে CPU-bound
+        "cpu_s":         round(sum(resource.getrusage(resource.RUSAGE_SELF)[:2]), 2),
+        "updates_handled": load.handled,
+        "updates_per_s": round(load.handled / load.user_wall, 1) if load.user_wall else 0,
+        "steps":         {k: summary(v) for k, v in load.steps.items()},
+        "otp":           {"posted": otp_posted, "delivered": len(load.otp_lat), "missed": len(load.otp_sent),
+                          **summary(load.otp_lat)},
+        "errors":        {"timeouts": load.timeouts, "handler_errors": errors.count,
+                          "injected_429": api.injected_429,
+                          "error_rate": round((load.timeouts + errors.count) / max(load.handled + load.timeouts, 1), 4)},
+        "api_calls":     api.method_counts(),
+        "webhook_failed": api.webhook_fail,
+    }
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    print("\n" + "═" * 56)
+    print(f"[{a.mode}] updates handled: {load.handled}  ({report['updates_per_s']}/s over {load.user_wall:.1f}s)")
+    for k, v in report["steps"].items():
+        if v["n"]:
+            print(f"  {k:<8} p50 {v['p50_ms']:>8.1f}  p95 {v['p95_ms']:>8.1f}  p99 {v['p99_ms']:>8.1f} ms")
+    o = report["otp"]
+    print(f"OTP: posted {o['posted']}  delivered {o['delivered']}  missed {o['missed']}"
+          + (f"  |  p50 {o['p50_ms']} ms  p95 {o['p95_ms']} ms" if o.get("n") else ""))
+    print(f"errors: {report['errors']}  |  cpu {report['cpu_s']}s / wall {report['wall_s']}s")
+    print(f"→ {out}")
+
+
+if __name__ == "__main__":
+    main()
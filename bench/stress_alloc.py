@@ -0,0 +1,67 @@
+"""
+একসাথে হাজারো allocation চালিয়ে দেখে কোনো নম্বর দুবার দেওয়া হয় কিনা।
+asyncio টাস্ক (একসাথে অনেক ক্লিক) আর thread (concurrent update processing) দুটোই চালায়।
+
+    python bench/stress_alloc.py [--numbers 50000] [--clicks 20000] [--k 4]
+"""
+import argparse, asyncio, os, random, sys, time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pool import PoolIndex
+
+
+def make_index(n):
+    nums = [f"8801{i:09d}" for i in range(n)]
+    seen = set(random.Random(0).sample(nums, n // 10))
+    return PoolIndex(lambda s, c: list(nums), lambda s, c: set(seen)), nums, seen
+
+
+def check(name, idx, handed, seen_before, n):
+    flat = [x for batch in handed for x in batch]
+    dupes = len(flat) - len(set(flat))
+    reused = len(set(flat) & seen_before)
+    total, used, left = idx.counts("WhatsApp", "BD")
+    ok = dupes == 0 and reused == 0 and left == n - len(seen_before) - len(flat) and used == len(seen_before) + len(flat)
+    print(f"{name:<8} handed={len(flat):>6}  dupes={dupes}  reused_seen={reused}  left={left}  {'✅' if ok else '❌'}")
+    return ok
+
+
+async def run_async(idx, clicks, k):
+    async def click():
+        await asyncio.sleep(random.random() / 1000)
+        got = idx.take("WhatsApp", "BD", k)
+        # show_numbers এর মতো মাঝখানে লুপে ফিরে যাওয়া
+        await asyncio.sleep(0)
+        idx.mark_seen("WhatsApp", "BD", got)
+        return got
+    return await asyncio.gather(*(click() for _ in range(clicks)))
+
+
+def run_threads(idx, clicks, k):
+    with ThreadPoolExecutor(max_workers=32) as ex:
+        return list(ex.map(lambda _: idx.take("WhatsApp", "BD", k), range(clicks)))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--numbers", type=int, default=50000)
+    ap.add_argument("--clicks",  type=int, default=20000)
+    ap.add_argument("--k",       type=int, default=4)
+    args = ap.parse_args()
+
+    ok = True
+    for name, runner in (("asyncio", lambda i: asyncio.run(run_async(i, args.clicks, args.k))),
+                         ("threads", lambda i: run_threads(i, args.clicks, args.k))):
+        idx, nums, seen = make_index(args.numbers)
+        idx.get("WhatsApp", "BD")
+        t0 = time.perf_counter()
+        handed = runner(idx)
+        dt = time.perf_counter() - t0
+        ok &= check(name, idx, handed, seen, args.numbers)
+        print(f"         {args.clicks / dt:,.0f} allocations/s")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+নেটওয়ার্ক ছাড়া bot.py এর handler চালানোর জন্য Update / Bot এর হালকা stub।
+handler যা যা ছোঁয় (reply_text, edit_message_text, answer, send_message, get_file) শুধু সেগুলোই আছে।
+"""
+import itertools, shutil
+from types import SimpleNamespace
+
+_ids = itertools.count(1)
+
+
+class StubBot:
+    def __init__(self):
+        self.sent = 0
+
+    async def send_message(self, chat_id, text, **kw):
+        self.sent += 1
+        return SimpleNamespace(message_id=next(_ids), chat_id=chat_id, text=text)
+
+    async def edit_message_text(self, text, chat_id=None, message_id=None, **kw):
+        return True
+
+
+class StubMessage:
+    def __init__(self, chat_id, text=None, document=None):
+        self.chat       = SimpleNamespace(id=chat_id)
+        self.message_id = next(_ids)
+        self.text       = text
+        self.caption    = None
+        self.document   = document
+        self.last       = None
+
+    async def reply_text(self, text, **kw):
+        self.last = text
+        return StubMessage(self.chat.id, text)
+
+    async def edit_text(self, text, **kw):
+        self.last = text
+        return self
+
+
+class StubQuery:
+    def __init__(self, uid, data):
+        self.from_user = SimpleNamespace(id=uid)
+        self.data      = data
+        self.message   = StubMessage(uid)
+
+    async def answer(self, *a, **kw):
+        return True
+
+    async def edit_message_text(self, text, **kw):
+        self.message.last = text
+        return self.message
+
+
+class StubFile:
+    def __init__(self, src):
+        self.src = src
+
+    async def download_to_drive(self, custom_path=None):
+        shutil.copyfile(self.src, custom_path)
+        return custom_path
+
+
+class StubDocument:
+    def __init__(self, src, file_name):
+        self.src       = src
+        self.file_name = file_name
+
+    async def get_file(self):
+        return StubFile(self.src)
+
+
+def callback_update(uid, data):
+    q = StubQuery(uid, data)
+    return SimpleNamespace(callback_query=q, message=None, effective_user=q.from_user, channel_post=None)
+
+
+def message_update(uid, text=None, document=None, chat_id=None):
+    m = StubMessage(uid if chat_id is None else chat_id, text, document)
+    return SimpleNamespace(callback_query=None, message=m, effective_user=SimpleNamespace(id=uid), channel_post=None)
+
+
+def context(bot=None):
+    return SimpleNamespace(bot=bot or StubBot())
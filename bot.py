@@ -1,8 +1,28 @@
-import os, re, random, time, json
+import os, time, json, asyncio, tempfile
 from datetime import datetime
 from telegram import ReplyKeyboardMarkup, KeyboardButton, Update, InlineKeyboardButton, InlineKeyboardMarkup
-from telegram.ext import ApplicationBuilder, CommandHandler, CallbackQueryHandler, MessageHandler, filters, ContextTypes
+from telegram.error import BadRequest
+from telegram.ext import (ApplicationBuilder, ApplicationHandlerStop, CommandHandler, CallbackQueryHandler,
+                          MessageHandler, TypeHandler, filters, ContextTypes)
 import config
+import metrics
+from packed import load_txt_packed
+from aggregates import Aggregates, sparkline
+from history import Ring, HistoryEntry, OtpEntry, history_ring, otp_ring, to_ts, fmt_time, count_since, intern
+from journal import Journal
+from persist import WriteBehind, atomic_write
+from broadcast import Broadcaster
+from delivery import Delivery, PRIO_OTP
+from ingest import ingest_file
+from matcher import OtpIndex
+from otp_parse import parse as parse_otp
+from pool import PoolIndex
+from profiling import Profiler
+from ratelimit import KeyedLimiter, ALLOW, NOTIFY
+from render_cache import RenderCache
+from storage_sqlite import SQLiteStore
+from update_processor import OrderedUpdateProcessor
+import webhook
 
 # ════════════════════════════════════════════════════════
 #                      GLOBALS
@@ -12,12 +32,14 @@ ADMINS            = set(config.ADMIN_IDS)
 BANNED            = set()
 USER_STATS        = {}
 USER_LAST_NUMBERS = {}
-USER_LAST_ACTIVE  = {}
-USER_HISTORY      = {}   # uid → [{service, number, time}]
-OTP_LOG           = []
+USER_LAST_ACTIVE  = {}   # uid → epoch
+USER_HISTORY      = {}   # uid → Ring[HistoryEntry]
+OTP_LOG           = Ring(config.OTP_LOG_SIZE)   # OtpEntry
+AGG               = Aggregates()                # leaderboard + সময়ভিত্তিক গণনা
 UPLOAD_MODE       = {}   # uid → service_name
 NUMBER_LIMIT      = 4
-DATA_FILE         = "user_data.json"
+DATA_FILE         = "user_data.json"   # পুরনো JSON snapshot
+STATE_FILE        = "user_data.bin"
 
 # ডিফল্ট সার্ভিস তালিকা
 DEFAULT_SERVICES = ["WhatsApp", "Telegram", "Facebook"]
@@ -29,38 +51,246 @@ os.makedirs(config.SEEN_DIR,   exist_ok=True)
 # ════════════════════════════════════════════════════════
 #                   SAVE / LOAD
 # ════════════════════════════════════════════════════════
+# STORAGE_BACKEND="sqlite" হলে সব ডাটা SQLite এ, নাহলে JSON + txt ফাইলে
+DB = SQLiteStore(config.SQLITE_PATH) if config.STORAGE_BACKEND == "sqlite" else None
+
+def _state():
+    """লাইভ state — একই অবজেক্ট, কপি নয়"""
+    return {
+        "USER_STATS":        USER_STATS,
+        "USER_LAST_NUMBERS": USER_LAST_NUMBERS,
+        "USER_LAST_ACTIVE":  USER_LAST_ACTIVE,
+        "USER_HISTORY":      USER_HISTORY,
+        "BANNED":            BANNED,
+        "ADMINS":            ADMINS,
+        "USERS":             USERS,
+        "OTP_LOG":           OTP_LOG,
+        "NUMBER_LIMIT":      NUMBER_LIMIT,
+        "SERVICES":          SERVICES,
+        "AGGREGATES":        AGG,
+    }
+
+# ── state পরিবর্তনের রেকর্ড ──
+#   ["u+", uid] / ["u-", uid]                   ইউজার যোগ / বাদ (বট block করেছে)
+#   ["t", uid, service, country, count, numbers, ts]   নম্বর নেওয়া (ts = epoch সেকেন্ড)
+#   ["o", ts, service, number, otp, uid]        OTP পৌঁছেছে
+#   ["b+"|"b-"|"a+"|"a-", uid]                  ban / unban / admin যোগ / বাদ
+#   ["l", n]                                    নম্বর লিমিট
+#   ["s+"|"s-", service]                        সার্ভিস যোগ / বাদ
+def _apply(d, rec):
+    op = rec[0]
+    if op == "t":
+        _, s, service, country, count, numbers, ts = rec[:7]
+        if len(rec) == 8:
+            ts = to_ts(ts)   # পুরনো segment: সময় লেখা হিসেবে
+        service, country = intern(service), intern(country)
+        st = d["USER_STATS"].setdefault(s, {"total": 0, "services": {}})
+        st["total"] += count
+        svc = st["services"].setdefault(service, {})
+        svc[country] = svc.get(country, 0) + count
+        agg = d["AGGREGATES"]
+        agg.on_assign(ts, service, country, count)
+        agg.top.update(s, st["total"])
+        if numbers:
+            d["USER_LAST_NUMBERS"][s] = numbers
+            hist = d["USER_HISTORY"].get(s)
+            if hist is None:
+                hist = d["USER_HISTORY"][s] = Ring(config.HISTORY_SIZE)
+            for n in numbers:
+                hist.append(HistoryEntry(ts, service, country, n))
+        d["USER_LAST_ACTIVE"][s] = ts
+    elif op == "o":
+        if isinstance(rec[1], dict):
+            # পুরনো segment: {time, number, otp, uid}
+            e = otp_ring([rec[1]], 1)[0]
+        else:
+            e = OtpEntry(rec[1], intern(rec[2]), *rec[3:6])
+        d["OTP_LOG"].append(e)
+        d["AGGREGATES"].on_otp(e.ts, e.service)
+    elif op == "u+":
+        d["USERS"].add(rec[1])
+    elif op == "u-":
+        d["USERS"].discard(rec[1])
+    elif op == "b+":
+        d["BANNED"].add(rec[1])
+    elif op == "b-":
+        d["BANNED"].discard(rec[1])
+    elif op == "a+":
+        d["ADMINS"].add(rec[1])
+    elif op == "a-":
+        d["ADMINS"].discard(rec[1])
+    elif op == "l":
+        d["NUMBER_LIMIT"] = rec[1]
+    elif op == "s+":
+        if rec[1] not in d["SERVICES"]:
+            d["SERVICES"].append(rec[1])
+    elif op == "s-":
+        if rec[1] in d["SERVICES"]:
+            d["SERVICES"].remove(rec[1])
+
+def _prepare(d):
+    for k in ("USER_STATS", "USER_LAST_NUMBERS", "USER_LAST_ACTIVE", "USER_HISTORY"):
+        d.setdefault(k, {})
+    for k in ("BANNED", "ADMINS", "USERS"):
+        d[k] = set(d.get(k, []))
+    d["OTP_LOG"] = otp_ring(d.get("OTP_LOG", []), config.OTP_LOG_SIZE)
+    d["AGGREGATES"] = Aggregates.restore(d.get("AGGREGATES"))
+    d.setdefault("NUMBER_LIMIT", 4)
+    d.setdefault("SERVICES", list(DEFAULT_SERVICES))
+    return _upgrade(d)
+
+def _upgrade(d):
+    """পুরনো snapshot এর dict/লেখা-সময় এর history আর last active → Ring / epoch"""
+    hist = d.get("USER_HISTORY", {})
+    for s, h in hist.items():
+        if not isinstance(h, Ring):
+            hist[s] = history_ring(h, config.HISTORY_SIZE)
+    active = d.get("USER_LAST_ACTIVE", {})
+    for s, t in active.items():
+        if not isinstance(t, int):
+            active[s] = to_ts(t)
+    return d
+
+# JSON ব্যাকএন্ডে: user_data.bin = snapshot, তার পরের পরিবর্তন user_data.NNNNNN.log এ।
+# ইউজার-ভিত্তিক stats/history/last active startup এ লাগে না — সেগুলো পরে background এ আসে।
+LAZY_KEYS = ("USER_STATS", "USER_HISTORY", "USER_LAST_ACTIVE")
+JOURNAL   = Journal(STATE_FILE, _apply, _prepare, None, config.JOURNAL_COMPACT_EVERY,
+                    lazy_keys=LAZY_KEYS, legacy=DATA_FILE)
+
+def record(op, *args, key=None):
+    """state পরিবর্তনের একমাত্র পথ — লাইভ state এ প্রয়োগ, journal এ লেখা, flush নির্ধারণ"""
+    rec = (op,) + args
+    _apply(_state(), rec)
+    if not DB:
+        JOURNAL.append(rec)
+    STORE.mark_dirty(key)
+
 def save_data():
-    with open(DATA_FILE, "w") as f:
-        json.dump({
-            "USER_STATS":        USER_STATS,
-            "USER_LAST_NUMBERS": USER_LAST_NUMBERS,
-            "USER_LAST_ACTIVE":  USER_LAST_ACTIVE,
-            "USER_HISTORY":      USER_HISTORY,
-            "BANNED":            list(BANNED),
-            "ADMINS":            list(ADMINS),
-            "USERS":             list(USERS),
-            "OTP_LOG":           OTP_LOG[-50:],
-            "NUMBER_LIMIT":      NUMBER_LIMIT,
-            "SERVICES":          SERVICES,
-        }, f, ensure_ascii=False, indent=2)
-
-def load_data():
+    """সব পরিবর্তন এখনই ডিস্কে — JSON এ journal গুটিয়ে নতুন snapshot"""
+    if DB:
+        _serialize(set(USER_STATS) | set(map(str, USERS)))()
+        DB.save_setting("AGGREGATES", json.dumps(AGG.dump(), ensure_ascii=False))
+    else:
+        STORE.flush()
+        if _state_complete():
+            JOURNAL.checkpoint(_state())
+        else:
+            # লাইভ state এখনো অসম্পূর্ণ — ফাইল থেকেই গুটাও
+            JOURNAL.compact()
+
+def _serialize(keys):
+    # sqlite: dirty ইউজারদের row লুপেই কপি হয়; JSON: জমা journal রেকর্ড — লেখা হয় thread এ
+    if DB:
+        st = _state()
+        write = DB.snapshot(keys, st)
+    else:
+        write = JOURNAL.take()
+    def timed():
+        with SAVE_SECONDS.time():
+            write()
+    return timed
+
+# প্রতিটি ইভেন্টে পুরো ফাইল না লিখে dirty মার্ক করি, background এ flush হয়
+STORE = WriteBehind(_serialize, config.SAVE_INTERVAL, config.SAVE_BATCH)
+
+def load_data(lazy=False):
+    """
+    lazy=True: শুধু যা দিয়ে সার্ভ শুরু করা যায় (admin, ban, service, ইউজার তালিকা, OTP matcher) —
+    বাকিটা load_rest() এ। lazy=False হলে সব এখনই।
+    """
     global USER_STATS, USER_LAST_NUMBERS, USER_LAST_ACTIVE
-    global BANNED, ADMINS, USERS, OTP_LOG, NUMBER_LIMIT, SERVICES, USER_HISTORY
-    if not os.path.exists(DATA_FILE):
-        return
-    with open(DATA_FILE) as f:
-        d = json.load(f)
-    USER_STATS        = d.get("USER_STATS", {})
-    USER_LAST_NUMBERS = d.get("USER_LAST_NUMBERS", {})
-    USER_LAST_ACTIVE  = d.get("USER_LAST_ACTIVE", {})
-    USER_HISTORY      = d.get("USER_HISTORY", {})
-    BANNED            = set(d.get("BANNED", []))
-    ADMINS.update(d.get("ADMINS", []))
-    USERS             = set(d.get("USERS", []))
-    OTP_LOG           = d.get("OTP_LOG", [])
-    NUMBER_LIMIT      = d.get("NUMBER_LIMIT", 4)
-    SERVICES          = d.get("SERVICES", list(DEFAULT_SERVICES))
+    global BANNED, ADMINS, USERS, OTP_LOG, NUMBER_LIMIT, SERVICES, USER_HISTORY, AGG
+    if DB:
+        d = _prepare(DB.load_state())
+    else:
+        d = JOURNAL.load(lazy)
+    USER_STATS        = d["USER_STATS"]
+    USER_LAST_NUMBERS = d["USER_LAST_NUMBERS"]
+    USER_LAST_ACTIVE  = d["USER_LAST_ACTIVE"]
+    USER_HISTORY      = d["USER_HISTORY"]
+    BANNED            = d["BANNED"]
+    ADMINS.update(d["ADMINS"])
+    USERS             = d["USERS"]
+    OTP_LOG           = d["OTP_LOG"]
+    NUMBER_LIMIT      = d["NUMBER_LIMIT"]
+    SERVICES          = d["SERVICES"]
+    AGG               = d["AGGREGATES"]
+    AGG.top.rebuild(USER_STATS)   # lazy হলে শুধু জমা অংশ — _merge_lazy এর পর আবার
+    OTP_INDEX.rebuild(USER_LAST_NUMBERS)
+
+def _merge_lazy(base):
+    """
+    snapshot এর stats/history/last active এর সাথে startup এর পরে জমা পরিবর্তন মেলায়।
+    জমা অংশটা ছোট, তাই সেটাই base এ ঢোকে, তারপর base ই লাইভ হয়।
+    """
+    global USER_STATS, USER_HISTORY, USER_LAST_ACTIVE
+    stats = base["USER_STATS"]
+    for s, st in USER_STATS.items():
+        old = stats.get(s)
+        if old is None:
+            stats[s] = st
+            continue
+        old["total"] += st["total"]
+        for svc, cs in st["services"].items():
+            dst = old["services"].setdefault(svc, {})
+            for c, n in cs.items():
+                dst[c] = dst.get(c, 0) + n
+    hist = base["USER_HISTORY"]
+    for s, h in USER_HISTORY.items():
+        if s in hist:
+            hist[s].extend(h)
+        else:
+            hist[s] = h
+    active = base["USER_LAST_ACTIVE"]
+    active.update(USER_LAST_ACTIVE)
+    USER_STATS, USER_HISTORY, USER_LAST_ACTIVE = stats, hist, active
+    AGG.top.rebuild(USER_STATS)
+
+_LAZY_TASK = None
+_WARM_TASK = None
+_OTP_DEFERRED = None   # lazy merge এর আগে পৌঁছানো OTP — (ts, uid, number, otp)
+
+async def _load_lazy():
+    global _OTP_DEFERRED
+    t0 = time.perf_counter()
+    try:
+        _merge_lazy(await asyncio.to_thread(lambda: _upgrade(JOURNAL.load_lazy())))
+    finally:
+        pending, _OTP_DEFERRED = _OTP_DEFERRED, None
+        for entry in pending or ():
+            _log_otp(*entry)
+    print(f"[LOAD] 👥 ইউজার stats/history লোড হলো ({(time.perf_counter() - t0) * 1000:.0f} ms)")
+
+def load_rest():
+    """post_init এ — বাকি ইউজার ডাটা আর নম্বর pool background এ, update আসা বন্ধ না করে"""
+    global _LAZY_TASK, _WARM_TASK, _OTP_DEFERRED
+    loop = asyncio.get_running_loop()
+    if JOURNAL.lazy_pending:
+        _OTP_DEFERRED = []
+        _LAZY_TASK = loop.create_task(_load_lazy())
+    # pool প্রথম দরকারে নিজেই লোড হয়; এটা শুধু আগেভাগে গরম করে রাখে
+    _WARM_TASK = loop.create_task(asyncio.to_thread(POOLS.warm, list(SERVICES), get_countries))
+
+def _state_complete():
+    """লাইভ state এ snapshot এর সব ইউজার ডাটা আছে কিনা (না থাকলে checkpoint নয়, compact)"""
+    if JOURNAL.lazy_pending:
+        return False
+    t = _LAZY_TASK
+    return t is None or (t.done() and not t.cancelled() and t.exception() is None)
+
+async def state_ready():
+    """ইউজার stats/history পড়ে এমন handler এর শুরুতে — background লোড শেষ হওয়া পর্যন্ত অপেক্ষা"""
+    if _LAZY_TASK is not None and not _LAZY_TASK.done():
+        await asyncio.shield(_LAZY_TASK)
+
+def pools_warm():
+    """সব pool লোড হয়েছে কিনা — তার আগে POOLS.service_counts() শুধু লোড হওয়াগুলোর যোগফল"""
+    return _WARM_TASK is None or _WARM_TASK.done()
+
+async def pools_ready():
+    """সব pool এর মোট লাগে এমন handler এর শুরুতে — warm শেষ হওয়া পর্যন্ত অপেক্ষা"""
+    if not pools_warm():
+        await asyncio.wait({_WARM_TASK})
 
 # ════════════════════════════════════════════════════════
 #                 NUMBER UTILITIES
@@ -76,6 +306,8 @@ def service_seen_dir(service):
     return path
 
 def get_countries(service):
+    if DB:
+        return DB.countries(service)
     d = service_dir(service)
     return [
         f[:-4] for f in os.listdir(d)
@@ -83,37 +315,191 @@ def get_countries(service):
     ]
 
 def get_numbers(service, country):
+    if DB:
+        return DB.numbers(service, country)
     p = os.path.join(service_dir(service), f"{country}.txt")
     if not os.path.exists(p):
         return []
-    with open(p) as f:
+    with READ_SECONDS.time("numbers"), open(p) as f:
         return [x.strip() for x in f if x.strip()]
 
+def get_pool_numbers(service, country):
+    """pool এর জন্য stock — packed uint64; txt এর পাশে রাখা .bin mmap করে লোড হয়"""
+    if DB:
+        return get_numbers(service, country)
+    d = service_dir(service)
+    return load_txt_packed(os.path.join(d, f"{country}.txt"), os.path.join(d, f"{country}.bin"))
+
+SEEN_TTL   = config.CLEANUP_DAYS * 86400
+_SEEN_LINES = {}   # (service, country) → seen ফাইলের লাইন সংখ্যা, compaction এর জন্য
+_SEEN_HELD  = {}   # compaction লেখা চলাকালীন যোগ হওয়া লাইন — নতুন ফাইলে আবার যায়
+
+def seen_path(service, country):
+    return os.path.join(service_seen_dir(service), f"global_{country}.txt")
+
 def get_seen(service, country):
-    p = os.path.join(service_seen_dir(service), f"global_{country}.txt")
+    """{number: দেওয়ার সময়} — যেগুলোর মেয়াদ শেষ সেগুলো বাদ"""
+    cutoff = time.time() - SEEN_TTL
+    if DB:
+        # expire_allocations পরে চলে — ততক্ষণ মেয়াদ শেষেরগুলো যেন গোনা না হয়
+        return DB.seen(service, country, cutoff)
+    p = seen_path(service, country)
     if not os.path.exists(p):
-        return set()
-    with open(p) as f:
-        return set(x.strip() for x in f)
+        return {}
+    mtime  = os.path.getmtime(p)
+    seen   = {}
+    lines  = 0
+    with READ_SECONDS.time("seen"), open(p) as f:
+        for line in f:
+            n, _, ts = line.strip().partition("\t")
+            if not n:
+                continue
+            lines += 1
+            # পুরনো ফরম্যাটে টাইমস্ট্যাম্প নেই — ফাইলের mtime ধরে নিই
+            ts = float(ts) if ts else mtime
+            if ts > cutoff and ts > seen.get(n, 0):
+                seen[n] = ts
+    _SEEN_LINES[(service, country)] = lines
+    return seen
 
 def add_seen(service, country, numbers):
-    with open(os.path.join(service_seen_dir(service), f"global_{country}.txt"), "a") as f:
-        f.write("\n".join(numbers) + "\n")
-
-def cleanup_seen():
     now = time.time()
-    for root, dirs, files in os.walk(config.SEEN_DIR):
-        for fn in files:
-            p = os.path.join(root, fn)
-            if os.path.isfile(p) and now - os.path.getmtime(p) > config.CLEANUP_DAYS * 86400:
-                os.remove(p)
+    if DB:
+        DB.add_allocations(service, country, numbers, ts=now)
+    else:
+        lines = "".join(f"{n}\t{now:.0f}\n" for n in numbers)
+        with open(seen_path(service, country), "a") as f:
+            f.write(lines)
+        key = (service, country)
+        _SEEN_LINES[key] = _SEEN_LINES.get(key, 0) + len(numbers)
+        if key in _SEEN_HELD:
+            _SEEN_HELD[key].append(lines)
+    POOLS.mark_seen(service, country, numbers)
+
+def add_numbers(service, country, numbers):
+    if DB:
+        DB.add_numbers(service, country, numbers)
+    else:
+        with open(os.path.join(service_dir(service), f"{country}.txt"), "a") as f:
+            f.write("\n" + "\n".join(numbers))
+    POOLS.add(service, country, numbers)
+
+def clear_country(service, country):
+    if DB:
+        DB.clear_country(service, country)
+    else:
+        open(os.path.join(service_dir(service), f"{country}.txt"), "w").close()
+    POOLS.clear(service, country)
+
+async def expire_seen():
+    """
+    CLEANUP_DAYS আগে দেওয়া নম্বরগুলো আবার stock এ ফেরত আনে (প্রতি নম্বরের নিজস্ব সময় ধরে)।
+    seen ফাইলে মরা লাইন বেশি জমে গেলে ফাইলটা ছোট করে আবার লেখে — লেখা thread এ।
+    """
+    cutoff   = time.time() - SEEN_TTL
+    released = POOLS.expire(cutoff)
+    if DB:
+        await asyncio.to_thread(DB.expire_allocations, cutoff)
+        return released
+    for key, lines in list(_SEEN_LINES.items()):
+        items = POOLS.seen_items(*key)
+        if lines <= 2 * len(items) + 1000 or key in _SEEN_HELD:
+            continue
+        data = "".join(f"{n}\t{ts:.0f}\n" for n, ts in items)
+        _SEEN_HELD[key] = []
+        try:
+            await asyncio.to_thread(atomic_write, seen_path(*key), data)
+        finally:
+            held = _SEEN_HELD.pop(key)
+        # লেখার সময় add_seen পুরনো ফাইলে append করে থাকতে পারে — rename এ সেটা হারিয়েছে
+        if held:
+            with open(seen_path(*key), "a") as f:
+                f.write("".join(held))
+        _SEEN_LINES[key] = len(items) + sum(h.count("\n") for h in held)
+    return released
+
+async def expire_seen_job(context: ContextTypes.DEFAULT_TYPE):
+    released = await expire_seen()
+    if released:
+        print(f"[SEEN] ♻️ {sum(len(r) for _, _, r in released)}টি নম্বর আবার stock এ")
 
 def remove_duplicates(service, country):
+    if DB:
+        # টেবিলের primary key ডুপ্লিকেট ঢুকতেই দেয় না
+        return len(get_numbers(service, country))
     nums = list(dict.fromkeys(get_numbers(service, country)))
     with open(os.path.join(service_dir(service), f"{country}.txt"), "w") as f:
         f.write("\n".join(nums))
+    POOLS.dedupe(service, country)
     return len(nums)
 
+# সব outbound মেসেজের queue — OTP সবার আগে, Telegram এর rate limit মেনে
+OUTBOX = Delivery(
+    workers=config.SEND_CONCURRENCY,
+    global_rate=config.SEND_GLOBAL_RATE,
+    chat_rate=config.SEND_CHAT_RATE,
+)
+
+def _drop_blocked(uid):
+    # বট block করা ইউজারকে তালিকা থেকে বাদ
+    if uid in USERS:
+        record("u-", uid, key=str(uid))
+
+BROADCAST = Broadcaster(OUTBOX, config.BROADCAST_FILE, on_blocked=_drop_blocked)
+
+# OTP গ্রুপের masked নম্বর → ইউজার খোঁজার suffix ইনডেক্স
+OTP_INDEX = OtpIndex()
+
+def stock_label(left):
+    """
+    বোতামে দেখানো stock — ১০ পর্যন্ত হুবহু, এর ওপরে মোটা দাগে (57 → 50+, 4837 → 4.8k+)।
+    label না বদলালে stock version বাড়ে না, তাই প্রতি allocation এ render cache ভাঙে না।
+    """
+    if left <= 10:
+        return str(left)
+    if left < 1000:
+        return f"{left // 10 * 10}+"
+    if left < 10000:
+        return f"{left // 100 / 10:g}k+"
+    return f"{left // 1000}k+"
+
+def stock_icon(left):
+    return "🟢" if left > 10 else ("🟡" if left > 0 else "🔴")
+
+# unseen নম্বরের resident index — প্রতি ক্লিকে ফাইল পড়তে হয় না
+POOLS = PoolIndex(get_pool_numbers, get_seen, ttl=SEEN_TTL, label=stock_label)
+
+# সার্ভিস/দেশের তালিকার render — POOLS.version() না বদলানো পর্যন্ত একই text + keyboard
+SCREENS = RenderCache()
+
+# ════════════════════════════════════════════════════════
+#                    METRICS
+# ════════════════════════════════════════════════════════
+SAVE_SECONDS = metrics.Histogram("bot_save_seconds", "User data write time")
+READ_SECONDS = metrics.Histogram("bot_file_read_seconds", "Number/seen file read time", ("kind",))
+OTP_SECONDS  = metrics.Histogram("bot_otp_delivery_seconds", "OTP group post to user delivery")
+OTP_POSTS    = metrics.Counter("bot_otp_posts_total", "OTP group posts by match result", ("result",))
+THROTTLED    = metrics.Counter("bot_throttled_total", "Updates dropped by flood control", ("action", "result"))
+
+metrics.Gauge("bot_stock_left", "Numbers left per service/country", lambda: {
+    (svc, c): POOLS.left(svc, c) for svc in SERVICES for c in get_countries(svc)
+}, ("service", "country"))
+metrics.Gauge("bot_users", "Registered users", lambda: len(USERS))
+metrics.Gauge("bot_active_users", "Users with an update in the last 15 minutes", metrics.active_users)
+metrics.Gauge("bot_pending_deliveries", "Messages waiting in the delivery queue", lambda: OUTBOX.pending)
+metrics.Gauge("bot_render_cache_hit_ratio", "Service/country screen cache hit ratio", SCREENS.hit_rate)
+metrics.Gauge("bot_otp_hit_ratio", "OTPs delivered per number handed out (all time)", lambda: AGG.hit_rate())
+
+# callback_data এর ডাইনামিক অংশ বাদ দিয়ে label, যাতে series সীমিত থাকে
+_CALLBACK_PREFIXES = ("svc_", "country_", "limit_", "del_svc_", "upload_svc_", "del_country_", "cl:", "br:")
+
+def callback_action(update):
+    data = update.callback_query.data or ""
+    for p in _CALLBACK_PREFIXES:
+        if data.startswith(p):
+            return p[:-1]
+    return data
+
 def format_number(n):
     """নম্বরের আগে + যোগ করে"""
     n = n.strip()
@@ -123,80 +509,55 @@ def format_number(n):
 
 def track(uid, service, country, count, numbers=None):
     s = str(uid)
-    if s not in USER_STATS:
-        USER_STATS[s] = {"total": 0, "services": {}}
-    USER_STATS[s]["total"] += count
-    svc = USER_STATS[s]["services"]
-    if service not in svc:
-        svc[service] = {}
-    svc[service][country] = svc[service].get(country, 0) + count
-
+    # stats, শেষ নম্বর, History (ring, সর্বোচ্চ HISTORY_SIZE) আর last active — সব _apply এ
+    record("t", s, service, country, count, numbers or None, int(time.time()), key=s)
     if numbers:
-        USER_LAST_NUMBERS[s] = numbers
-        # History সংরক্ষণ
-        if s not in USER_HISTORY:
-            USER_HISTORY[s] = []
-        for n in numbers:
-            USER_HISTORY[s].append({
-                "service": service,
-                "country": country,
-                "number":  format_number(n),
-                "time":    datetime.now().strftime("%d %b %Y %H:%M")
-            })
-        USER_HISTORY[s] = USER_HISTORY[s][-50:]  # সর্বোচ্চ ৫০টি রাখব
-
-    USER_LAST_ACTIVE[s] = datetime.now().strftime("%d %b %Y  %H:%M")
-    save_data()
+        OTP_INDEX.set(s, numbers)
 
 # ════════════════════════════════════════════════════════
 #              OTP MATCHING ENGINE
 # ════════════════════════════════════════════════════════
-def parse_masked(text):
-    results = []
-    for m in re.finditer(r'(\d+)([\u24B6-\u24E9]+)(\d+)', text):
-        results.append((m.group(1), len(m.group(2)), m.group(3)))
-    return results
-
-def clean(n):
-    return re.sub(r'[\s\-\+\(\)]', '', str(n))
-
-def is_match(prefix, hidden, suffix, real):
-    r = clean(real)
-    for v in ([r, r[1:]] if r.startswith('0') else [r]):
-        if not v.endswith(suffix):
-            continue
-        pos = len(v) - len(suffix) - hidden
-        if pos >= len(prefix) and v[pos - len(prefix):pos] == prefix:
-            return True
-    return False
-
 def find_users(prefix, hidden, suffix):
-    out = []
-    for uid_s, nums in USER_LAST_NUMBERS.items():
-        for n in (nums or []):
-            if is_match(prefix, hidden, suffix, clean(n)):
-                out.append((int(uid_s), n))
-                break
-    return out
-
-def get_otp(text):
-    for p in [
-        r'(?i)(?:otp|code|verification|pin|কোড)[:\s\-]+(\d{4,8})',
-        r'(?i)(?:is|হলো)\s*[:\-]?\s*(\d{4,8})',
-        r'\b(\d{4,8})\b',
-    ]:
-        m = re.search(p, text)
-        if m:
-            return m.group(1)
-    return None
-
-async def handle_otp(context, text):
-    masked_list = parse_masked(text)
+    return OTP_INDEX.find(prefix, hidden, suffix)
+
+def _number_service(uid, number):
+    """নম্বরটা কোন সার্ভিস থেকে নেওয়া — ইউজারের History র নতুন দিক থেকে খোঁজে"""
+    hist = USER_HISTORY.get(str(uid))
+    if hist:
+        for h in hist.newest(len(hist)):
+            if h.number == number:
+                return h.service
+    return ""
+
+def _log_otp(ts, uid, real_num, otp):
+    record("o", ts, _number_service(uid, real_num), real_num, otp, uid)
+
+def _otp_delivered(uid, real_num, otp):
+    def done(fut):
+        if fut.cancelled():
+            return
+        e = fut.exception()
+        if e is not None:
+            print(f"[OTP ❌] uid={uid} | {type(e).__name__}: {e}")
+            return
+        OTP_SECONDS.observe(fut.result())
+        entry = (int(time.time()), uid, real_num, otp or "N/A")
+        if _OTP_DEFERRED is not None:
+            # History এখনো merge হয়নি — সার্ভিস খুঁজলে "" পেতাম, তাই merge এর পরে লিখি
+            _OTP_DEFERRED.append(entry)
+        else:
+            _log_otp(*entry)
+        print(f"[OTP] ✅ uid={uid} | {fut.result() * 1000:.0f} ms")
+    return done
+
+async def handle_otp(context, text, received=None):
+    """ম্যাচ হওয়া ইউজারদের OTP delivery queue তে দেয়; কতজনকে queue করা হলো রিটার্ন করে"""
+    masked_list, otp = parse_otp(text)
     if not masked_list:
+        OTP_POSTS.inc("no_mask")
         return 0
-    otp = get_otp(text)
     sent = 0
-    for prefix, hidden, suffix in masked_list:
+    for prefix, hidden, suffix, _ in masked_list:
         for uid, real_num in find_users(prefix, hidden, suffix):
             try:
                 if otp:
@@ -226,32 +587,33 @@ async def handle_otp(context, text):
                         f"│ {text[:200]}\n"
                         f"└─────────────────────"
                     )
-                await context.bot.send_message(chat_id=uid, text=msg, parse_mode="Markdown")
-                OTP_LOG.append({
-                    "time":   datetime.now().strftime("%d %b %H:%M"),
-                    "number": format_number(real_num),
-                    "otp":    otp or "N/A",
-                    "uid":    uid
-                })
-                save_data()
+                fut = OUTBOX.submit(
+                    uid, msg, priority=PRIO_OTP, received=received,
+                    deadline=config.OTP_DEADLINE, parse_mode="Markdown"
+                )
+                fut.add_done_callback(_otp_delivered(uid, real_num, otp))
                 sent += 1
             except Exception as e:
                 print(f"[OTP ❌] uid={uid} | {e}")
+    OTP_POSTS.inc("matched" if sent else "no_user")
     return sent
 
+@metrics.handler("otp_listener")
 async def otp_listener(update: Update, context: ContextTypes.DEFAULT_TYPE):
     msg = update.message or update.channel_post
     if not msg or msg.chat.id != config.OTP_GROUP_ID:
         return
+    received = time.monotonic()
     text = msg.text or msg.caption or ""
     if text:
-        count = await handle_otp(context, text)
+        count = await handle_otp(context, text, received)
         if count:
-            print(f"[OTP] ✅ {count} জনকে forward করা হয়েছে")
+            print(f"[OTP] 📤 {count} জনের জন্য queue করা হয়েছে")
 
 # ════════════════════════════════════════════════════════
 #                FILE UPLOAD (Service based)
 # ════════════════════════════════════════════════════════
+@metrics.handler("receive_file")
 async def receive_file(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if not update.effective_user or not update.message or not update.message.document:
         return
@@ -260,27 +622,94 @@ async def receive_file(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
     service = UPLOAD_MODE[uid]
     doc = update.message.document
+    name = doc.file_name or "upload.txt"
+    fd, tmp = tempfile.mkstemp(suffix="_" + os.path.basename(name))
+    os.close(fd)
     try:
-        raw   = await (await doc.get_file()).download_as_bytearray()
-        lines = [x.strip() for x in raw.decode("utf-8", errors="ignore").splitlines() if x.strip()]
-        if not lines:
+        # পুরো ফাইল মেমোরিতে না এনে ডিস্কে নামিয়ে stream করে পড়ি
+        await (await doc.get_file()).download_to_drive(custom_path=tmp)
+        report = await asyncio.to_thread(
+            ingest_file, tmp, name,
+            lambda c, n: POOLS.contains(service, c, n),
+            lambda c, nums: add_numbers(service, c, nums),
+        )
+        if not report.lines:
             await update.message.reply_text("❌ ফাইল খালি!")
             UPLOAD_MODE.pop(uid, None)
             return
-        country = doc.file_name.replace(".txt", "").strip()
-        with open(os.path.join(service_dir(service), f"{country}.txt"), "a") as f:
-            f.write("\n" + "\n".join(lines))
+        rows = "\n".join(
+            f"🌍 *{c}*  ┄  ➕ {a}  |  ♻️ {d}  |  ⚠️ {i}"
+            for c, (a, d, i) in report.countries.items()
+        )
         await update.message.reply_text(
             f"✅ সফলভাবে যোগ হয়েছে!\n\n"
             f"📱 Service: *{service}*\n"
-            f"🌍 Country: *{country}*\n"
-            f"📲 নম্বর: *{len(lines)}টি*",
+            f"{rows}\n\n"
+            f"📲 নতুন নম্বর: *{report.added}টি*\n"
+            f"♻️ ডুপ্লিকেট: *{report.duplicate}টি*\n"
+            f"⚠️ ভুল ফরম্যাট: *{report.invalid}টি*\n"
+            f"⚡ {report.rate:,.0f} লাইন/সেকেন্ড",
             parse_mode="Markdown"
         )
     except Exception as e:
         await update.message.reply_text(f"❌ Error: {e}")
+    finally:
+        os.remove(tmp)
     UPLOAD_MODE.pop(uid, None)
 
+# ════════════════════════════════════════════════════════
+#                 FLOOD CONTROL
+# ════════════════════════════════════════════════════════
+# group -1 এ সব update এর আগে চলে; কোটা শেষ হলে ApplicationHandlerStop — আসল handler
+# (ডিস্ক, pool, save) পর্যন্ত পৌঁছায়ই না। খরচ একটা dict lookup + token bucket।
+FLOOD = KeyedLimiter(config.FLOOD_LIMITS)
+metrics.Gauge("bot_flood_buckets", "Live per-user flood control buckets", lambda: len(FLOOD))
+
+_FLOOD_MENU = {
+    "📱 Get Number": "browse",
+    "📦 Services":   "browse",
+    "📊 Live Stock": "stock",
+    "🕘 My History": "history",
+}
+
+def flood_action(update):
+    q = update.callback_query
+    if q is not None:
+        return "number" if (q.data or "").startswith("country_") else "browse"
+    m = update.message
+    if m is None or m.chat.id == config.OTP_GROUP_ID:
+        return None
+    return _FLOOD_MENU.get(m.text, "default")
+
+async def flood_guard(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    user = update.effective_user
+    if not config.FLOOD_CONTROL or user is None or user.id in ADMINS:
+        return
+    action = flood_action(update)
+    if action is None:
+        return
+    verdict = FLOOD.check(user.id, action)
+    if verdict == ALLOW:
+        return
+    THROTTLED.inc(action, verdict)
+    if verdict == NOTIFY:
+        # প্রতি দফায় একবারই জানাই, বাকিগুলো চুপচাপ বাদ
+        wait = "⏳ একটু ধীরে! কয়েক সেকেন্ড পর আবার চেষ্টা করো।"
+        try:
+            if update.callback_query is not None:
+                await update.callback_query.answer(wait)
+            elif update.message is not None:
+                await update.message.reply_text(wait)
+        except Exception as e:
+            print(f"[FLOOD] uid={user.id} জানানো যায়নি: {e}")
+    elif update.callback_query is not None:
+        # উত্তর না দিলে বোতামের spinner ঘুরতেই থাকে
+        try:
+            await update.callback_query.answer()
+        except Exception:
+            pass
+    raise ApplicationHandlerStop
+
 # ════════════════════════════════════════════════════════
 #                 USER PANEL
 # ════════════════════════════════════════════════════════
@@ -291,6 +720,7 @@ def main_keyboard():
         [KeyboardButton("☎️ Support")],
     ], resize_keyboard=True)
 
+@metrics.handler("start")
 async def cmd_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if not update.effective_user:
         return
@@ -299,8 +729,8 @@ async def cmd_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text("🚫 তুমি banned।")
         return
     name = update.effective_user.first_name or "বন্ধু"
-    USERS.add(uid)
-    save_data()
+    if uid not in USERS:
+        record("u+", uid, key=str(uid))
     welcome = (
         f"╔═══════════════════════╗\n"
         f"║   ✨ Number Bot ✨     ║\n"
@@ -314,6 +744,7 @@ async def cmd_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if update.message:
         await update.message.reply_text(welcome, parse_mode="Markdown", reply_markup=main_keyboard())
 
+@metrics.handler("menu", action=lambda u: u.message.text if u.message else "")
 async def menu_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if not update.message:
         return
@@ -324,26 +755,27 @@ async def menu_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await show_service_list(update, context)
 
     elif t == "📊 Live Stock":
+        await pools_ready()
         lines = []
         for svc in SERVICES:
             for c in get_countries(svc):
-                total = len(get_numbers(svc, c))
-                used  = len(get_seen(svc, c))
-                left  = total - used
+                total, used, left = POOLS.counts(svc, c)
                 bar   = "🟢" if left > 10 else ("🟡" if left > 0 else "🔴")
                 lines.append(f"{bar} *{svc} › {c}*\n    ┗ বাকি: {left}  |  মোট: {total}  |  ব্যবহৃত: {used}")
         msg = "📊 *লাইভ স্টক রিপোর্ট*\n\n" + ("\n\n".join(lines) if lines else "⚠️ কোনো নম্বর নেই।")
         await update.message.reply_text(msg, parse_mode="Markdown")
 
     elif t == "🕘 My History":
+        await state_ready()
         s    = str(uid)
-        hist = USER_HISTORY.get(s, [])
+        hist = USER_HISTORY.get(s)
         if not hist:
             await update.message.reply_text("📭 তোমার কোনো ইতিহাস নেই।")
             return
         lines = []
-        for h in hist[-15:][::-1]:
-            lines.append(f"📱 `{h['number']}`  ›  *{h['service']}*  ›  {h['country']}\n    🕐 {h['time']}")
+        for h in hist.newest(15):
+            lines.append(f"📱 `{format_number(h.number)}`  ›  *{h.service}*  ›  {h.country}\n"
+                         f"    🕐 {fmt_time(h.ts, '%d %b %Y %H:%M')}")
         await update.message.reply_text(
             "🕘 *তোমার শেষ নম্বরগুলো:*\n\n" + "\n\n".join(lines),
             parse_mode="Markdown"
@@ -360,60 +792,139 @@ async def menu_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
 # ════════════════════════════════════════════════════════
 #          SERVICE → COUNTRY → NUMBER SCREENS
 # ════════════════════════════════════════════════════════
-async def show_service_list(update, context):
+def render_service_list():
     if not SERVICES:
-        text = "⚠️ কোনো সার্ভিস নেই।"
-        kb   = []
-    else:
-        text = "📦 *সার্ভিস বেছে নাও*"
-        icons = {"WhatsApp": "💬", "Telegram": "✈️", "Facebook": "📘"}
-        kb = []
-        for svc in SERVICES:
-            icon = icons.get(svc, "📱")
-            # মোট বাকি নম্বর গণনা
-            total_left = sum(
-                len(set(get_numbers(svc, c)) - get_seen(svc, c))
-                for c in get_countries(svc)
-            )
-            bar = "🟢" if total_left > 10 else ("🟡" if total_left > 0 else "🔴")
-            kb.append([InlineKeyboardButton(
-                f"{bar} {icon} {svc}  ({total_left})",
-                callback_data=f"svc_{svc}"
-            )])
-        kb.append([InlineKeyboardButton("🔄 Refresh", callback_data="refresh_services")])
+        return "⚠️ কোনো সার্ভিস নেই।", InlineKeyboardMarkup([])
+    icons = {"WhatsApp": "💬", "Telegram": "✈️", "Facebook": "📘"}
+    warm  = pools_warm()
+    kb = []
+    for svc in SERVICES:
+        icon = icons.get(svc, "📱")
+        # মোট বাকি নম্বর গণনা — warm শেষ না হলে আংশিক, তাই তখন সংখ্যা দেখাই না
+        total_left = POOLS.service_counts(svc)[2]
+        label = f"{stock_icon(total_left)} {icon} {svc}  ({stock_label(total_left)})" if warm \
+            else f"⏳ {icon} {svc}  (লোড হচ্ছে…)"
+        kb.append([InlineKeyboardButton(label, callback_data=f"svc_{svc}")])
+    kb.append([InlineKeyboardButton("🔄 Refresh", callback_data="refresh_services")])
+    return "📦 *সার্ভিস বেছে নাও*", InlineKeyboardMarkup(kb)
+
+# ── pagination ──
+# callback: "cl:<sort>:<cursor>:<service>" (দেশের তালিকা), "br:<sort>:<cursor>" (Bulk Remove)
+# sort: "a" = নাম, "s" = বাকি stock (বেশি → কম); cursor = ক্রমের মধ্যে পেজের শুরু
+SORTS = ("a", "s")
+
+def country_order(service, sort):
+    """দেশের ক্রম — stock version না বদলানো পর্যন্ত আগের হিসাবটাই (প্রতি ক্লিকে sort/listdir নয়)"""
+    def build():
+        countries = sorted(get_countries(service))
+        if sort == "s":
+            countries.sort(key=lambda c: -POOLS.left(service, c))
+        return countries
+    return SCREENS.get(("order", service, sort), POOLS.version(service), build)
+
+def remove_order(sort):
+    """Bulk Remove এর (service, country) জোড়ার ক্রম"""
+    def build():
+        pairs = [(svc, c) for svc in SERVICES for c in country_order(svc, "a")]
+        if sort == "s":
+            pairs.sort(key=lambda x: -POOLS.left(*x))
+        return pairs
+    return SCREENS.get(("remove_order", tuple(SERVICES), sort),
+                       tuple(POOLS.version(svc) for svc in SERVICES), build)
+
+def _page(items, cursor):
+    # cursor callback_data থেকে আসে — পেজের শুরুতে নামিয়ে আর শেষ পেজে আটকে রাখি
+    last   = max(len(items) - 1, 0) // config.PAGE_SIZE * config.PAGE_SIZE
+    cursor = min(max(cursor, 0) // config.PAGE_SIZE * config.PAGE_SIZE, last)
+    return items[cursor:cursor + config.PAGE_SIZE], cursor
+
+def _page_rows(cb, sort, cursor, total):
+    """◀️ n/m ▶️ আর sort বদলানোর বোতাম; cb(sort, cursor) → callback_data"""
+    size, rows = config.PAGE_SIZE, []
+    if total > size:
+        nav = []
+        if cursor > 0:
+            nav.append(InlineKeyboardButton("◀️ Prev", callback_data=cb(sort, max(cursor - size, 0))))
+        nav.append(InlineKeyboardButton(f"📄 {cursor // size + 1}/{(total + size - 1) // size}", callback_data="noop"))
+        if cursor + size < total:
+            nav.append(InlineKeyboardButton("Next ▶️", callback_data=cb(sort, cursor + size)))
+        rows.append(nav)
+    if total > 1:
+        other = "a" if sort == "s" else "s"
+        label = "🔤 নাম অনুযায়ী" if other == "a" else "📉 Stock অনুযায়ী"
+        rows.append([InlineKeyboardButton(label, callback_data=cb(other, 0))])
+    return rows
+
+def _parse_page(data, parts):
+    """'cl:s:20:WhatsApp' → ['s', 20, 'WhatsApp']; ভুল হলে প্রথম পেজ"""
+    f = data.split(":", parts)[1:]
+    sort   = f[0] if f and f[0] in SORTS else "a"
+    cursor = int(f[1]) if len(f) > 1 and f[1].isdigit() else 0
+    return [sort, cursor] + f[2:]
+
+def render_country_list(service, sort="a", cursor=0):
+    countries = country_order(service, sort) if service in SERVICES else []
+    if not countries:
+        return f"⚠️ *{service}* এ কোনো দেশ নেই।", InlineKeyboardMarkup(
+            [[InlineKeyboardButton("⬅️ Back", callback_data="back_to_services")]])
+    page, cursor = _page(countries, cursor)
+    kb = []
+    # stock শুধু এই পেজের দেশগুলোর
+    for c in page:
+        left = POOLS.left(service, c)
+        kb.append([InlineKeyboardButton(
+            f"{stock_icon(left)}  {c}  ({stock_label(left)})",
+            callback_data=f"country_{service}|{c}"
+        )])
+    kb += _page_rows(lambda so, cu: f"cl:{so}:{cu}:{service}", sort, cursor, len(countries))
+    kb.append([InlineKeyboardButton("⬅️ Back", callback_data="back_to_services")])
+    return f"📦 *{service}* › দেশ বেছে নাও\n\n🟢 পর্যাপ্ত  🟡 কম  🔴 শেষ", InlineKeyboardMarkup(kb)
+
+def render_bulk_remove(sort="a", cursor=0):
+    pairs = remove_order(sort)
+    page, cursor = _page(pairs, cursor)
+    kb = [[InlineKeyboardButton(f"🗑 {svc} › {c}  ({stock_label(POOLS.left(svc, c))})",
+                                callback_data=f"del_country_{svc}|{c}")] for svc, c in page]
+    kb += _page_rows(lambda so, cu: f"br:{so}:{cu}", sort, cursor, len(pairs))
+    kb.append([InlineKeyboardButton("⬅️ Back", callback_data="back_to_admin")])
+    return "🗑 *কোন দেশের নম্বর মুছবে?*", InlineKeyboardMarkup(kb)
+
+async def _edit_screen(q, text, markup):
+    try:
+        await q.edit_message_text(text, parse_mode="Markdown", reply_markup=markup)
+    except BadRequest as e:
+        # Refresh চাপলে কিন্তু কিছু বদলায়নি
+        if "not modified" not in str(e).lower():
+            raise
 
-    markup = InlineKeyboardMarkup(kb)
+async def show_service_list(update, context):
+    if pools_warm():
+        text, markup = SCREENS.get(("services", tuple(SERVICES)), POOLS.version(), render_service_list)
+    else:
+        # "লোড হচ্ছে" render cache এ রাখা যাবে না — warm শেষে version নাও বদলাতে পারে
+        text, markup = render_service_list()
     if hasattr(update, "callback_query") and update.callback_query:
-        await update.callback_query.edit_message_text(text, parse_mode="Markdown", reply_markup=markup)
+        await _edit_screen(update.callback_query, text, markup)
     else:
         await update.message.reply_text(text, parse_mode="Markdown", reply_markup=markup)
 
-async def show_country_list(update, context, service):
-    countries = get_countries(service)
-    if not countries:
-        text = f"⚠️ *{service}* এ কোনো দেশ নেই।"
-        kb   = [[InlineKeyboardButton("⬅️ Back", callback_data="back_to_services")]]
+async def show_country_list(update, context, service, sort="a", cursor=0):
+    if service in SERVICES:
+        # cache key এ আসল পেজের শুরু — বানানো cursor এ নতুন entry হয় না
+        _, cursor = _page(country_order(service, sort), cursor)
+        text, markup = SCREENS.get(("countries", service, sort, cursor), POOLS.version(service),
+                                   lambda: render_country_list(service, sort, cursor))
     else:
-        text = f"📦 *{service}* › দেশ বেছে নাও\n\n🟢 পর্যাপ্ত  🟡 কম  🔴 শেষ"
-        kb   = []
-        for c in countries:
-            left   = len(set(get_numbers(service, c)) - get_seen(service, c))
-            status = "🟢" if left > 10 else ("🟡" if left > 0 else "🔴")
-            kb.append([InlineKeyboardButton(
-                f"{status}  {c}  ({left})",
-                callback_data=f"country_{service}|{c}"
-            )])
-        kb.append([InlineKeyboardButton("⬅️ Back", callback_data="back_to_services")])
-
-    q = update.callback_query
-    await q.edit_message_text(text, parse_mode="Markdown", reply_markup=InlineKeyboardMarkup(kb))
+        # অজানা service (পুরনো বা বানানো বোতাম) — ডিস্ক বা cache ছোঁয় না
+        text, markup = render_country_list(service, sort, cursor)
+    await _edit_screen(update.callback_query, text, markup)
 
 async def show_numbers(update, context, service, country):
     q   = update.callback_query
     uid = q.from_user.id
 
-    unseen = list(set(get_numbers(service, country)) - get_seen(service, country))
-    if not unseen:
+    selected = POOLS.take(service, country, NUMBER_LIMIT)
+    if not selected:
         await q.edit_message_text(
             f"╔══════════════════════╗\n"
             f"║  ❌  নম্বর শেষ!      ║\n"
@@ -427,8 +938,7 @@ async def show_numbers(update, context, service, country):
         )
         return
 
-    limit    = min(NUMBER_LIMIT, len(unseen))
-    selected = random.sample(unseen, limit)
+    limit    = len(selected)
     add_seen(service, country, selected)
     track(uid, service, country, len(selected), selected)
 
@@ -459,13 +969,13 @@ async def show_numbers(update, context, service, country):
 # ════════════════════════════════════════════════════════
 #               CALLBACK HANDLER
 # ════════════════════════════════════════════════════════
+@metrics.handler("callback", action=callback_action)
 async def callback_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     global NUMBER_LIMIT, SERVICES
     q    = update.callback_query
     await q.answer()
     data = q.data
     uid  = q.from_user.id
-    cleanup_seen()
 
     # ── USER ──────────────────────────────────
     if data in ("back_to_services", "refresh_services"):
@@ -475,6 +985,13 @@ async def callback_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
         service = data[4:]
         await show_country_list(update, context, service)
 
+    elif data.startswith("cl:"):
+        sort, cursor, service = _parse_page(data, 3)
+        await show_country_list(update, context, service, sort, cursor)
+
+    elif data == "noop":
+        pass
+
     elif data.startswith("country_"):
         parts   = data[8:].split("|", 1)
         service = parts[0]
@@ -510,7 +1027,7 @@ async def callback_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
         elif data.startswith("limit_"):
             NUMBER_LIMIT = int(data[6:])
-            save_data()
+            record("l", NUMBER_LIMIT)
             await q.message.edit_text(
                 f"✅ লিমিট আপডেট: *{NUMBER_LIMIT}টি*",
                 parse_mode="Markdown",
@@ -539,8 +1056,7 @@ async def callback_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
         elif data.startswith("del_svc_"):
             svc = data[8:]
             if svc in SERVICES:
-                SERVICES.remove(svc)
-                save_data()
+                record("s-", svc)
             await q.message.edit_text(
                 f"✅ *{svc}* সার্ভিস মুছে গেছে।",
                 parse_mode="Markdown",
@@ -562,31 +1078,24 @@ async def callback_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
             UPLOAD_MODE[uid] = service
             await q.message.reply_text(
                 f"📥 *{service}* এ নম্বর যোগ করো\n\n"
-                f"একটি `.txt` ফাইল পাঠাও।\n"
+                f"একটি `.txt` (অথবা `.gz` / একাধিক দেশের `.zip`) ফাইল পাঠাও।\n"
                 f"📌 ফাইলের নাম = দেশের নাম\n"
                 f"📌 প্রতিটি লাইনে একটি নম্বর",
                 parse_mode="Markdown"
             )
 
         # ── Bulk Remove ──
-        elif data == "bulk_remove":
-            kb = []
-            for svc in SERVICES:
-                for c in get_countries(svc):
-                    kb.append([InlineKeyboardButton(f"🗑 {svc} › {c}", callback_data=f"del_country_{svc}|{c}")])
-            kb.append([InlineKeyboardButton("⬅️ Back", callback_data="back_to_admin")])
-            await q.message.edit_text(
-                "🗑 *কোন দেশের নম্বর মুছবে?*",
-                parse_mode="Markdown",
-                reply_markup=InlineKeyboardMarkup(kb)
-            )
+        elif data == "bulk_remove" or data.startswith("br:"):
+            sort, cursor = _parse_page(data, 2)
+            text, markup = render_bulk_remove(sort, cursor)
+            await _edit_screen(q, text, markup)
 
         elif data.startswith("del_country_"):
             parts   = data[12:].split("|", 1)
             service = parts[0]
             country = parts[1]
             removed = len(get_numbers(service, country))
-            open(os.path.join(service_dir(service), f"{country}.txt"), "w").close()
+            clear_country(service, country)
             await q.message.edit_text(
                 f"✅ *{service} › {country}* থেকে *{removed}টি* নম্বর মুছে গেছে।",
                 parse_mode="Markdown",
@@ -595,21 +1104,17 @@ async def callback_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
         # ── Statistics Dashboard ──
         elif data == "statistics":
+            await state_ready()
+            await pools_ready()
             total_numbers = 0
             service_stats = {}
             for svc in SERVICES:
-                svc_total = 0
-                svc_left  = 0
-                for c in get_countries(svc):
-                    t = len(get_numbers(svc, c))
-                    l = len(set(get_numbers(svc, c)) - get_seen(svc, c))
-                    svc_total += t
-                    svc_left  += l
+                svc_total, _, svc_left = POOLS.service_counts(svc)
                 service_stats[svc] = {"total": svc_total, "left": svc_left}
                 total_numbers += svc_total
 
-            # ইউজার স্ট্যাটিস্টিক্স
-            top_users = sorted(USER_STATS.items(), key=lambda x: x[1].get("total", 0), reverse=True)[:5]
+            # ইউজার স্ট্যাটিস্টিক্স — leaderboard প্রতিটি track() এ আপডেট হয়
+            top_users = AGG.top.top(5)
 
             msg = (
                 f"╔═══════════════════════╗\n"
@@ -627,9 +1132,9 @@ async def callback_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
             if top_users:
                 msg += "━━━━━━━━━━━━━━━\n🏆 *Top 5 Users:*\n\n"
-                for i, (uid_s, stats) in enumerate(top_users, 1):
-                    last = USER_LAST_ACTIVE.get(uid_s, "N/A")
-                    msg += f"{i}. `{uid_s}`  ┄  *{stats.get('total', 0)}টি*  ┄  {last}\n"
+                for i, (uid_s, total) in enumerate(top_users, 1):
+                    last = fmt_time(USER_LAST_ACTIVE.get(uid_s))
+                    msg += f"{i}. `{uid_s}`  ┄  *{total}টি*  ┄  {last}\n"
 
             await q.message.edit_text(
                 msg, parse_mode="Markdown",
@@ -639,6 +1144,20 @@ async def callback_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 ])
             )
 
+        # ── Stock Consistency Check ──
+        elif data == "stock_check":
+            mismatches = await asyncio.to_thread(POOLS.check, list(SERVICES), get_countries)
+            if not mismatches:
+                msg = "✅ *স্টক কাউন্টার ঠিক আছে!*\n\nডিস্কের সাথে সব মিলেছে।"
+            else:
+                msg = f"⚠️ *{len(mismatches)}টি কাউন্টার মেলেনি* — ডিস্ক থেকে আবার বানানো হয়েছে।\n"
+                for svc, c, mem, disk in mismatches[:15]:
+                    msg += f"\n• *{svc} › {c}*\n    ┗ মেমোরি: {mem[0]}/{mem[1]}/{mem[2]}  |  ডিস্ক: {disk[0]}/{disk[1]}/{disk[2]}"
+            await q.message.edit_text(
+                msg, parse_mode="Markdown",
+                reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("⬅️ Admin Panel", callback_data="back_to_admin")]])
+            )
+
         # ── Clean Dupes ──
         elif data == "clean_dupes":
             total = 0
@@ -680,20 +1199,26 @@ async def callback_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
         # ── OTP Status ──
         elif data == "otp_status":
+            await state_ready()
             active = [(u, n) for u, n in USER_LAST_NUMBERS.items() if n]
             if not active:
                 msg = "📊 *OTP Status*\n\nএখন কোনো ইউজার সক্রিয় নেই।"
             else:
                 lines = []
                 for uid_s, nums in active[:15]:
-                    last = USER_LAST_ACTIVE.get(uid_s, "N/A")
+                    last = fmt_time(USER_LAST_ACTIVE.get(uid_s))
                     lines.append(f"👤 `{uid_s}`\n    ┗ {len(nums)}টি নম্বর  |  {last}")
                 msg = "📊 *সক্রিয় ইউজার ও নম্বর:*\n\n" + "\n\n".join(lines)
 
             if OTP_LOG:
                 msg += "\n\n━━━━━━━━━━━━━━━\n📋 *শেষ ৫টি OTP:*\n"
-                for log in OTP_LOG[-5:][::-1]:
-                    msg += f"\n🕐 {log['time']}\n    📱 `{log['number']}`  🔢 `{log['otp']}`"
+                for log in OTP_LOG.newest(5):
+                    msg += (f"\n🕐 {fmt_time(log.ts, '%d %b %H:%M')}\n"
+                            f"    📱 `{format_number(log.number)}`  🔢 `{log.otp}`")
+                hour = count_since(OTP_LOG, 3600)
+                if hour:
+                    msg += "\n\n⏱ *গত ১ ঘণ্টায় OTP:*\n" + "\n".join(
+                        f"    {svc or 'অজানা'}: {n}টি" for svc, n in hour.most_common())
 
             await q.message.edit_text(
                 msg, parse_mode="Markdown",
@@ -703,9 +1228,54 @@ async def callback_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 ])
             )
 
+        # ── Trends ──
+        elif data == "trends":
+            await _edit_screen(q, render_trends(), InlineKeyboardMarkup([
+                [InlineKeyboardButton("🔄 Refresh", callback_data="trends"),
+                 InlineKeyboardButton("⬅️ Back",   callback_data="back_to_admin")]
+            ]))
+
 # ════════════════════════════════════════════════════════
 #                  ADMIN PANEL
 # ════════════════════════════════════════════════════════
+def render_trends(now=None):
+    """AGG এর নির্দিষ্ট সংখ্যক bucket থেকে — ইউজার বা ইতিহাসের আকারের ওপর নির্ভর করে না"""
+    a, o = AGG.assigned, AGG.otps
+    hours = [sum(c.values()) for c in a["hour"].series(24, now)]
+    day_a = a["hour"].sum(24, now)   # "service|country" → নম্বর
+    day_o = o["hour"].sum(24, now)   # service → OTP
+    per_svc = {}
+    for key, n in day_a.items():
+        svc = key.split("|", 1)[0]
+        per_svc[svc] = per_svc.get(svc, 0) + n
+
+    def total(r, k):
+        return sum(r.sum(k, now).values())
+
+    msg = (
+        f"╔═══════════════════════╗\n"
+        f"║  📈  Trends           ║\n"
+        f"╚═══════════════════════╝\n\n"
+        f"📲 *নম্বর দেওয়া*\n"
+        f"    ১ ঘণ্টা: *{total(a['minute'], 60)}*  |  ২৪ ঘণ্টা: *{sum(hours)}*  |  ৭ দিন: *{total(a['day'], 7)}*\n"
+        f"🔔 *OTP পৌঁছেছে*\n"
+        f"    ১ ঘণ্টা: *{total(o['minute'], 60)}*  |  ২৪ ঘণ্টা: *{sum(day_o.values())}*  |  ৭ দিন: *{total(o['day'], 7)}*\n"
+        f"🎯 OTP hit rate (সব সময়): *{AGG.hit_rate() * 100:.1f}%*\n\n"
+        f"━━━━━━━━━━━━━━━\n"
+        f"🕐 *শেষ ২৪ ঘণ্টা, ঘণ্টা প্রতি নম্বর:*\n`{sparkline(hours)}`  (সর্বোচ্চ {max(hours)})\n"
+    )
+    if per_svc or day_o:
+        msg += "\n📦 *সার্ভিস (২৪ ঘণ্টা):*\n"
+        for svc in sorted(set(per_svc) | set(day_o), key=lambda x: -per_svc.get(x, 0)):
+            n, otps = per_svc.get(svc, 0), day_o.get(svc, 0)
+            rate = f"{otps / n * 100:.0f}%" if n else "—"
+            msg += f"    *{svc or 'অজানা'}*  ┄  {n} নম্বর  ┄  {otps} OTP  ┄  🎯 {rate}\n"
+    if day_a:
+        msg += "\n🌍 *শীর্ষ দেশ (২৪ ঘণ্টা):*\n"
+        for key, n in sorted(day_a.items(), key=lambda x: -x[1])[:5]:
+            msg += f"    {key.replace('|', ' › ')}: {n}\n"
+    return msg
+
 async def show_admin_panel(message, edit=False):
     text = (
         f"╔═══════════════════════╗\n"
@@ -729,7 +1299,9 @@ async def show_admin_panel(message, edit=False):
          InlineKeyboardButton("➖ Remove Admin",      callback_data="remove_admin")],
         [InlineKeyboardButton("🚫 Ban User",          callback_data="ban_user"),
          InlineKeyboardButton("✅ Unban User",        callback_data="unban_user")],
-        [InlineKeyboardButton("🗑 Clean Duplicates",  callback_data="clean_dupes")],
+        [InlineKeyboardButton("🗑 Clean Duplicates",  callback_data="clean_dupes"),
+         InlineKeyboardButton("🧮 Stock Check",       callback_data="stock_check")],
+        [InlineKeyboardButton("📈 Trends",            callback_data="trends")],
     ]
     markup = InlineKeyboardMarkup(kb)
     if edit:
@@ -737,6 +1309,7 @@ async def show_admin_panel(message, edit=False):
     else:
         await message.reply_text(text, parse_mode="Markdown", reply_markup=markup)
 
+@metrics.handler("admin")
 async def cmd_admin(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if not update.effective_user or not update.message:
         return
@@ -748,6 +1321,7 @@ async def cmd_admin(update: Update, context: ContextTypes.DEFAULT_TYPE):
 # ════════════════════════════════════════════════════════
 #               ADMIN TEXT INPUT
 # ════════════════════════════════════════════════════════
+@metrics.handler("admin_text")
 async def admin_text(update: Update, context: ContextTypes.DEFAULT_TYPE):
     global SERVICES
     if not update.effective_user or not update.message:
@@ -761,29 +1335,25 @@ async def admin_text(update: Update, context: ContextTypes.DEFAULT_TYPE):
     txt = update.message.text.strip()
     try:
         if mode == "add_admin":
-            ADMINS.add(int(txt)); save_data()
+            record("a+", int(txt))
             await update.message.reply_text(f"✅ Admin যোগ হয়েছে: `{txt}`", parse_mode="Markdown")
         elif mode == "remove_admin":
-            ADMINS.discard(int(txt)); save_data()
+            record("a-", int(txt))
             await update.message.reply_text(f"❌ Admin বাদ: `{txt}`", parse_mode="Markdown")
         elif mode == "broadcast":
-            sent = 0
-            for u in list(USERS):
-                try:
-                    await context.bot.send_message(u, f"📢 *বট নোটিশ*\n\n{txt}", parse_mode="Markdown")
-                    sent += 1
-                except: pass
-            await update.message.reply_text(f"✅ *{sent}জন* ইউজারকে পাঠানো হয়েছে।", parse_mode="Markdown")
+            if BROADCAST.running:
+                await update.message.reply_text("⏳ আগের Broadcast এখনো চলছে, শেষ হলে আবার চেষ্টা করো।")
+            else:
+                await BROADCAST.start(context.bot, uid, txt, sorted(USERS))
         elif mode == "ban_user":
-            BANNED.add(int(txt)); save_data()
+            record("b+", int(txt))
             await update.message.reply_text(f"🚫 Banned: `{txt}`", parse_mode="Markdown")
         elif mode == "unban_user":
-            BANNED.discard(int(txt)); save_data()
+            record("b-", int(txt))
             await update.message.reply_text(f"✅ Unbanned: `{txt}`", parse_mode="Markdown")
         elif mode == "add_service":
             if txt not in SERVICES:
-                SERVICES.append(txt)
-                save_data()
+                record("s+", txt)
                 await update.message.reply_text(f"✅ *{txt}* সার্ভিস যোগ হয়েছে!", parse_mode="Markdown")
             else:
                 await update.message.reply_text(f"⚠️ *{txt}* আগে থেকেই আছে।", parse_mode="Markdown")
@@ -791,16 +1361,110 @@ async def admin_text(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text(f"❌ Error: {e}")
     context.user_data["mode"] = None
 
+# ════════════════════════════════════════════════════════
+#             PROFILING (শুধু অ্যাডমিন)
+# ════════════════════════════════════════════════════════
+# /profile [সেকেন্ড] [cpu]  — sampling (ডিফল্ট) বা cProfile সেশন, শেষে রিপোর্ট document হিসেবে আসে
+# /profile stop             — আগেই থামাও
+# /memsnap                  — tracemalloc snapshot; আগেরটার সাথে diff পাঠায়
+# /memsnap stop             — tracemalloc বন্ধ
+PROFILER = Profiler(config.PROFILE_INTERVAL)
+
+async def _send_report(bot, chat_id, filename, text):
+    await bot.send_document(chat_id, document=text.encode(), filename=filename)
+
+@metrics.handler("profile")
+async def cmd_profile(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    if not update.effective_user or not update.message:
+        return
+    if update.effective_user.id not in ADMINS:
+        return
+    args = [a.lower() for a in context.args or []]
+    if args[:1] == ["stop"]:
+        if PROFILER.running:
+            PROFILER.stop()
+            await update.message.reply_text("⏹ Profiling থামানো হচ্ছে, রিপোর্ট আসছে...")
+        else:
+            await update.message.reply_text("ℹ️ কোনো profiling চলছে না।")
+        return
+    if PROFILER.running:
+        await update.message.reply_text(f"⏳ একটা *{PROFILER.kind}* সেশন চলছে — `/profile stop`", parse_mode="Markdown")
+        return
+    seconds = int(args[0]) if args and args[0].isdigit() else 30
+    kind    = "cpu" if "cpu" in args else "sample"
+    chat_id, bot = update.effective_chat.id, context.bot
+    seconds = PROFILER.start(seconds, kind, lambda name, text: _send_report(bot, chat_id, name, text))
+    await update.message.reply_text(f"🔬 *{kind}* profiling চালু — {seconds}s পর রিপোর্ট আসবে।", parse_mode="Markdown")
+
+@metrics.handler("memsnap")
+async def cmd_memsnap(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    if not update.effective_user or not update.message:
+        return
+    if update.effective_user.id not in ADMINS:
+        return
+    if [a.lower() for a in context.args or []][:1] == ["stop"]:
+        stopped = PROFILER.mem_stop()
+        await update.message.reply_text("⏹ tracemalloc বন্ধ।" if stopped else "ℹ️ tracemalloc চালু ছিল না।")
+        return
+    # snapshot নেওয়া/তুলনা ভারী — আলাদা thread এ, লুপ চলতে থাকে
+    name, text = await asyncio.to_thread(PROFILER.mem_snapshot)
+    if name is None:
+        await update.message.reply_text(f"🧠 {text}")
+    else:
+        await _send_report(context.bot, update.effective_chat.id, name, text)
+
 # ════════════════════════════════════════════════════════
 #                     MAIN
 # ════════════════════════════════════════════════════════
+METRICS_SERVER = metrics.serve(config.METRICS_LISTEN, config.METRICS_PORT) if config.METRICS_PORT else None
+
+async def post_init(app):
+    STORE.start()
+    OUTBOX.start(app.bot)
+    BROADCAST.resume(app.bot)
+    load_rest()
+    if METRICS_SERVER and metrics.ENABLED:
+        await METRICS_SERVER.start()
+        print(f"[METRICS] 📈 {METRICS_SERVER.url}/metrics")
+
+async def post_shutdown(app):
+    await PROFILER.close()
+    if METRICS_SERVER:
+        await METRICS_SERVER.stop()
+    await BROADCAST.stop()
+    await OUTBOX.stop()
+    await asyncio.gather(*(t for t in (_LAZY_TASK, _WARM_TASK) if t is not None), return_exceptions=True)
+    await STORE.stop()
+    if DB:
+        # aggregates শুধু এখানে (আর save_data তে) লেখা হয় — প্রতি flush এ নয়
+        await asyncio.to_thread(DB.save_setting, "AGGREGATES", json.dumps(AGG.dump(), ensure_ascii=False))
+    else:
+        # পুরো state এর snapshot — পরের startup এ replay লাগে না (এখন আর কোনো update চলছে না)
+        await asyncio.to_thread(JOURNAL.close, _state() if _state_complete() else None)
+
 def main():
     print(">>> Bot starting...")
-    load_data()
-    app = ApplicationBuilder().token(config.BOT_TOKEN).build()
+    t0 = time.perf_counter()
+    load_data(lazy=True)
+    print(f"[LOAD] ⚡ startup state {(time.perf_counter() - t0) * 1000:.0f} ms ({len(USERS)} users)")
+    builder = (
+        ApplicationBuilder()
+        .token(config.BOT_TOKEN)
+        .post_init(post_init)
+        .post_shutdown(post_shutdown)
+        .concurrent_updates(OrderedUpdateProcessor(config.UPDATE_CONCURRENCY, config.OTP_GROUP_ID, config.OTP_LANES))
+    )
+    if config.BOT_API_URL:
+        builder = builder.base_url(config.BOT_API_URL)
+    if config.BOT_FILE_URL:
+        builder = builder.base_file_url(config.BOT_FILE_URL)
+    app = builder.build()
 
+    app.add_handler(TypeHandler(Update, flood_guard), group=-1)
     app.add_handler(CommandHandler("start", cmd_start))
     app.add_handler(CommandHandler("admin", cmd_admin))
+    app.add_handler(CommandHandler("profile", cmd_profile))
+    app.add_handler(CommandHandler("memsnap", cmd_memsnap))
 
     app.add_handler(MessageHandler(filters.Regex("^📱 Get Number$"),  menu_handler))
     app.add_handler(MessageHandler(filters.Regex("^📦 Services$"),    menu_handler))
@@ -813,14 +1477,24 @@ def main():
     app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, admin_text))
     app.add_handler(CallbackQueryHandler(callback_handler))
 
+    app.job_queue.run_repeating(expire_seen_job, interval=config.SEEN_EXPIRY_INTERVAL, first=config.SEEN_EXPIRY_INTERVAL)
+
     print("=" * 40)
     print(f"✅ Bot LIVE!")
     print(f"📲 Number Limit: {NUMBER_LIMIT}")
     print(f"📡 OTP Group: {config.OTP_GROUP_ID}")
+    print(f"🔌 Mode: {'webhook → ' + config.WEBHOOK_URL if config.WEBHOOK_URL else 'polling'}")
     print(f"📦 Services: {', '.join(SERVICES)}")
     print("=" * 40)
 
-    app.run_polling(allowed_updates=["message", "callback_query", "channel_post"])
+    allowed = ["message", "callback_query", "channel_post"]
+    if config.WEBHOOK_URL:
+        asyncio.run(webhook.run(
+            app, config.WEBHOOK_URL, config.WEBHOOK_PATH, config.WEBHOOK_SECRET,
+            config.WEBHOOK_LISTEN, config.WEBHOOK_PORT, allowed_updates=allowed,
+        ))
+    else:
+        app.run_polling(allowed_updates=allowed)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,150 @@
+import asyncio, json, os, time
+from telegram.error import BadRequest, Forbidden
+
+from delivery import PRIO_BULK
+from persist import atomic_write
+
+# ════════════════════════════════════════════════════════
+#          BACKGROUND BROADCAST (resumable)
+# ════════════════════════════════════════════════════════
+class Broadcaster:
+    """
+    Admin broadcast কে background job হিসেবে চালায়। পাঠানো হয় Delivery queue দিয়ে
+    (PRIO_BULK, তাই OTP আগে যায়), `window` টা করে; প্রতি window শেষে checkpoint লেখে,
+    তাই রিস্টার্টের পর যেখানে থেমেছিল সেখান থেকে আবার শুরু হয়।
+    """
+
+    def __init__(self, outbox, state_file, window=50, progress_every=5.0, on_blocked=None):
+        self.outbox         = outbox
+        self.state_file     = state_file
+        self.window         = window
+        self.progress_every = progress_every
+        self.on_blocked     = on_blocked
+        self.job            = None
+        self._task          = None
+        self._starting      = False
+
+    @property
+    def running(self):
+        return self._starting or (self._task is not None and not self._task.done())
+
+    @property
+    def _progress_file(self):
+        return self.state_file + ".progress"
+
+    # ── checkpoint ──────────────────────────
+    def _save_job(self):
+        meta = {k: self.job[k] for k in ("admin_id", "message_id", "text", "targets", "started")}
+        atomic_write(self.state_file, json.dumps(meta, ensure_ascii=False))
+        self._save_progress()
+
+    def _save_progress(self):
+        prog = {k: self.job[k] for k in ("cursor", "sent", "failed", "blocked")}
+        atomic_write(self._progress_file, json.dumps(prog))
+
+    def _load_job(self):
+        if not os.path.exists(self.state_file):
+            return None
+        with open(self.state_file) as f:
+            job = json.load(f)
+        job.update(cursor=0, sent=0, failed=0, blocked=0)
+        if os.path.exists(self._progress_file):
+            with open(self._progress_file) as f:
+                job.update(json.load(f))
+        return job
+
+    def _clear(self):
+        for p in (self.state_file, self._progress_file):
+            try:
+                os.remove(p)
+            except OSError:
+                pass
+
+    # ── lifecycle ───────────────────────────
+    async def start(self, bot, admin_id, text, targets):
+        # update গুলো concurrent চলে, তাই প্রথম await এর আগেই running দেখাতে হবে
+        self._starting = True
+        try:
+            msg = await bot.send_message(admin_id, f"📢 Broadcast শুরু হচ্ছে… (0/{len(targets)})")
+            self.job = {
+                "admin_id": admin_id, "message_id": msg.message_id, "text": text,
+                "targets": list(targets), "started": time.time(),
+                "cursor": 0, "sent": 0, "failed": 0, "blocked": 0,
+            }
+            self._save_job()
+            self._task = asyncio.get_running_loop().create_task(self._run(bot))
+        finally:
+            self._starting = False
+
+    def resume(self, bot):
+        job = self._load_job()
+        if job is None:
+            return False
+        self.job   = job
+        self._task = asyncio.get_running_loop().create_task(self._run(bot))
+        print(f"[BROADCAST] ↻ resuming at {job['cursor']}/{len(job['targets'])}")
+        return True
+
+    async def stop(self):
+        """checkpoint থেকে যায়, পরের স্টার্টে resume হবে"""
+        if self.running:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    # ── worker ──────────────────────────────
+    def _progress_text(self, done=False):
+        j       = self.job
+        total   = len(j["targets"])
+        elapsed = max(time.time() - j["started"], 1e-6)
+        rate    = (j["sent"] + j["failed"] + j["blocked"]) / elapsed
+        head    = "✅ *Broadcast সম্পন্ন!*" if done else "📢 *Broadcast চলছে…*"
+        return (
+            f"{head}\n\n"
+            f"📤 {j['cursor']}/{total}\n"
+            f"✅ পাঠানো: *{j['sent']}*  |  ❌ ব্যর্থ: *{j['failed']}*  |  🚫 blocked: *{j['blocked']}*\n"
+            f"⚡ {rate:.1f} msg/s"
+        )
+
+    async def _edit_progress(self, bot, done=False):
+        try:
+            await bot.edit_message_text(
+                self._progress_text(done), chat_id=self.job["admin_id"],
+                message_id=self.job["message_id"], parse_mode="Markdown",
+            )
+        except BadRequest:
+            pass   # "message is not modified" ইত্যাদি
+        except Exception as e:
+            print(f"[BROADCAST] progress ❌ {e}")
+
+    async def _run(self, bot):
+        j       = self.job
+        text    = f"📢 *বট নোটিশ*\n\n{j['text']}"
+        targets = j["targets"]
+        last_edit = 0.0
+        while j["cursor"] < len(targets):
+            batch = targets[j["cursor"]:j["cursor"] + self.window]
+            futs  = [
+                self.outbox.submit(u, text, priority=PRIO_BULK, deadline=3600, parse_mode="Markdown")
+                for u in batch
+            ]
+            for u, r in zip(batch, await asyncio.gather(*futs, return_exceptions=True)):
+                if not isinstance(r, BaseException):
+                    j["sent"] += 1
+                elif isinstance(r, Forbidden):
+                    j["blocked"] += 1
+                    if self.on_blocked:
+                        self.on_blocked(u)
+                else:
+                    j["failed"] += 1
+            j["cursor"] += len(batch)
+            await asyncio.to_thread(self._save_progress)
+            if time.monotonic() - last_edit >= self.progress_every:
+                last_edit = time.monotonic()
+                await self._edit_progress(bot)
+        await self._edit_progress(bot, done=True)
+        print(f"[BROADCAST] ✅ sent={j['sent']} failed={j['failed']} blocked={j['blocked']}")
+        self._clear()
@@ -5,6 +5,20 @@ import os
 # 🤖 Bot Token
 BOT_TOKEN = os.environ.get("BOT_TOKEN", "8201237698:AAG1Ve1zTGbLcYvDCEr5URpHR1n1-4h_SH0")
 
+# 🌐 Bot API সার্ভার — লোকাল Bot API বা টেস্টের fake সার্ভারের জন্য (ফাঁকা = api.telegram.org)
+# যেমন BOT_API_URL="http://127.0.0.1:8081/bot", BOT_FILE_URL="http://127.0.0.1:8081/file/bot"
+BOT_API_URL  = os.environ.get("BOT_API_URL", "")
+BOT_FILE_URL = os.environ.get("BOT_FILE_URL", "")
+
+# 🪝 Webhook — WEBHOOK_URL দিলে polling এর বদলে webhook মোডে চলে (যেমন "https://mybot.up.railway.app")
+# Telegram কে পাঠানো secret token ফাঁকা থাকলে প্রতিবার চালুর সময় নতুন একটা বানানো হয়
+WEBHOOK_URL    = os.environ.get("WEBHOOK_URL", "")
+WEBHOOK_PATH   = os.environ.get("WEBHOOK_PATH", "/telegram")
+WEBHOOK_SECRET = os.environ.get("WEBHOOK_SECRET", "")
+# Railway/Heroku তে বাইরে থেকে আসতে 0.0.0.0 লাগে; reverse proxy এর পেছনে হলে WEBHOOK_LISTEN=127.0.0.1
+WEBHOOK_LISTEN = os.environ.get("WEBHOOK_LISTEN", "0.0.0.0")
+WEBHOOK_PORT   = int(os.environ.get("WEBHOOK_PORT") or os.environ.get("PORT") or "8443")
+
 # 🔐 Admin Telegram IDs (numeric)
 ADMIN_IDS = [6593090863]
 
@@ -23,3 +37,58 @@ SEEN_DIR = "seen"
 
 # 🧹 কতদিন পর seen নম্বর রিসেট হবে
 CLEANUP_DAYS = 7
+
+# ♻️ seen expiry job কত সেকেন্ড পরপর চলবে
+SEEN_EXPIRY_INTERVAL = 60
+
+# 💾 ডাটা সেভ — প্রথম অসংরক্ষিত পরিবর্তনের কত সেকেন্ড পর, বা কতগুলো পরিবর্তন জমলে ডিস্কে লিখবে
+SAVE_INTERVAL = float(os.environ.get("SAVE_INTERVAL", "2"))
+SAVE_BATCH    = int(os.environ.get("SAVE_BATCH", "500"))
+
+# 📒 JSON ব্যাকএন্ডে journal এর এক segment এ এতগুলো রেকর্ড জমলে background এ snapshot বানায়
+JOURNAL_COMPACT_EVERY = int(os.environ.get("JOURNAL_COMPACT_EVERY", "50000"))
+
+# 🕘 প্রতি ইউজারের History তে কতগুলো নম্বর, আর OTP log এ শেষ কতগুলো OTP থাকবে
+HISTORY_SIZE = int(os.environ.get("HISTORY_SIZE", "50"))
+OTP_LOG_SIZE = int(os.environ.get("OTP_LOG_SIZE", "5000"))
+
+# 🚦 প্রতি ইউজার/অ্যাকশন flood control — action: (প্রতি সেকেন্ডে কতবার, একটানা সর্বোচ্চ)।
+# admin দের ক্ষেত্রে প্রযোজ্য নয়। FLOOD_CONTROL=0 দিলে বন্ধ।
+FLOOD_CONTROL = os.environ.get("FLOOD_CONTROL", "1") != "0"
+FLOOD_LIMITS  = {
+    "number":  (0.5, 4),   # দেশ বাছাই / 🔄 নতুন নম্বর — ডিস্ক থেকে নম্বর বরাদ্দ
+    "stock":   (0.2, 2),   # 📊 Live Stock
+    "history": (0.5, 3),   # 🕘 My History
+    "browse":  (2.0, 8),   # সার্ভিস/দেশ তালিকা, পেজ বদল
+    "default": (1.0, 5),
+}
+
+# 🗄 স্টোরেজ ব্যাকএন্ড — "json" (user_data.json + txt ফোল্ডার) অথবা "sqlite"
+# sqlite এ যেতে আগে একবার চালাও: python storage_sqlite.py migrate
+STORAGE_BACKEND = os.environ.get("STORAGE_BACKEND", "json")
+SQLITE_PATH     = os.environ.get("SQLITE_PATH", "bot.db")
+
+# 🔀 একসাথে কতগুলো update প্রসেস হবে (একই ইউজারেরগুলো তবুও ক্রমানুসারে), আর OTP গ্রুপের আলাদা lane
+UPDATE_CONCURRENCY = int(os.environ.get("UPDATE_CONCURRENCY", "16"))
+OTP_LANES          = int(os.environ.get("OTP_LANES", "4"))
+
+# 📈 Prometheus metrics — http://METRICS_LISTEN:METRICS_PORT/metrics (PORT 0 = বন্ধ, METRICS=0 = instrumentation বন্ধ)
+METRICS_LISTEN = os.environ.get("METRICS_LISTEN", "127.0.0.1")
+METRICS_PORT   = int(os.environ.get("METRICS_PORT", "9108"))
+
+# 📄 দেশের তালিকা / Bulk Remove এর প্রতি পেজে কতটি বোতাম
+PAGE_SIZE = int(os.environ.get("PAGE_SIZE", "20"))
+
+# 🔬 /profile এর sampling interval (সেকেন্ড) — ছোট = বেশি নির্ভুল, বেশি overhead
+PROFILE_INTERVAL = float(os.environ.get("PROFILE_INTERVAL", "0.01"))
+
+# 📤 মেসেজ পাঠানো — একসাথে কতগুলো, আর Telegram এর limit (মেসেজ/সেকেন্ড)
+SEND_CONCURRENCY = int(os.environ.get("SEND_CONCURRENCY", "8"))
+SEND_GLOBAL_RATE = float(os.environ.get("SEND_GLOBAL_RATE", "28"))
+SEND_CHAT_RATE   = float(os.environ.get("SEND_CHAT_RATE", "1"))
+
+# ⏱ এর বেশি দেরি হলে OTP আর পাঠানো হবে না (সেকেন্ড)
+OTP_DEADLINE = float(os.environ.get("OTP_DEADLINE", "60"))
+
+# 📢 চলমান broadcast এর checkpoint — রিস্টার্টের পর এখান থেকে resume হবে
+BROADCAST_FILE = "broadcast.json"
@@ -0,0 +1,201 @@
+import asyncio, heapq, itertools, random, time
+from collections import deque
+from telegram.error import BadRequest, Forbidden, NetworkError, RetryAfter
+
+from metrics import Counter
+from ratelimit import TokenBucket
+
+# ════════════════════════════════════════════════════════
+#          OUTBOUND DELIVERY QUEUE (rate-limit aware)
+# ════════════════════════════════════════════════════════
+PRIO_OTP     = 0    # আগে যাবে
+PRIO_DEFAULT = 10
+PRIO_BULK    = 20   # broadcast ইত্যাদি
+
+
+SEND_FAILURES = Counter("bot_send_failures_total", "Messages that could not be delivered", ("error",))
+SEND_RETRIES  = Counter("bot_send_retries_total", "Send retries", ("error",))
+
+
+class DeliveryFailed(Exception):
+    pass
+
+
+class _Job:
+    __slots__ = ("chat_id", "text", "kwargs", "priority", "received", "deadline", "attempt", "future")
+
+    def __init__(self, chat_id, text, kwargs, priority, received, deadline, future):
+        self.chat_id  = chat_id
+        self.text     = text
+        self.kwargs   = kwargs
+        self.priority = priority
+        self.received = received
+        self.deadline = deadline
+        self.attempt  = 0
+        self.future   = future
+
+
+class Delivery:
+    """
+    সব outbound send_message এখান দিয়ে যায়: priority queue + bounded worker,
+    global ও per-chat token bucket, RetryAfter/নেটওয়ার্ক error এ backoff সহ retry।
+    submit() একটি Future দেয় — সফল হলে latency (সেকেন্ড), ব্যর্থ হলে exception।
+    """
+
+    def __init__(self, workers=8, global_rate=28, chat_rate=1.0, chat_burst=3, deadline=60.0, max_chats=50_000):
+        self.workers     = workers
+        self.global_rate = global_rate
+        self.chat_rate   = chat_rate
+        self.chat_burst  = chat_burst
+        self.deadline    = deadline
+        self.max_chats   = max_chats
+        self.sent        = 0
+        self.failed      = 0
+        self.retried     = 0
+        self.latencies   = deque(maxlen=2000)
+        self._heap       = []
+        self._later      = {}   # job → TimerHandle: backoff/কোটার অপেক্ষায়, এখনো heap এ নেই
+        self._seq        = itertools.count()
+        self._chats      = {}
+        self._global     = TokenBucket(global_rate)
+        self._paused     = 0.0
+        self._ready      = None
+        self._tasks      = []
+        self._inflight   = 0
+        self.bot         = None
+
+    @property
+    def pending(self):
+        return len(self._heap) + len(self._later) + self._inflight
+
+    # ── public ──────────────────────────────
+    def submit(self, chat_id, text, priority=PRIO_DEFAULT, received=None, deadline=None, **kwargs):
+        loop = asyncio.get_running_loop()
+        now  = time.monotonic()
+        job  = _Job(
+            chat_id, text, kwargs, priority,
+            received if received is not None else now,
+            now + (deadline if deadline is not None else self.deadline),
+            loop.create_future(),
+        )
+        self._push(job)
+        return job.future
+
+    def start(self, bot):
+        self.bot    = bot
+        self._ready = asyncio.Event()
+        if self._heap:
+            self._ready.set()
+        self._tasks = [asyncio.get_running_loop().create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for t in self._tasks:
+            t.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        later, self._later = self._later, {}
+        for h in later.values():
+            h.cancel()
+        jobs = [e[2] for e in self._heap] + list(later)
+        self._heap = []
+        for job in jobs:
+            if not job.future.done():
+                job.future.set_exception(DeliveryFailed("shutdown"))
+
+    def stats(self):
+        lat = sorted(self.latencies)
+        pct = lambda p: lat[min(len(lat) - 1, int(p * len(lat)))] if lat else 0.0
+        return {
+            "sent": self.sent, "failed": self.failed, "retried": self.retried, "pending": self.pending,
+            "p50": pct(0.50), "p95": pct(0.95), "max": lat[-1] if lat else 0.0,
+        }
+
+    # ── internals ───────────────────────────
+    def _push(self, job, delay=0.0):
+        if delay > 0:
+            self._later[job] = asyncio.get_running_loop().call_later(delay, self._due, job)
+            return
+        heapq.heappush(self._heap, (job.priority, next(self._seq), job))
+        if self._ready is not None:
+            self._ready.set()
+
+    def _due(self, job):
+        del self._later[job]
+        self._push(job)
+
+    def _chat_bucket(self, chat_id):
+        b = self._chats.get(chat_id)
+        if b is None:
+            if len(self._chats) >= self.max_chats:
+                # অলস bucket গুলো ফেলে দাও
+                now = time.monotonic()
+                for k in [k for k, v in self._chats.items() if v.idle(now)]:
+                    del self._chats[k]
+                # broadcast চলাকালে কেউই অলস নয় — KeyedLimiter এর মতো সবচেয়ে পুরনোগুলো বাদ দিয়ে
+                # ৯০% এ নামাই, নাহলে cap ছাড়িয়ে যেত আর প্রতিটি নতুন chat এ আবার পুরো scan হতো
+                extra = len(self._chats) - self.max_chats * 9 // 10
+                if extra > 0:
+                    for k in list(itertools.islice(self._chats, extra)):
+                        del self._chats[k]
+            b = self._chats[chat_id] = TokenBucket(self.chat_rate, self.chat_burst)
+        return b
+
+    def _fail(self, job, exc):
+        self.failed += 1
+        SEND_FAILURES.inc(type(exc).__name__)
+        if not job.future.done():
+            job.future.set_exception(exc)
+
+    async def _worker(self):
+        while True:
+            if not self._heap:
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+            job = heapq.heappop(self._heap)[2]
+            now = time.monotonic()
+            if job.future.done():
+                continue
+            if now > job.deadline:
+                self._fail(job, DeliveryFailed("deadline exceeded"))
+                continue
+            wait = self._chat_bucket(job.chat_id).delay(now=now)
+            if wait > 0:
+                # এই চ্যাটের কোটা শেষ — worker আটকে না রেখে পরে আবার queue তে
+                self._push(job, wait)
+                continue
+            self._chat_bucket(job.chat_id).try_take(now=now)
+            self._inflight += 1
+            try:
+                if self._paused > now:
+                    await asyncio.sleep(self._paused - now)
+                await self._global.acquire()
+                await self.bot.send_message(chat_id=job.chat_id, text=job.text, **job.kwargs)
+            except RetryAfter as e:
+                retry = e.retry_after.total_seconds() if hasattr(e.retry_after, "total_seconds") else float(e.retry_after)
+                # 429 মানে পুরো বট flood এ — সবাই একটু থামো
+                self._paused = max(self._paused, time.monotonic() + retry)
+                self._retry(job, retry, e)
+            except (Forbidden, BadRequest) as e:
+                self._fail(job, e)
+            except (NetworkError, asyncio.TimeoutError, OSError) as e:
+                self._retry(job, min(30.0, 0.5 * 2 ** job.attempt) * (1 + random.random() / 2), e)
+            except Exception as e:
+                self._fail(job, e)
+            else:
+                latency = time.monotonic() - job.received
+                self.sent += 1
+                self.latencies.append(latency)
+                if not job.future.done():
+                    job.future.set_result(latency)
+            finally:
+                self._inflight -= 1
+
+    def _retry(self, job, delay, exc):
+        job.attempt += 1
+        if time.monotonic() + delay > job.deadline:
+            self._fail(job, exc)
+            return
+        self.retried += 1
+        SEND_RETRIES.inc(type(exc).__name__)
+        self._push(job, delay)
@@ -0,0 +1,143 @@
+import sys, time
+from bisect import bisect_left
+from collections import Counter, namedtuple
+from datetime import datetime
+from functools import lru_cache
+
+# ════════════════════════════════════════════════════════
+#        HISTORY / OTP LOG (tuple রেকর্ড + ring buffer)
+# ════════════════════════════════════════════════════════
+# প্রতিটি এন্ট্রি একটা tuple (dict নয়) — সময় epoch সেকেন্ডে, service/country interned string
+# (সব এন্ট্রি একই অবজেক্ট শেয়ার করে)। সময় লেখায় রূপান্তর শুধু স্ক্রিনে দেখানোর সময়।
+HistoryEntry = namedtuple("HistoryEntry", "ts service country number")
+OtpEntry     = namedtuple("OtpEntry", "ts service number otp uid")
+
+intern = sys.intern
+
+
+class Ring:
+    """
+    নির্দিষ্ট আকারের ring buffer — পূর্ণ হলে সবচেয়ে পুরনোটার জায়গায় লেখে, কোনো কপি নেই।
+    total = এ পর্যন্ত মোট কতগুলো append হয়েছে (মুছে যাওয়াগুলো সহ)।
+    """
+    __slots__ = ("cap", "buf", "pos", "total")
+
+    def __init__(self, cap, items=()):
+        self.cap, self.buf, self.pos, self.total = cap, [], 0, 0
+        self.extend(items)
+
+    def append(self, item):
+        if len(self.buf) < self.cap:
+            self.buf.append(item)
+        else:
+            self.buf[self.pos] = item
+            self.pos = (self.pos + 1) % self.cap
+        self.total += 1
+
+    def extend(self, items):
+        for item in items:
+            self.append(item)
+
+    def __len__(self):
+        return len(self.buf)
+
+    def __bool__(self):
+        return bool(self.buf)
+
+    def __getitem__(self, i):
+        """0 = সবচেয়ে পুরনো"""
+        return self.buf[(self.pos + i) % len(self.buf)]
+
+    def __iter__(self):
+        buf, pos = self.buf, self.pos
+        yield from buf[pos:]
+        yield from buf[:pos]
+
+    def newest(self, n):
+        """শেষ n টা, নতুন থেকে পুরনো"""
+        k = len(self.buf)
+        return [self[i] for i in range(k - 1, max(k - n, 0) - 1, -1)]
+
+    def after(self, total):
+        """total নম্বর append এর পরে যেগুলো এসেছে (যেগুলো এখনো আছে)"""
+        k = len(self.buf)
+        return [self[i] for i in range(max(k - (self.total - total), 0), k)]
+
+    def since(self, ts):
+        """ts বা তার পরের এন্ট্রি — এন্ট্রিগুলো সময়ের ক্রমে, তাই binary search"""
+        k  = len(self.buf)
+        lo = bisect_left(range(k), ts, key=lambda i: self[i][0])
+        return [self[i] for i in range(lo, k)]
+
+    def __reduce__(self):
+        return _ring, (self.cap, list(self), self.total)
+
+
+def _ring(cap, items, total):
+    r = Ring(cap, items)
+    r.total = total
+    return r
+
+
+# ── পুরনো ফরম্যাট থেকে ─────────────────────
+_FORMATS = ("%d %b %Y %H:%M", "%d %b %Y  %H:%M", "%d %b %H:%M")
+
+
+@lru_cache(maxsize=4096)
+def _parse(text):
+    for fmt in _FORMATS:
+        try:
+            dt = datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+        if "%Y" not in fmt:
+            dt = dt.replace(year=datetime.now().year)
+        return int(dt.timestamp())
+    return 0
+
+
+def to_ts(v):
+    """epoch (int/float/সংখ্যার string) বা পুরনো "01 Jan 2026 10:00" ধরনের লেখা → epoch"""
+    if isinstance(v, (int, float)):
+        return int(v)
+    if not v:
+        return 0
+    if v.isdigit():
+        return int(v)
+    return _parse(v)
+
+
+def history_ring(items, cap):
+    """list[dict|tuple] বা Ring → HistoryEntry এর Ring"""
+    if isinstance(items, Ring):
+        return items
+    out = Ring(cap)
+    for h in items:
+        if isinstance(h, dict):
+            h = (to_ts(h.get("time")), h.get("service", ""), h.get("country", ""), h.get("number", ""))
+        out.append(HistoryEntry(to_ts(h[0]), intern(h[1]), intern(h[2]), h[3]))
+    return out
+
+
+def otp_ring(items, cap):
+    """list[dict|tuple] বা Ring → OtpEntry এর Ring"""
+    if isinstance(items, Ring):
+        return items
+    out = Ring(cap)
+    for e in items:
+        if isinstance(e, dict):
+            e = (to_ts(e.get("time")), e.get("service", ""), e.get("number", ""), e.get("otp", ""), e.get("uid", 0))
+        out.append(OtpEntry(to_ts(e[0]), intern(e[1] or ""), e[2], e[3], e[4]))
+    return out
+
+
+# ── দেখানো / query ──────────────────────────
+def fmt_time(ts, fmt="%d %b %Y  %H:%M"):
+    if not ts:
+        return "N/A"
+    return datetime.fromtimestamp(ts).strftime(fmt)
+
+
+def count_since(ring, seconds, field="service"):
+    """শেষ `seconds` সেকেন্ডে field অনুযায়ী গণনা, যেমন গত এক ঘণ্টায় সার্ভিস প্রতি OTP"""
+    return Counter(getattr(e, field) for e in ring.since(time.time() - seconds))
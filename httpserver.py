@@ -0,0 +1,150 @@
+import asyncio, json
+from urllib.parse import parse_qsl, urlsplit
+
+# ════════════════════════════════════════════════════════
+#              MINIMAL ASYNC HTTP/1.1 SERVER
+# ════════════════════════════════════════════════════════
+# শুধু asyncio দিয়ে — keep-alive, Content-Length body। বাইরের কোনো dependency নেই।
+MAX_BODY = 50 * 1024 * 1024
+
+REASONS = {200: "OK", 204: "No Content", 400: "Bad Request", 401: "Unauthorized", 403: "Forbidden",
+           404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large",
+           429: "Too Many Requests", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class Request:
+    __slots__ = ("method", "path", "query", "headers", "body")
+
+    def __init__(self, method, target, headers, body):
+        url          = urlsplit(target)
+        self.method  = method
+        self.path    = url.path
+        self.query   = dict(parse_qsl(url.query))
+        self.headers = headers
+        self.body    = body
+
+    def json(self):
+        return json.loads(self.body or b"null")
+
+    def form(self):
+        """JSON বা urlencoded body → dict"""
+        ctype = self.headers.get("content-type", "")
+        if "application/json" in ctype:
+            return self.json() or {}
+        return dict(parse_qsl(self.body.decode("utf-8")))
+
+
+def _encode(payload):
+    if isinstance(payload, (bytes, bytearray)):
+        return bytes(payload), "application/octet-stream"
+    if isinstance(payload, str):
+        return payload.encode(), "text/plain; charset=utf-8"
+    return json.dumps(payload, ensure_ascii=False).encode(), "application/json"
+
+
+class HttpServer:
+    """
+    handler(request) → (status, payload) বা (status, payload, headers)।
+    payload: dict/list → JSON, str → text, bytes → raw। handler sync বা async।
+    precheck(request) — header পড়ার পরে, body পড়ার আগে (request.body তখন None); response
+    রিটার্ন করলে body না পড়েই সেটা পাঠিয়ে কানেকশন বন্ধ, None হলে স্বাভাবিক পথ।
+    """
+
+    def __init__(self, handler, host="127.0.0.1", port=0, max_body=MAX_BODY, precheck=None):
+        self.handler  = handler
+        self.host     = host
+        self.port     = port
+        self.max_body = max_body
+        self.precheck = precheck
+        self.requests = 0
+        self._server  = None
+        self._conns   = set()
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._conn, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            # long-poll এ আটকে থাকা কানেকশনও বন্ধ করি, নাহলে wait_closed শেষ হয় না
+            for t in list(self._conns):
+                t.cancel()
+            await asyncio.gather(*self._conns, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    async def _conn(self, reader, writer):
+        task = asyncio.current_task()
+        self._conns.add(task)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    method, target, _ = line.decode("latin-1").split(" ", 2)
+                except ValueError:
+                    await self._send(writer, 400, "bad request line", {}, False)
+                    break
+                headers = {}
+                while True:
+                    h = await reader.readline()
+                    if h in (b"\r\n", b"\n", b""):
+                        break
+                    k, _, v = h.decode("latin-1").partition(":")
+                    headers[k.strip().lower()] = v.strip()
+                req = Request(method, target, headers, None)
+                if self.precheck is not None:
+                    res = self.precheck(req)
+                    if res is not None:
+                        status, payload, extra = res if len(res) == 3 else (*res, {})
+                        await self._send(writer, status, payload, extra, False)
+                        break
+                # "abc", "-5", "1_000" — int() এ ছেড়ে দিলে হয় exception নয়তো readexactly ভেঙে পড়ে
+                clen = headers.get("content-length") or "0"
+                if not (clen.isascii() and clen.isdigit()):
+                    await self._send(writer, 400, "bad content-length", {}, False)
+                    break
+                size = int(clen)
+                if size > self.max_body:
+                    await self._send(writer, 413, "too large", {}, False)
+                    break
+                req.body = await reader.readexactly(size) if size else b""
+                keep = headers.get("connection", "").lower() != "close"
+
+                self.requests += 1
+                try:
+                    res = self.handler(req)
+                    if asyncio.iscoroutine(res):
+                        res = await res
+                except Exception as e:
+                    # কারণ শুধু লগে — ক্লায়েন্টকে ভেতরের কিছু জানানো হয় না
+                    print(f"[HTTP ❌] {method} {req.path}: {type(e).__name__}: {e}")
+                    res = (500, {"ok": False, "description": REASONS[500]})
+                status, payload, extra = res if len(res) == 3 else (*res, {})
+                await self._send(writer, status, payload, extra, keep)
+                if not keep:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._conns.discard(task)
+            writer.close()
+
+    @staticmethod
+    async def _send(writer, status, payload, extra, keep):
+        body, ctype = _encode(payload)
+        extra = dict(extra)
+        head = [f"HTTP/1.1 {status} {REASONS.get(status, 'Unknown')}",
+                f"Content-Type: {extra.pop('Content-Type', ctype)}",
+                f"Content-Length: {len(body)}",
+                f"Connection: {'keep-alive' if keep else 'close'}"]
+        head += [f"{k}: {v}" for k, v in extra.items()]
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
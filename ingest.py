@@ -0,0 +1,122 @@
+import gzip, io, os, time, zipfile
+
+# ════════════════════════════════════════════════════════
+#           STREAMING BULK INGEST (txt / gz / zip)
+# ════════════════════════════════════════════════════════
+CHUNK      = 50_000
+MIN_DIGITS = 7
+MAX_DIGITS = 15   # E.164
+
+# clean() যা বাদ দেয় (space, -, +, (, )) সেগুলো এক ধাপে মুছে ফেলার টেবিল
+_STRIP = str.maketrans("", "", " \t\r\n\f\v-+()")
+
+
+def normalize(line):
+    """লাইন থেকে শুধু ডিজিটের নম্বর; ভুল ফরম্যাট হলে None"""
+    n = line.translate(_STRIP)
+    if not n.isascii() or not n.isdigit() or not (MIN_DIGITS <= len(n) <= MAX_DIGITS):
+        return None
+    return n
+
+
+def country_name(filename):
+    name = os.path.basename(filename)
+    for ext in (".gz", ".txt"):
+        if name.lower().endswith(ext):
+            name = name[:-len(ext)]
+    return name.strip()
+
+
+def _lines(raw):
+    return io.TextIOWrapper(raw, encoding="utf-8", errors="ignore", newline=None)
+
+
+def iter_sources(path, filename):
+    """
+    (country, line iterator) দেয় — সব stream করে পড়া হয়, পুরো ফাইল মেমোরিতে আসে না।
+    .zip এর ভেতরের প্রতিটি .txt / .txt.gz আলাদা দেশ।
+    """
+    low = filename.lower()
+    if low.endswith(".zip"):
+        with zipfile.ZipFile(path) as z:
+            for info in z.infolist():
+                name = info.filename
+                if info.is_dir() or os.path.basename(name).startswith("."):
+                    continue
+                if not name.lower().endswith((".txt", ".txt.gz")):
+                    continue
+                with z.open(info) as raw:
+                    if name.lower().endswith(".gz"):
+                        raw = gzip.GzipFile(fileobj=raw)
+                    yield country_name(name), _lines(raw)
+    elif low.endswith(".gz"):
+        with gzip.open(path, "rb") as raw:
+            yield country_name(filename), _lines(raw)
+    else:
+        with open(path, "rb") as raw:
+            yield country_name(filename), _lines(raw)
+
+
+class IngestReport:
+    def __init__(self):
+        self.countries = {}   # country → [added, duplicate, invalid]
+        self.seconds   = 0.0
+
+    def _row(self, country):
+        return self.countries.setdefault(country, [0, 0, 0])
+
+    @property
+    def added(self):
+        return sum(r[0] for r in self.countries.values())
+
+    @property
+    def duplicate(self):
+        return sum(r[1] for r in self.countries.values())
+
+    @property
+    def invalid(self):
+        return sum(r[2] for r in self.countries.values())
+
+    @property
+    def lines(self):
+        return self.added + self.duplicate + self.invalid
+
+    @property
+    def rate(self):
+        return self.lines / self.seconds if self.seconds else 0.0
+
+
+def ingest_file(path, filename, known, write, chunk=CHUNK):
+    """
+    path থেকে নম্বর পড়ে normalise করে, আগে থাকা/দেওয়া (known) আর এই আপলোডের
+    ডুপ্লিকেট বাদ দিয়ে chunk করে write(country, numbers) এ পাঠায়।
+    known(country, number) → bool, stock বা seen এ থাকলে True।
+    """
+    report = IngestReport()
+    t0 = time.perf_counter()
+    for country, lines in iter_sources(path, filename):
+        if not country:
+            continue
+        row   = report._row(country)
+        fresh = set()
+        buf   = []
+        for line in lines:
+            if not line.strip():
+                continue
+            n = normalize(line)
+            if n is None:
+                row[2] += 1
+            elif n in fresh or known(country, n):
+                row[1] += 1
+            else:
+                fresh.add(n)
+                buf.append(n)
+                if len(buf) >= chunk:
+                    write(country, buf)
+                    row[0] += len(buf)
+                    buf = []
+        if buf:
+            write(country, buf)
+            row[0] += len(buf)
+    report.seconds = time.perf_counter() - t0
+    return report
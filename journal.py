@@ -0,0 +1,300 @@
+import glob, json, os, pickle, re, struct, threading, time
+
+from persist import atomic_write
+
+# ════════════════════════════════════════════════════════
+#        APPEND-ONLY JOURNAL + SNAPSHOT + COMPACTION
+# ════════════════════════════════════════════════════════
+# প্রতিটি state পরিবর্তন একটা ছোট রেকর্ড (JSON এর একটি লাইন) — WriteBehind এর প্রতি batch এ
+# segment ফাইলে append + fsync। তাই প্রতি ইভেন্টের খরচ O(1), ইউজার যত বেশিই হোক।
+#
+#   user_data.bin           ← snapshot, "JOURNAL_SEQ": N মানে N নম্বর segment থেকে replay
+#   user_data.000N.log      ← segment, একটার পর একটা
+#   user_data.json          ← পুরনো JSON snapshot — .bin না থাকলে এটাই পড়া হয়
+#
+# একটা segment এ `compact_every` রেকর্ড জমলে নতুন segment খোলে, আর background thread
+# আগের snapshot + পুরনো segment গুলো replay করে নতুন snapshot লেখে, তারপর পুরনোগুলো মোছে।
+# যেকোনো ধাপে প্রসেস মরলেও snapshot + বাকি segment থেকে একই state ফেরত আসে;
+# সবচেয়ে বেশি হারায় শেষ batch টা (যেটা তখনো fsync হয়নি)।
+SEQ_KEY = "JOURNAL_SEQ"
+
+# ── binary snapshot ──
+# MAGIC, তারপর [8 byte দৈর্ঘ্য + pickle] এর সারি: প্রথমটা core (lazy_keys ছাড়া সব),
+# বাকিগুলো (key, {…CHUNK টা এন্ট্রি…}) — startup এ শুধু core unpickle হয়, chunk গুলো
+# পরে background thread এ একটা একটা করে (প্রতিটা ছোট, তাই লুপ GIL পায়)।
+MAGIC = b"UDS1"
+CHUNK = 5000
+
+
+def _dumps(obj):
+    # set গুলো list হয়ে যায়
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=list)
+
+
+def write_snapshot(path, state, lazy_keys=()):
+    core  = {k: v for k, v in state.items() if k not in lazy_keys}
+    parts = [pickle.dumps(core, 5)]
+    for k in lazy_keys:
+        items = list(state.get(k, {}).items())
+        for i in range(0, len(items), CHUNK):
+            parts.append(pickle.dumps((k, dict(items[i:i + CHUNK])), 5))
+    atomic_write(path, b"".join([MAGIC] + [struct.pack("<Q", len(p)) + p for p in parts]))
+
+
+def _sections(data):
+    mv, pos = memoryview(data), len(MAGIC)
+    while pos < len(data):
+        n, = struct.unpack_from("<Q", data, pos)
+        pos += 8
+        yield mv[pos:pos + n]
+        pos += n
+
+
+def read_snapshot(path, lazy=False):
+    """
+    .bin বা পুরনো JSON snapshot → (state, lazy অংশের অপঠিত section গুলো)।
+    lazy=False হলে সব মিলিয়ে দেয় আর দ্বিতীয়টা খালি।
+    """
+    if not os.path.exists(path):
+        return {}, []
+    with open(path, "rb") as f:
+        data = f.read()
+    if not data.startswith(MAGIC):
+        return json.loads(data), []
+    sections = _sections(data)
+    state    = pickle.loads(next(sections))
+    rest     = list(sections)
+    if lazy:
+        return state, rest
+    for k, part in map(pickle.loads, rest):
+        state.setdefault(k, {}).update(part)
+    return state, []
+
+
+class Journal:
+    """
+    apply(state, record)  — একটা রেকর্ড state dict এ প্রয়োগ করে (লাইভ আর replay দুটোতেই একই ফাংশন)
+    prepare(dict)         — ডিস্ক থেকে পড়া snapshot কে replay যোগ্য রূপে আনে (list → set, ডিফল্ট)
+    finish(state)         — snapshot লেখার আগে শেষ ছাঁটাই (যেমন OTP_LOG এর শেষ ৫০টা)
+    """
+
+    def __init__(self, snapshot_path, apply, prepare=None, finish=None, compact_every=50_000,
+                 lazy_keys=(), legacy=None):
+        self.path          = snapshot_path
+        self.legacy        = legacy      # পুরনো JSON snapshot (.bin না থাকলে)
+        self.lazy_keys     = tuple(lazy_keys)
+        self.apply         = apply
+        self.prepare       = prepare or (lambda d: d)
+        self.finish        = finish or (lambda d: d)
+        self.compact_every = compact_every
+        self.seq           = 0      # এখন যে segment এ লেখা হচ্ছে
+        self.count         = 0      # এই segment এ কতগুলো রেকর্ড
+        self.replayed      = 0      # শেষ load() এ কতগুলো রেকর্ড replay হলো
+        self.compactions   = 0
+        self._buf          = []
+        self._fh           = None
+        self._lock         = threading.Lock()   # segment লেখা/ঘোরানো
+        self._compactor    = None
+        self._lazy         = []         # startup এ যে section গুলো এখনো unpickle হয়নি
+        base, _ = os.path.splitext(snapshot_path)
+        self._base = base
+
+    # ── ফাইল ─────────────────────────────────
+    def segment_path(self, seq):
+        return f"{self._base}.{seq:06d}.log"
+
+    def segments(self):
+        pat = re.compile(re.escape(os.path.basename(self._base)) + r"\.(\d{6})\.log$")
+        out = []
+        for p in glob.glob(glob.escape(self._base) + ".*.log"):
+            m = pat.match(os.path.basename(p))
+            if m:
+                out.append(int(m.group(1)))
+        return sorted(out)
+
+    def _read_snapshot(self, lazy=False):
+        path = self.path
+        if not os.path.exists(path) and self.legacy and os.path.exists(self.legacy):
+            path = self.legacy
+        return read_snapshot(path, lazy)
+
+    def _replay(self, state, seq):
+        n = 0
+        with open(self.segment_path(seq), encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    # শেষ লাইন অর্ধেক লেখা (crash) — বাকিটা বাদ
+                    print(f"[JOURNAL] ⚠️ segment {seq} এ ভাঙা রেকর্ড, বাদ দেওয়া হলো")
+                    continue
+                self.apply(state, rec)
+                n += 1
+        return n
+
+    # ── startup ──────────────────────────────
+    def load(self, lazy=False):
+        """
+        snapshot + তার পরের segment গুলো replay করা state; নতুন লেখা নতুন segment এ যায়।
+        lazy=True হলে lazy_keys গুলো (prepare এর বানানো) খালি dict এ শুরু হয় আর replay
+        সেখানেই জমে — snapshot এর অংশ পরে load_lazy() দিয়ে এনে মেলাতে হয়।
+        """
+        state, self._lazy = self._read_snapshot(lazy)
+        start = state.pop(SEQ_KEY, 0)
+        state = self.prepare(state)
+        self.replayed = 0
+        last = start
+        for seq in self.segments():
+            if seq < start:
+                # snapshot লেখার পর মোছার আগেই প্রসেস থেমেছিল
+                os.remove(self.segment_path(seq))
+                continue
+            self.replayed += self._replay(state, seq)
+            last = seq + 1
+        self._close_segment()
+        self.seq, self.count = last, 0
+        return state
+
+    @property
+    def lazy_pending(self):
+        return bool(self._lazy)
+
+    def load_lazy(self):
+        """startup এ রেখে দেওয়া section গুলো → {key: dict} (thread এ চালাও)"""
+        parts, self._lazy = self._lazy, []
+        out = {k: {} for k in self.lazy_keys}
+        for sec in parts:
+            k, part = pickle.loads(sec)
+            out[k].update(part)
+        return out
+
+    # ── লেখা ─────────────────────────────────
+    def append(self, record):
+        self._buf.append(_dumps(record))
+
+    @property
+    def pending(self):
+        return len(self._buf)
+
+    def take(self):
+        """জমা রেকর্ডগুলো নিয়ে একটা writer রিটার্ন করে (thread এ চালানোর জন্য)"""
+        lines, self._buf, seq = self._buf, [], self.seq
+
+        def writer():
+            try:
+                self.write(lines, seq)
+            except Exception:
+                self._requeue(lines, seq)
+                raise
+        return writer
+
+    def _requeue(self, lines, seq):
+        """লেখা ব্যর্থ (ENOSPC, EIO…) — রেকর্ডগুলো আবার সামনে, পরের flush এ যাবে"""
+        with self._lock:
+            # এর মধ্যে checkpoint হলে এগুলো snapshot এই আছে, ফেরত আনলে দুবার প্রয়োগ হতো
+            if seq == self.seq:
+                self._buf[:0] = lines
+
+    def write(self, lines, seq=None):
+        if not lines:
+            return
+        with self._lock:
+            if seq is not None and seq != self.seq:
+                # নেওয়ার পরে checkpoint হয়ে গেছে — রেকর্ডগুলো snapshot এই আছে, পুরনো segment এ যাক
+                with open(self.segment_path(seq), "a", encoding="utf-8") as f:
+                    f.write("\n".join(lines) + "\n")
+                return
+            if self._fh is None:
+                self._fh = open(self.segment_path(self.seq), "a", encoding="utf-8")
+            fh  = self._fh
+            end = fh.tell()
+            try:
+                fh.write("\n".join(lines) + "\n")
+                fh.flush()
+                os.fsync(fh.fileno())
+            except OSError:
+                # অর্ধেক লেখা লাইন থেকে গেলে retry এর প্রথম রেকর্ড তার সাথে জুড়ে replay এ বাদ যেত
+                self._fh = None
+                for undo in (fh.close, lambda: os.truncate(self.segment_path(self.seq), end)):
+                    try:
+                        undo()
+                    except OSError:
+                        pass
+                raise
+            self.count += len(lines)
+            if self.count >= self.compact_every and not self.compacting:
+                upto = self._rotate()
+                self._compactor = threading.Thread(target=self._compact, args=(upto,), name="journal-compact", daemon=True)
+                self._compactor.start()
+
+    def _close_segment(self):
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    def _rotate(self):
+        """নতুন segment খোলে; আগের সব segment এখন compaction এর জন্য তৈরি"""
+        self._close_segment()
+        self.seq  += 1
+        self.count = 0
+        return self.seq
+
+    # ── compaction ───────────────────────────
+    @property
+    def compacting(self):
+        return self._compactor is not None and self._compactor.is_alive()
+
+    def _compact(self, upto):
+        t0       = time.perf_counter()
+        state, _ = self._read_snapshot()
+        start = state.pop(SEQ_KEY, 0)
+        state = self.prepare(state)
+        done  = [s for s in self.segments() if start <= s < upto]
+        for seq in done:
+            self._replay(state, seq)
+        self._write_snapshot(state, upto)
+        self.compactions += 1
+        print(f"[JOURNAL] 🗜 {len(done)}টি segment → snapshot ({(time.perf_counter() - t0) * 1000:.0f} ms)")
+
+    def _write_snapshot(self, state, upto):
+        state = self.finish(dict(state))
+        state[SEQ_KEY] = upto
+        write_snapshot(self.path, state, self.lazy_keys)
+        for seq in self.segments():
+            if seq < upto:
+                os.remove(self.segment_path(seq))
+
+    def compact(self):
+        """এখনই সব segment snapshot এ গুটিয়ে ফেলে (সিনক্রোনাস)"""
+        if self._compactor is not None:
+            self._compactor.join()
+        with self._lock:
+            upto = self._rotate()
+        self._compact(upto)
+
+    def checkpoint(self, state):
+        """
+        লাইভ state থেকেই সরাসরি snapshot — replay লাগে না। state এর মধ্যে সব রেকর্ড প্রয়োগ
+        হয়ে আছে, তাই জমে থাকা (এখনো না লেখা) রেকর্ডগুলো ফেলে দেওয়া হয়।
+        লেখার সময় state বদলানো চলবে না (লুপে, বা shutdown এ)।
+        """
+        if self._compactor is not None:
+            self._compactor.join()
+        with self._lock:
+            self._buf = []
+            upto = self._rotate()
+        self._write_snapshot(state, upto)
+
+    def close(self, state=None):
+        """shutdown — চলমান compaction শেষ হতে দেয়, তারপর state দিলে checkpoint, নাহলে compact"""
+        if self._compactor is not None:
+            self._compactor.join()
+            self._compactor = None
+        if state is not None:
+            self.checkpoint(state)
+        elif self.count or self.segments():
+            self.compact()
+        with self._lock:
+            self._close_segment()
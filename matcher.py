@@ -0,0 +1,101 @@
+import re
+
+# ════════════════════════════════════════════════════════
+#           SUFFIX-INDEXED OTP MATCHER
+# ════════════════════════════════════════════════════════
+SUFFIX_KEYS = (2, 3)   # ইনডেক্স কী = নম্বরের শেষ ২ ও ৩ ডিজিট
+
+_CLEAN_RE    = re.compile(r'[\s\-\+\(\)]')
+_CLEAN_TABLE = str.maketrans("", "", " \t\n\r\f\v\x1c\x1d\x1e\x1f\x85-+()")
+
+def clean(n):
+    s = str(n)
+    if s.isdigit():
+        return s
+    s = s.translate(_CLEAN_TABLE)
+    # ASCII এর বাইরের whitespace থাকলে regex ই ভরসা
+    return s if s.isascii() else _CLEAN_RE.sub('', s)
+
+def is_match(prefix, hidden, suffix, real):
+    r = clean(real)
+    for v in ([r, r[1:]] if r.startswith('0') else [r]):
+        if not v.endswith(suffix):
+            continue
+        pos = len(v) - len(suffix) - hidden
+        if pos >= len(prefix) and v[pos - len(prefix):pos] == prefix:
+            return True
+    return False
+
+
+class OtpIndex:
+    """
+    uid → শেষ দেওয়া নম্বর, শেষ ২/৩ ডিজিট দিয়ে ইনডেক্স করা।
+    find() শুধু ওই suffix এর candidate দের is_match দিয়ে যাচাই করে —
+    ফলাফল পুরনো linear scan এর সাথে হুবহু এক (ইউজারের ক্রম সহ)।
+    """
+
+    def __init__(self):
+        self._nums   = {}   # uid_s → [number]
+        self._order  = {}   # uid_s → প্রথম যোগ হওয়ার ক্রম (USER_LAST_NUMBERS এর dict ক্রম)
+        self._bucket = {}   # suffix → {uid_s: None}
+        self._seq    = 0
+
+    def __len__(self):
+        return len(self._nums)
+
+    @staticmethod
+    def _keys(numbers):
+        # leading-zero variant এর suffix একই, তাই আলাদা কী লাগে না
+        keys = set()
+        for c in map(clean, numbers):
+            for k in SUFFIX_KEYS:
+                if len(c) >= k:
+                    keys.add(c[-k:])
+        return keys
+
+    def set(self, uid_s, numbers):
+        numbers = list(numbers or [])
+        self.remove(uid_s, keep_order=True)
+        if uid_s not in self._order:
+            self._order[uid_s] = self._seq
+            self._seq += 1
+        self._nums[uid_s] = numbers
+        for k in self._keys(numbers):
+            self._bucket.setdefault(k, {})[uid_s] = None
+
+    def remove(self, uid_s, keep_order=False):
+        old = self._nums.pop(uid_s, None)
+        if old:
+            for k in self._keys(old):
+                b = self._bucket.get(k)
+                if b is not None:
+                    b.pop(uid_s, None)
+                    if not b:
+                        del self._bucket[k]
+        if not keep_order:
+            self._order.pop(uid_s, None)
+
+    def rebuild(self, last_numbers):
+        self._nums.clear()
+        self._order.clear()
+        self._bucket.clear()
+        for uid_s, nums in last_numbers.items():
+            self.set(uid_s, nums)
+
+    def find(self, prefix, hidden, suffix):
+        if len(suffix) >= SUFFIX_KEYS[0]:
+            cands = self._bucket.get(suffix[-SUFFIX_KEYS[-1]:])
+            if not cands:
+                return []
+            if len(cands) > 1:
+                cands = sorted(cands, key=self._order.__getitem__)
+        else:
+            # খুব ছোট suffix — ইনডেক্স কাজে আসে না, সবাইকে দেখতে হবে
+            cands = sorted(self._nums, key=self._order.__getitem__)
+        out = []
+        for uid_s in cands:
+            for n in self._nums[uid_s]:
+                if is_match(prefix, hidden, suffix, clean(n)):
+                    out.append((int(uid_s), n))
+                    break
+        return out
@@ -0,0 +1,193 @@
+import functools, os, time
+from bisect import bisect_left
+
+# ════════════════════════════════════════════════════════
+#           METRICS (Prometheus text format)
+# ════════════════════════════════════════════════════════
+# counter / histogram / gauge — বাইরের লাইব্রেরি ছাড়া। METRICS=0 দিলে decorator গুলো
+# আসল ফাংশনই ফেরত দেয় আর observe/inc কিছুই করে না (overhead মাপার জন্য)।
+ENABLED = os.environ.get("METRICS", "1") != "0"
+
+LATENCY_BUCKETS = (.0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10, 30)
+MAX_SERIES      = 200   # কোনো metric এ এর বেশি label combination হলে বাকিগুলো "other" এ যায়
+
+_REGISTRY = []
+
+
+def _esc(v):
+    return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _fmt_labels(names, values):
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_esc(v)}"' for n, v in zip(names, values)) + "}"
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name, help, labels=()):
+        self.name   = name
+        self.help   = help
+        self.labels = tuple(labels)
+        self.series = {}
+        _REGISTRY.append(self)
+
+    def _overflow(self):
+        return ("other",) * len(self.labels)
+
+    def header(self):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *values, n=1):
+        if ENABLED:
+            s = self.series
+            if values not in s and len(s) >= MAX_SERIES:
+                values = self._overflow()
+            s[values] = s.get(values, 0) + n
+
+    def render(self):
+        return self.header() + [f"{self.name}{_fmt_labels(self.labels, k)} {v}" for k, v in self.series.items()]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, *values):
+        if not ENABLED:
+            return
+        s = self.series.get(values)
+        if s is None:
+            if len(self.series) >= MAX_SERIES:
+                values = self._overflow()
+            # প্রতি bucket এর নিজস্ব গণনা (cumulative নয়) + sum + count
+            s = self.series.get(values) or self.series.setdefault(values, [[0] * (len(self.buckets) + 1), 0.0, 0])
+        s[0][bisect_left(self.buckets, value)] += 1
+        s[1] += value
+        s[2] += 1
+
+    def time(self, *values):
+        return _Timer(self, values)
+
+    def render(self):
+        out = self.header()
+        for k, (counts, total, n) in self.series.items():
+            acc = 0
+            for b, c in zip(self.buckets + ("+Inf",), counts):
+                acc += c
+                out.append(f"{self.name}_bucket{_fmt_labels(self.labels + ('le',), k + (b,))} {acc}")
+            lab = _fmt_labels(self.labels, k)
+            out.append(f"{self.name}_sum{lab} {total:.6f}")
+            out.append(f"{self.name}_count{lab} {n}")
+        return out
+
+
+class _Timer:
+    __slots__ = ("h", "values", "t0")
+
+    def __init__(self, h, values):
+        self.h, self.values = h, values
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.h.observe(time.perf_counter() - self.t0, *self.values)
+        return False
+
+
+class Gauge(_Metric):
+    """মান scrape এর সময় fn() থেকে আসে: সংখ্যা, অথবা {label tuple: সংখ্যা}"""
+    kind = "gauge"
+
+    def __init__(self, name, help, fn, labels=()):
+        super().__init__(name, help, labels)
+        self.fn = fn
+
+    def render(self):
+        v = self.fn()
+        items = v.items() if isinstance(v, dict) else [((), v)]
+        return self.header() + [f"{self.name}{_fmt_labels(self.labels, k)} {x}" for k, x in items]
+
+
+def render():
+    lines = []
+    for m in _REGISTRY:
+        try:
+            lines += m.render()
+        except Exception as e:
+            lines.append(f"# {m.name} render failed: {e}")
+    return "\n".join(lines) + "\n"
+
+
+# ════════════════════════════════════════════════════════
+#                 HANDLER INSTRUMENTATION
+# ════════════════════════════════════════════════════════
+HANDLER_SECONDS = Histogram("bot_handler_seconds", "Handler latency", ("handler", "action"))
+HANDLER_ERRORS  = Counter("bot_handler_errors_total", "Handler exceptions", ("handler", "error"))
+
+ACTIVE_WINDOW = 900   # সেকেন্ড — এর মধ্যে update পাঠানো ইউজার "active"
+
+_last_seen = {}     # uid → monotonic, active user গণনার জন্য
+_prune_at  = 1024   # dict এতটা বড় হলে handler নিজেই পুরনোগুলো মোছে (scrape না হলেও)
+
+
+def handler(name, action=None):
+    """async handler এর latency/error মাপে; action(update) দিলে সেটা দ্বিতীয় label"""
+    def wrap(fn):
+        if not ENABLED:
+            return fn
+
+        @functools.wraps(fn)
+        async def inner(update, context, *a, **kw):
+            user = getattr(update, "effective_user", None)
+            if user is not None:
+                _last_seen[user.id] = time.monotonic()
+                if len(_last_seen) >= _prune_at:
+                    _prune()
+            label = action(update) if action else ""
+            t0 = time.perf_counter()
+            try:
+                return await fn(update, context, *a, **kw)
+            except Exception as e:
+                HANDLER_ERRORS.inc(name, type(e).__name__)
+                raise
+            finally:
+                HANDLER_SECONDS.observe(time.perf_counter() - t0, name, label)
+        return inner
+    return wrap
+
+
+def _prune(window=ACTIVE_WINDOW):
+    global _prune_at
+    cutoff = time.monotonic() - window
+    for uid in [u for u, t in _last_seen.items() if t < cutoff]:
+        del _last_seen[uid]
+    # পরের মোছা আকার দ্বিগুণ হলে — প্রতি update এ গড়ে O(1), আর dict থাকে active ইউজারের ~২x এর মধ্যে
+    _prune_at = max(2 * len(_last_seen), 1024)
+
+
+def active_users(window=ACTIVE_WINDOW):
+    _prune(window)
+    return len(_last_seen)
+
+
+def serve(host="127.0.0.1", port=9108):
+    """/metrics সার্ভ করা HttpServer (start() করতে হবে)"""
+    from httpserver import HttpServer
+
+    def handle(req):
+        if req.path == "/metrics":
+            return 200, render(), {"Content-Type": "text/plain; version=0.0.4; charset=utf-8"}
+        return 404, "not found"
+    return HttpServer(handle, host, port)
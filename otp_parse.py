@@ -0,0 +1,115 @@
+import re
+
+# ════════════════════════════════════════════════════════
+#         OTP POST PARSER (precompiled, multi-format)
+# ════════════════════════════════════════════════════════
+# OTP গ্রুপের পোস্ট থেকে masked নম্বর (prefix, hidden, suffix) আর কোড বের করে। সব প্যাটার্ন আগেই compile করা।
+# mask ফরম্যাট plug-in: register_mask() দিয়ে নতুন স্টাইল যোগ করা যায়।
+
+# (name, mask chars (regex [] এর ভেতরের অংশ), min prefix digits, min mask run, min suffix digits, compiled run)
+MASK_FORMATS = []
+
+# keyword > "is" > যেকোনো ৪-৮ ডিজিট — একটাই regex, একবার match()। প্রতিটি বিকল্প `.*?` দিয়ে
+# শুরু, তাই বিকল্পটা search এর মতোই প্রথম ম্যাচ খোঁজে, আর আগের বিকল্প না মিললে তবেই পরেরটা —
+# আগের তিনটা আলাদা search এর হুবহু সমান। যে group মিলেছে সেটাই m.lastindex।
+_OTP = re.compile(
+    r'(?is)(?:.*?(?:otp|code|verification|pin|কোড)[:\s\-]+(\d{4,8}))'
+    r'|(?:.*?(?:is|হলো)\s*[:\-]?\s*(\d{4,8}))'
+    r'|(?:.*?\b(\d{4,8})\b)'
+)
+
+# parse() এর এক-পাসের অংশগুলো। keyword / "is" এর পরের ডিজিট lookahead এ (খাওয়া হয় না), তাই
+# সেখান থেকেই masked নম্বর শুরু হলেও ধরা পড়ে।
+_KW   = r'(?i:otp|code|verification|pin|কোড)[:\s\-]+(?=(\d{4,8}))'
+_IS   = r'(?i:is|হলো)\s*[:\-]?\s*(?=(\d{4,8}))'
+_BARE = r'\b(\d{4,8})\b'
+
+_masked = None   # সব ফরম্যাটের mask char মিলিয়ে একটাই প্যাটার্ন
+_scan   = None   # mask | keyword | "is" | bare — parse() এর একটাই finditer
+
+
+def _compile():
+    global _masked, _scan
+    chars = "".join(f[1] for f in MASK_FORMATS)
+    _masked = re.compile(rf'(\d+)([{chars}]+)(\d+)')
+    # masked নম্বর পুরোটা lookahead এ (শূন্য দৈর্ঘ্য) — একই জায়গা থেকে পরে bare সংখ্যাও মেলে,
+    # ঠিক যেমন আলাদা দুটো scan এ মিলত। group: mask 1-3, keyword 4, "is" 5, bare 6।
+    # সামনের guard = প্রতিটি বিকল্পের প্রথম অক্ষর; না হলে প্রতি অক্ষরে চারটে বিকল্পই চেষ্টা হয় (~২x ধীর)
+    _scan = re.compile(rf'(?i:(?=[\docvpiকহ]))(?:(?=(\d+)([{chars}]+)(\d+))|{_KW}|{_IS}|{_BARE})')
+
+
+def register_mask(name, chars, min_prefix=1, min_mask=1, min_suffix=1):
+    """নতুন mask স্টাইল যোগ করে (যেমন register_mask("dash", "–", 3, 2, 2))"""
+    MASK_FORMATS[:] = [f for f in MASK_FORMATS if f[0] != name]
+    run = re.compile(rf'[{chars}]+')
+    MASK_FORMATS.append((name, chars, min_prefix, min_mask, min_suffix, run))
+    _compile()
+
+
+# পুরনো circled-letter ফরম্যাট হুবহু আগের মতো; বাকিগুলোতে ভুল ম্যাচ এড়াতে ন্যূনতম দৈর্ঘ্য
+register_mask("circled", r'\u24B6-\u24E9')
+register_mask("star",    r'*',      3, 2, 2)
+register_mask("x",       r'Xx',     3, 2, 2)
+register_mask("bullet",  r'•●∙·',   3, 2, 2)
+
+
+def _classify(prefix, mask, suffix):
+    for name, _, pmin, mmin, smin, run in MASK_FORMATS:
+        if run.fullmatch(mask):
+            if len(prefix) >= pmin and len(mask) >= mmin and len(suffix) >= smin:
+                return name
+            return None
+    return None   # একাধিক স্টাইল মেশানো
+
+
+def parse_masked_all(text):
+    """→ [(prefix, hidden, suffix, format), ...]"""
+    out = []
+    search = _masked.search
+    m = search(text)
+    while m is not None:
+        prefix, mask, suffix = m.groups()
+        fmt = _classify(prefix, mask, suffix)
+        if fmt is not None:
+            out.append((prefix, len(mask), suffix, fmt))
+            m = search(text, m.end())
+        else:
+            # বাতিল হলে suffix এর ডিজিট থেকে পরের নম্বর শুরু হতে পারে
+            m = search(text, m.start(3))
+    return out
+
+
+def get_otp(text):
+    """keyword > "is" > যেকোনো ৪-৮ ডিজিট"""
+    m = _OTP.match(text)
+    return None if m is None else m.group(m.lastindex)
+
+
+def parse(text):
+    """
+    → ([(prefix, hidden, suffix, format), ...], otp); masked না থাকলে otp None।
+    mask আর কোড একই finditer এ — ফলাফল parse_masked_all() + get_otp() এর হুবহু সমান।
+    """
+    masked, found = [], [None, None, None, None, None, None, None]   # group → প্রথম মিল
+    nxt = 0   # parse_masked_all এর মতো: এর আগে নতুন masked নম্বর শুরু হয় না
+    for m in _scan.finditer(text):
+        g = m.lastindex
+        if g == 3:
+            if m.start() < nxt:
+                continue
+            prefix, mask, suffix = m.group(1, 2, 3)
+            fmt = _classify(prefix, mask, suffix)
+            if fmt is not None:
+                masked.append((prefix, len(mask), suffix, fmt))
+                nxt = m.end(3)
+            else:
+                nxt = m.start(3)
+        elif found[g] is None:
+            found[g] = m.group(g)
+    if not masked:
+        return masked, None
+    return masked, found[4] or found[5] or found[6]
+
+
+def parse_masked(text):
+    return [(p, h, s) for p, h, s, _ in parse_masked_all(text)]
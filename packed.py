@@ -0,0 +1,103 @@
+import mmap, os, struct
+from array import array
+
+from persist import atomic_write
+
+# ════════════════════════════════════════════════════════
+#        PACKED NUMBER STORAGE (uint64 + mmap)
+# ════════════════════════════════════════════════════════
+# নম্বর "1" + ডিজিট হিসেবে uint64 এ রাখা হয়, যাতে শুরুর 0 হারিয়ে না যায়।
+# ১৮ ডিজিট পর্যন্ত ধরে (E.164 সর্বোচ্চ ১৫)।
+MAX_DIGITS = 18
+
+MAGIC   = b"NPK1"
+VERSION = 1
+# magic, version, count, txt এর লাইন সংখ্যা, txt_size, txt_mtime_ns
+HEADER  = struct.Struct("<4sIQQQq")
+
+_STRIP = str.maketrans("", "", " \t\r\n\f\v-+()")
+
+
+def encode(n):
+    """'+880 1711-000001' → int; ডিজিট না হলে None"""
+    d = n if n.isdigit() else n.translate(_STRIP)
+    if not d or len(d) > MAX_DIGITS or not d.isascii() or not d.isdigit():
+        return None
+    return int("1" + d)
+
+
+def decode(v):
+    return str(v)[1:]
+
+
+def pack(numbers):
+    """str নম্বরের iterable → sorted, unique array('Q')"""
+    vals = {v for v in map(encode, numbers) if v is not None}
+    return array("Q", sorted(vals))
+
+
+class PackedNumbers:
+    """একটি দেশের stock — sorted uint64 buffer (array বা mmap এর memoryview) আর txt এর লাইন সংখ্যা"""
+    __slots__ = ("values", "total", "_mm")
+
+    def __init__(self, values, total, mm=None):
+        self.values = values
+        self.total  = total
+        self._mm    = mm   # mmap যেন GC না হয়
+
+    def __len__(self):
+        return len(self.values)
+
+
+def write_bin(path, values, total, txt_size=0, txt_mtime_ns=0):
+    atomic_write(path, HEADER.pack(MAGIC, VERSION, len(values), total, txt_size, txt_mtime_ns) + values.tobytes())
+
+
+def open_bin(path):
+    """
+    .bin ফাইল mmap করে zero-copy খোলে → (PackedNumbers, txt_size, txt_mtime_ns)।
+    ফাইল না থাকলে বা ভাঙা হলে None।
+    """
+    try:
+        with open(path, "rb") as f:
+            head = f.read(HEADER.size)
+            if len(head) < HEADER.size:
+                return None
+            magic, version, count, total, txt_size, txt_mtime = HEADER.unpack(head)
+            if magic != MAGIC or version != VERSION:
+                return None
+            if os.fstat(f.fileno()).st_size != HEADER.size + count * 8:
+                return None
+            if count == 0:
+                return PackedNumbers(array("Q"), total), txt_size, txt_mtime
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except OSError:
+        return None
+    return PackedNumbers(memoryview(mm)[HEADER.size:].cast("Q"), total, mm), txt_size, txt_mtime
+
+
+def load_txt_packed(txt_path, bin_path):
+    """
+    txt থেকে stock লোড করে। পাশে রাখা .bin ক্যাশ txt এর সাথে মিললে সরাসরি mmap,
+    নাহলে txt একবার stream করে পড়ে নতুন .bin লিখে সেটাই mmap করে।
+    """
+    if not os.path.exists(txt_path):
+        return PackedNumbers(array("Q"), 0)
+    st = os.stat(txt_path)
+    cached = open_bin(bin_path)
+    if cached is not None and cached[1:] == (st.st_size, st.st_mtime_ns):
+        return cached[0]
+
+    total = 0
+    def lines():
+        nonlocal total
+        with open(txt_path) as f:
+            for x in f:
+                x = x.strip()
+                if x:
+                    total += 1
+                    yield x
+    values = pack(lines())
+    write_bin(bin_path, values, total, st.st_size, st.st_mtime_ns)
+    reopened = open_bin(bin_path)
+    return reopened[0] if reopened is not None else PackedNumbers(values, total)
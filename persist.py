@@ -0,0 +1,106 @@
+import asyncio, os, tempfile
+
+# ════════════════════════════════════════════════════════
+#           WRITE-BEHIND PERSISTENCE
+# ════════════════════════════════════════════════════════
+def atomic_write(path, data):
+    """temp ফাইলে লিখে rename — মাঝপথে প্রসেস মরলেও পুরনো ফাইল অক্ষত থাকে"""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    d = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=d, prefix=".tmp_", suffix=os.path.basename(path))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class WriteBehind:
+    """
+    স্টেট dirty মার্ক করে রাখে, আর background task এ flush করে —
+    প্রথম অসংরক্ষিত পরিবর্তনের `interval` সেকেন্ড পরে (একটানা পরিবর্তন এলেও flush পিছিয়ে যায় না),
+    বা `batch` সংখ্যক পরিবর্তন জমলে সাথে সাথে।
+
+    `serialize(keys)` ইভেন্ট লুপেই চলে (স্টেটের consistent কপি নেয়) এবং
+    একটি no-arg callable রিটার্ন করে যেটা thread এ ডিস্কে লেখে।
+    """
+
+    def __init__(self, serialize, interval=2.0, batch=500):
+        self.serialize = serialize
+        self.interval  = interval
+        self.batch     = batch
+        self.flushes   = 0
+        self._keys     = set()
+        self._pending  = 0
+        self._wake     = None
+        self._task     = None
+        self._closing  = False
+
+    @property
+    def dirty(self):
+        return self._pending > 0
+
+    def mark_dirty(self, key=None):
+        if key is not None:
+            self._keys.add(key)
+        self._pending += 1
+        if self._wake is not None and (self._pending == 1 or self._pending >= self.batch):
+            self._wake.set()
+
+    def _take(self):
+        keys, self._keys, self._pending = self._keys, set(), 0
+        return keys
+
+    def flush(self):
+        """সিনক্রোনাস flush — shutdown বা টেস্টের জন্য"""
+        if self.dirty:
+            self.serialize(self._take())()
+            self.flushes += 1
+
+    async def _run(self):
+        while not self._closing:
+            await self._wake.wait()
+            self._wake.clear()
+            if not self._closing and self._pending < self.batch:
+                # প্রথম পরিবর্তন থেকে interval পর্যন্ত জমতে দাও, batch ভরলে আগেই উঠে যাবে
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self.interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+            if not self.dirty:
+                continue
+            keys  = self._take()
+            write = self.serialize(keys)
+            try:
+                await asyncio.to_thread(write)
+                self.flushes += 1
+            except Exception as e:
+                print(f"[SAVE ❌] {e}")
+                self._keys |= keys
+                self.mark_dirty()
+
+    def start(self):
+        self._closing = False
+        self._wake    = asyncio.Event()
+        if self.dirty:
+            self._wake.set()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """চলমান লেখা শেষ হতে দেয়, তারপর বাকি সব flush করে"""
+        if self._task is not None:
+            self._closing = True
+            self._wake.set()
+            await self._task
+            self._task = None
+        self._wake = None
+        self.flush()
@@ -0,0 +1,434 @@
+import random, threading, time
+from array import array
+from bisect import bisect_left
+from functools import wraps
+
+from packed import PackedNumbers, decode, encode, pack
+
+# ════════════════════════════════════════════════════════
+#              NUMBER POOL INDEX (in-memory)
+# ════════════════════════════════════════════════════════
+class NumberPool:
+    """
+    একটি (service, country) এর নম্বর, সব uint64 হিসেবে প্যাক করা (packed.py)।
+    stock = sorted base buffer (সাধারণত mmap, zero-copy) + পরে যোগ হওয়া _extra।
+    প্রতিটি নম্বরের একটা index আছে: seen হলে _bits এ bit, আর _ts এ দেওয়ার সময় (epoch সেকেন্ড)।
+    unseen index গুলো একবার shuffle করা queue তে; take() শেষ থেকে pop করে — O(k), lazy delete।
+    _exp_ts/_exp_key দেওয়ার ক্রমে সাজানো, তাই expire() শুধু মাথা থেকে এগোয়।
+    stock এ নেই এমন seen নম্বর (যেমন দেশ মুছে ফেলার পর) _other এ থাকে।
+    str শুধু take() এর আউটপুটে বানানো হয়।
+
+    stock এর মতো _bits/_ts ডিস্কে রাখা হয় না — প্রতি লোডে seen ফাইল থেকে বানানো হয়।
+    seen ফাইলে প্রতিটি বরাদ্দেই append হয়, তাই তার সাথে মেলানো ক্যাশ প্রায় সবসময় পুরনো থাকত;
+    আর expiry/compaction এর কারণে seen ফাইল CLEANUP_DAYS এর বরাদ্দের বেশি বড় হয় না।
+    """
+    __slots__ = ("total", "_base", "_nb", "_extra", "_extra_pos", "_bits", "_ts", "_nseen",
+                 "_queue", "_left", "_other", "_exp_ts", "_exp_key", "_exp_head")
+
+    def __init__(self, numbers, seen):
+        if not isinstance(numbers, PackedNumbers):
+            numbers = list(numbers)
+            numbers = PackedNumbers(pack(numbers), len(numbers))
+        if not isinstance(seen, dict):
+            seen = dict.fromkeys(seen, time.time())
+        self.total      = numbers.total   # ফাইলের লাইন সংখ্যা (ডুপ্লিকেট সহ)
+        self._base      = numbers
+        self._nb        = len(numbers.values)
+        self._extra     = array("Q")
+        self._extra_pos = {}
+        self._bits      = bytearray((self._nb + 7) // 8)
+        self._ts        = array("I", [0]) * self._nb
+        self._nseen     = 0
+        self._other     = {}
+        self._exp_ts    = array("I")
+        self._exp_key   = array("q")
+        self._exp_head  = 0
+        for n, ts in sorted(seen.items(), key=lambda x: x[1]):
+            v = encode(n)
+            if v is not None:
+                self._mark(v, int(ts))
+        self._reshuffle()
+
+    def __len__(self):
+        return self._left
+
+    def counts(self):
+        """(total, used, left)"""
+        return self.total, self._nseen + len(self._other), self._left
+
+    # ── index helpers ──
+    def _find(self, v):
+        vals = self._base.values
+        j = bisect_left(vals, v)
+        if j < self._nb and vals[j] == v:
+            return j
+        return self._extra_pos.get(v)
+
+    def _value(self, i):
+        return self._base.values[i] if i < self._nb else self._extra[i - self._nb]
+
+    def _is_seen(self, i):
+        return self._bits[i >> 3] & (1 << (i & 7))
+
+    def _set_seen(self, i, ts):
+        self._bits[i >> 3] |= 1 << (i & 7)
+        self._ts[i] = ts
+        self._nseen += 1
+        self._exp_ts.append(ts)
+        self._exp_key.append(i)
+
+    def _unset_seen(self, i):
+        self._bits[i >> 3] &= ~(1 << (i & 7)) & 0xFF
+        self._nseen -= 1
+        self._push(i)
+        self._left += 1
+
+    def _mark(self, v, ts):
+        """v কে seen করে; stock এর নম্বর নতুন করে seen হলে True"""
+        i = self._find(v)
+        if i is None:
+            if v not in self._other:
+                self._other[v] = ts
+                self._exp_ts.append(ts)
+                self._exp_key.append(-v)
+            return False
+        if self._is_seen(i):
+            return False
+        self._set_seen(i, ts)
+        return True
+
+    def _reshuffle(self):
+        n = self._nb + len(self._extra)
+        if self._nseen:
+            self._queue = array("I", (i for i in range(n) if not self._is_seen(i)))
+        else:
+            self._queue = array("I", range(n))
+        random.shuffle(self._queue)
+        self._left  = len(self._queue)
+
+    def _push(self, i):
+        # র‍্যান্ডম জায়গায় বসাও যাতে queue shuffled থাকে
+        q = self._queue
+        q.append(i)
+        j = random.randrange(len(q))
+        q[j], q[-1] = q[-1], q[j]
+
+    # ── public ──
+    def take(self, k):
+        out = []
+        now = int(time.time())
+        q   = self._queue
+        while len(out) < k and q:
+            i = q.pop()
+            if self._is_seen(i):
+                continue   # stale entry
+            self._set_seen(i, now)
+            out.append(decode(self._value(i)))
+        self._left -= len(out)
+        if len(q) > 2 * self._left + 1024:
+            self._reshuffle()
+        return out
+
+    def add(self, numbers):
+        for n in numbers:
+            self.total += 1
+            v = encode(n)
+            if v is None or self._find(v) is not None:
+                continue
+            i = self._nb + len(self._extra)
+            self._extra.append(v)
+            self._extra_pos[v] = i
+            if len(self._bits) * 8 <= i:
+                self._bits.append(0)
+            self._ts.append(0)
+            ts = self._other.pop(v, None)
+            if ts is not None:
+                # মুছে ফেলে আবার আপলোড — আগের seen এখনো বহাল
+                self._set_seen(i, ts)
+            else:
+                self._push(i)
+                self._left += 1
+
+    def mark_seen(self, numbers, ts=None):
+        ts = int(ts or time.time())
+        for n in numbers:
+            v = encode(n)
+            if v is not None and self._mark(v, ts):
+                self._left -= 1
+
+    def release(self, numbers):
+        """seen থেকে সরিয়ে আবার দেওয়ার যোগ্য করে"""
+        for n in numbers:
+            v = encode(n)
+            if v is None:
+                continue
+            i = self._find(v)
+            if i is None:
+                self._other.pop(v, None)
+            elif self._is_seen(i):
+                self._unset_seen(i)
+
+    def known(self, n):
+        """stock বা seen এ আছে কিনা"""
+        v = encode(n)
+        return v is not None and (self._find(v) is not None or v in self._other)
+
+    def next_expiry(self):
+        h = self._exp_head
+        return self._exp_ts[h] if h < len(self._exp_ts) else float("inf")
+
+    def _live_expiry(self):
+        T, K = self._exp_ts, self._exp_key
+        for h in range(self._exp_head, len(T)):
+            ts, key = T[h], K[h]
+            if key >= 0:
+                if self._is_seen(key) and self._ts[key] == ts:
+                    yield ts, key, self._value(key)
+            elif self._other.get(-key) == ts:
+                yield ts, key, -key
+
+    def seen_items(self):
+        return [(decode(v), ts) for ts, _, v in self._live_expiry()]
+
+    def expire(self, cutoff):
+        """cutoff বা তার আগে দেওয়া নম্বরগুলো ফেরত আনে; O(expired)"""
+        out = []
+        T, K = self._exp_ts, self._exp_key
+        h = self._exp_head
+        while h < len(T) and T[h] <= cutoff:
+            ts, key = T[h], K[h]
+            h += 1
+            # পরে আবার দেওয়া হয়ে থাকলে পুরনো এন্ট্রিটা বাতিল
+            if key >= 0:
+                if self._is_seen(key) and self._ts[key] == ts:
+                    self._unset_seen(key)
+                    out.append(decode(self._value(key)))
+            elif self._other.get(-key) == ts:
+                del self._other[-key]
+                out.append(decode(-key))
+        self._exp_head = h
+        if h > 4096 and 2 * h > len(T):
+            self._exp_ts, self._exp_key, self._exp_head = T[h:], K[h:], 0
+        return out
+
+    def dedupe(self):
+        self.total = self._nb + len(self._extra)
+
+    def clear(self):
+        # stock মুছে যায়, কিন্তু seen গুলো মেয়াদ পর্যন্ত থাকে
+        live = list(self._live_expiry())
+        self._other = {v: ts for ts, _, v in live}
+        self._exp_ts    = array("I", (ts for ts, _, _ in live))
+        self._exp_key   = array("q", (-v for _, _, v in live))
+        self._exp_head  = 0
+        self.total      = 0
+        self._base      = PackedNumbers(array("Q"), 0)
+        self._nb        = 0
+        self._extra     = array("Q")
+        self._extra_pos = {}
+        self._bits      = bytearray()
+        self._ts        = array("I")
+        self._nseen     = 0
+        self._queue     = array("I")
+        self._left      = 0
+
+
+def _locked(fn):
+    @wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return fn(self, *args, **kwargs)
+    return wrapper
+
+
+class PoolIndex:
+    """
+    (service, country) → NumberPool, সাথে service ভিত্তিক total/used/left কাউন্টার।
+    প্রতিটি pool প্রথমবার দরকার হলে ডিস্ক থেকে একবার লোড হয়, এরপর শুধু incremental আপডেট।
+    """
+
+    def __init__(self, load_numbers, load_seen, ttl=None, label=None):
+        self._load_numbers = load_numbers
+        self._load_seen    = load_seen
+        self.ttl           = ttl   # seen কত সেকেন্ড পর আবার দেওয়া যাবে (None = কখনো না)
+        self._pools        = {}
+        self._svc          = {}   # service → [total, used, left]
+        # stock version — left এর label (যেমন 🟢/🟡/🔴 বাকেট) বদলালে তবেই বাড়ে;
+        # service → int, আর None → সার্ভিস তালিকার (মোট left) version
+        self._label        = label or (lambda left: left)
+        self._ver          = {}
+        self._epoch        = 0
+        self._mod          = {}   # (service, country) → পরিবর্তনের গণনা; চলমান লোড পুরনো হলে বোঝা যায়
+        # একই নম্বর যেন দুজন না পায় — thread থেকে ডাকলেও take/add/seen atomic।
+        # ফাইল পড়া lock এর বাইরে (warm thread লুপকে আটকায় না), শুধু বসানো lock এ।
+        self._lock         = threading.RLock()
+
+    def _load(self, service, country):
+        return NumberPool(self._load_numbers(service, country), self._load_seen(service, country))
+
+    def _bump(self, service):
+        self._ver[service] = self._ver.get(service, 0) + 1
+
+    def _touch(self, key):
+        self._mod[key] = self._mod.get(key, 0) + 1
+
+    def _shift(self, key, before, after):
+        self._touch(key)
+        service = key[0]
+        c = self._svc.setdefault(service, [0, 0, 0])
+        svc_left = c[2]
+        for i in range(3):
+            c[i] += after[i] - before[i]
+        label = self._label
+        if before[2] != after[2] and label(before[2]) != label(after[2]):
+            self._bump(service)
+        if svc_left != c[2] and label(svc_left) != label(c[2]):
+            self._bump(None)
+
+    def version(self, service=None):
+        """render cache এর tag — service=None হলে সার্ভিস তালিকার"""
+        return self._epoch, self._ver.get(service, 0)
+
+    def get(self, service, country):
+        key  = (service, country)
+        pool = self._pools.get(key)
+        while pool is None:
+            mod   = self._mod.get(key, 0)
+            fresh = self._load(service, country)
+            with self._lock:
+                pool = self._pools.get(key)
+                if pool is None and mod == self._mod.get(key, 0):
+                    pool = self._pools[key] = fresh
+                    self._shift(key, (0, 0, 0), pool.counts())
+                    self._bump(service)   # দেশের তালিকাতেই নতুন এন্ট্রি
+        return pool
+
+    def _mutate(self, service, country, fn):
+        key = (service, country)
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is not None:
+                before = pool.counts()
+                out    = fn(pool)
+                self._shift(key, before, pool.counts())
+                return out
+            # ডিস্কে পরিবর্তন আগেই লেখা হয়েছে, তাই নতুন লোডেই সেটা চলে আসবে —
+            # এর আগে শুরু হওয়া লোড পুরনো ফাইল পড়ে থাকতে পারে, সেটা বসানো যাবে না
+            self._touch(key)
+        self.get(service, country)
+        return None
+
+    def warm(self, services, get_countries):
+        for svc in services:
+            for c in get_countries(svc):
+                self.get(svc, c)
+
+    # ── counters: O(1) ──
+    @_locked
+    def left(self, service, country):
+        return len(self.get(service, country))
+
+    @_locked
+    def counts(self, service, country):
+        return self.get(service, country).counts()
+
+    @_locked
+    def service_counts(self, service):
+        return tuple(self._svc.get(service, (0, 0, 0)))
+
+    # ── allocation / incremental updates ──
+    @_locked
+    def take(self, service, country, k):
+        pool   = self.get(service, country)
+        before = pool.counts()
+        if self.ttl is not None:
+            # job এর পরের রানের অপেক্ষা না করে এখনই মেয়াদোত্তীর্ণগুলো ফেরত আনো
+            pool.expire(time.time() - self.ttl)
+        out    = pool.take(k)
+        self._shift((service, country), before, pool.counts())
+        return out
+
+    def add(self, service, country, numbers):
+        self._mutate(service, country, lambda p: p.add(numbers))
+
+    def mark_seen(self, service, country, numbers):
+        self._mutate(service, country, lambda p: p.mark_seen(numbers))
+
+    @_locked
+    def expire(self, cutoff=None):
+        """সব লোড হওয়া pool এ seen expire করে; [(service, country, released)] রিটার্ন করে"""
+        if cutoff is None:
+            cutoff = time.time() - self.ttl
+        out = []
+        for (svc, c), pool in self._pools.items():
+            if pool.next_expiry() > cutoff:
+                continue
+            before   = pool.counts()
+            released = pool.expire(cutoff)
+            self._shift((svc, c), before, pool.counts())
+            if released:
+                out.append((svc, c, released))
+        return out
+
+    @_locked
+    def contains(self, service, country, number):
+        """stock বা seen এ আছে কিনা"""
+        return self.get(service, country).known(number)
+
+    @_locked
+    def seen_items(self, service, country):
+        return self.get(service, country).seen_items()
+
+    def release(self, service, country, numbers):
+        self._mutate(service, country, lambda p: p.release(numbers))
+
+    def dedupe(self, service, country):
+        self._mutate(service, country, NumberPool.dedupe)
+
+    def clear(self, service, country):
+        self._mutate(service, country, NumberPool.clear)
+
+    @_locked
+    def refresh(self, service, country):
+        """ডিস্ক থেকে আবার লোড করে (যেমন seen ফাইল expire হলে)"""
+        old  = self._pools.pop((service, country), None)
+        if old is not None:
+            self._shift((service, country), old.counts(), (0, 0, 0))
+        self.get(service, country)
+
+    def check(self, services, get_countries):
+        """
+        ডিস্ক থেকে সব কাউন্টার নতুন করে বানায় (thread এ চালাও — ফাইল পড়া lock এর বাইরে)।
+        পড়ার মাঝে যে pool বদলেছে সেটা আবার পড়া হয়; তিনবারেও স্থির না হলে মেমোরির টাই থাকে।
+        যেসব pool মেলেনি সেগুলোর [(service, country, memory_counts, disk_counts)] রিটার্ন করে।
+        """
+        keys  = [(svc, c) for svc in services for c in get_countries(svc)]
+        fresh = {}   # key → (লোডের আগের _mod, pool)
+        todo  = keys
+        for _ in range(3):
+            for key in todo:
+                mod = self._mod.get(key, 0)
+                fresh[key] = (mod, self._load(*key))
+            todo = [k for k in todo if self._mod.get(k, 0) != fresh[k][0]]
+            if not todo:
+                break
+        mismatches = []
+        pools, totals = {}, {}
+        with self._lock:
+            for key in keys:
+                mod, pool = fresh[key]
+                old = self._pools.get(key)
+                if mod != self._mod.get(key, 0):
+                    if old is None:
+                        continue   # প্রথম দরকারে get() নিজেই লোড করবে
+                    pool = old
+                elif old is not None and old.counts() != pool.counts():
+                    mismatches.append((*key, old.counts(), pool.counts()))
+                pools[key] = pool
+                c_tot = totals.setdefault(key[0], [0, 0, 0])
+                for i, v in enumerate(pool.counts()):
+                    c_tot[i] += v
+            self._pools  = pools
+            self._svc    = totals
+            self._epoch += 1
+        return mismatches
@@ -0,0 +1,169 @@
+import asyncio, cProfile, io, os, pstats, sys, threading, time, tracemalloc
+from collections import Counter
+
+# ════════════════════════════════════════════════════════
+#        RUNTIME PROFILING (admin কমান্ড থেকে)
+# ════════════════════════════════════════════════════════
+# sample: আলাদা thread নির্দিষ্ট সময় পরপর event loop thread এর stack দেখে — overhead
+#         interval দিয়ে বাঁধা, লুপ কখনো থামে না।
+# cpu:    cProfile (সব ফাংশন কল গোনে, নির্ভুল কিন্তু ধীর) — শুধু অল্প সময়ের জন্য।
+MAX_SECONDS = 300
+TOP         = 40
+
+
+def _where(code):
+    return f"{os.path.basename(code.co_filename)}:{code.co_firstlineno}({code.co_name})"
+
+
+class StackSampler:
+    def __init__(self, thread_id, interval=0.01):
+        self.thread_id = thread_id
+        self.interval  = interval
+        self.samples   = 0
+        self.own       = Counter()   # stack এর একদম ওপরে (self time)
+        self.cum       = Counter()   # stack এর কোথাও (cumulative)
+        self.stacks    = Counter()   # folded stack → গণনা (flamegraph এর জন্য)
+        self._stop     = threading.Event()
+        self._thread   = None
+        self.started   = 0.0
+
+    def start(self):
+        self.started = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_where(frame.f_code))
+                frame = frame.f_back
+            self.samples += 1
+            self.own[stack[0]] += 1
+            self.cum.update(set(stack))
+            self.stacks[";".join(reversed(stack))] += 1
+
+    def report(self):
+        n   = max(self.samples, 1)
+        dur = time.monotonic() - self.started
+        out = [f"sampling profile: {self.samples} samples in {dur:.1f}s (interval {self.interval * 1000:.0f} ms)", ""]
+        for title, table in (("cumulative", self.cum), ("self", self.own)):
+            out.append(f"── top {TOP} by {title} ──")
+            out += [f"{c / n * 100:6.1f}%  {c:7d}  {where}" for where, c in table.most_common(TOP)]
+            out.append("")
+        out.append("── folded stacks (flamegraph.pl / speedscope) ──")
+        out += [f"{s} {c}" for s, c in self.stacks.most_common(300)]
+        return "\n".join(out)
+
+
+class Profiler:
+    """একসাথে একটাই সেশন; শেষ হলে on_done(filename, text) await হয়"""
+
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.kind     = None
+        self._session = None
+        self._task    = None
+        self._report  = True
+        self._stop    = None
+        self._snap    = None   # শেষ tracemalloc snapshot
+
+    @property
+    def running(self):
+        return self._task is not None and not self._task.done()
+
+    def start(self, seconds, kind, on_done):
+        seconds = max(1, min(seconds, MAX_SECONDS))
+        if kind == "cpu":
+            self._session = cProfile.Profile()
+            self._session.enable()   # শুধু event loop thread এ চালু হয়
+        else:
+            self._session = StackSampler(threading.get_ident(), self.interval)
+            self._session.start()
+        self.kind    = kind
+        self._report = True
+        self._stop   = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._finish_after(seconds, on_done))
+        return seconds
+
+    def stop(self, report=True):
+        """আগেই থামায়; report=True হলে রিপোর্ট তবুও পাঠানো হয়"""
+        if self.running:
+            self._report = report
+            self._stop.set()
+
+    async def close(self):
+        """shutdown এ — সেশন থামায়, রিপোর্ট পাঠায় না"""
+        if self.running:
+            task = self._task
+            self.stop(report=False)
+            await task
+
+    async def _finish_after(self, seconds, on_done):
+        try:
+            await asyncio.wait_for(self._stop.wait(), seconds)
+        except asyncio.TimeoutError:
+            pass
+        session, kind = self._session, self.kind
+        if kind == "cpu":
+            session.disable()
+            text = await asyncio.to_thread(_pstats_text, session)
+        else:
+            await asyncio.to_thread(session.stop)
+            text = await asyncio.to_thread(session.report)
+        self._session = self.kind = None
+        if not self._report:
+            return
+        try:
+            await on_done(f"profile_{kind}_{time.strftime('%Y%m%d_%H%M%S')}.txt", text)
+        except Exception as e:
+            print(f"[PROFILE] রিপোর্ট পাঠানো যায়নি: {e}")
+
+    # ── memory ──────────────────────────────
+    def mem_snapshot(self):
+        """
+        প্রথমবার tracemalloc চালু করে baseline নেয়; পরেরবার আগেরটার সাথে diff দেয়।
+        → (filename, text)
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+            self._snap = tracemalloc.take_snapshot()
+            return None, "tracemalloc চালু হয়েছে, baseline নেওয়া হলো। কিছুক্ষণ পর আবার দাও।"
+        snap = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        cur, peak = tracemalloc.get_traced_memory()
+        out = [f"traced: {cur / 1024 / 1024:.1f} MB  (peak {peak / 1024 / 1024:.1f} MB)", "",
+               f"── top {TOP} growth since last snapshot ──"]
+        out += [str(s) for s in snap.compare_to(self._snap, "lineno")[:TOP]]
+        out += ["", f"── top {TOP} allocation sites now ──"]
+        out += [str(s) for s in snap.statistics("lineno")[:TOP]]
+        biggest = snap.statistics("traceback")[:3]
+        for i, s in enumerate(biggest, 1):
+            out += ["", f"── #{i} biggest: {s.size / 1024:.0f} KB in {s.count} blocks ──"] + s.traceback.format()
+        self._snap = snap
+        return f"memdiff_{time.strftime('%Y%m%d_%H%M%S')}.txt", "\n".join(out)
+
+    def mem_stop(self):
+        self._snap = None
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+            return True
+        return False
+
+
+def _pstats_text(prof):
+    buf = io.StringIO()
+    st  = pstats.Stats(prof, stream=buf)
+    st.sort_stats("cumulative").print_stats(TOP)
+    st.sort_stats("tottime").print_stats(TOP)
+    return buf.getvalue()
@@ -0,0 +1,98 @@
+import asyncio, time
+from itertools import islice
+
+# ════════════════════════════════════════════════════════
+#                   TOKEN BUCKET
+# ════════════════════════════════════════════════════════
+class TokenBucket:
+    """rate টোকেন/সেকেন্ড, সর্বোচ্চ capacity টোকেন জমতে পারে"""
+    __slots__ = ("rate", "capacity", "tokens", "last")
+
+    def __init__(self, rate, capacity=None):
+        self.rate     = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self.tokens   = self.capacity
+        self.last     = time.monotonic()
+
+    def _refill(self, now):
+        if now > self.last:
+            self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+            self.last   = now
+
+    def try_take(self, n=1, now=None):
+        self._refill(now if now is not None else time.monotonic())
+        if self.tokens >= n:
+            self.tokens -= n
+            return True
+        return False
+
+    def delay(self, n=1, now=None):
+        """n টোকেন পেতে আর কত সেকেন্ড লাগবে"""
+        self._refill(now if now is not None else time.monotonic())
+        return 0.0 if self.tokens >= n else (n - self.tokens) / self.rate
+
+    def idle(self, now=None):
+        """পুরো ভরা — মানে অনেকক্ষণ কেউ ব্যবহার করেনি"""
+        self._refill(now if now is not None else time.monotonic())
+        return self.tokens >= self.capacity
+
+    async def acquire(self, n=1):
+        while not self.try_take(n):
+            await asyncio.sleep(self.delay(n))
+
+
+# ════════════════════════════════════════════════════════
+#          KEYED LIMITER (ইউজার × অ্যাকশন flood control)
+# ════════════════════════════════════════════════════════
+ALLOW, NOTIFY, DROP = "allow", "notify", "drop"
+
+
+class KeyedLimiter:
+    """
+    (uid, action) প্রতি একটা TokenBucket, limits = {action: (টোকেন/সেকেন্ড, burst)}।
+    টোকেন না থাকলে প্রথমবার NOTIFY (ইউজারকে একবার জানাও), তারপর টোকেন না ফেরা পর্যন্ত DROP —
+    একটানা চাপগুলো একটাতেই মিশে যায়। পুরো ভরা (অলস) bucket গুলো sweep_every পরপর মোছা হয়;
+    তারপরও max_keys এর ৯০% এর বেশি থাকলে সবচেয়ে পুরনো bucket গুলো বাদ যায়।
+    """
+
+    def __init__(self, limits, sweep_every=60.0, max_keys=100_000):
+        self.limits      = dict(limits)
+        self.sweep_every = sweep_every
+        self.max_keys    = max_keys
+        self._buckets    = {}
+        self._told       = set()   # যাদের এই দফায় একবার জানানো হয়েছে
+        self._swept      = time.monotonic()
+
+    def __len__(self):
+        return len(self._buckets)
+
+    def check(self, uid, action, now=None):
+        now = now if now is not None else time.monotonic()
+        key = (uid, action)
+        b   = self._buckets.get(key)
+        if b is None:
+            if now - self._swept >= self.sweep_every or len(self._buckets) >= self.max_keys:
+                self.sweep(now)
+            rate, burst = self.limits.get(action) or self.limits["default"]
+            b = self._buckets[key] = TokenBucket(rate, burst)
+        if b.try_take(now=now):
+            self._told.discard(key)
+            return ALLOW
+        if key in self._told:
+            return DROP
+        self._told.add(key)
+        return NOTIFY
+
+    def sweep(self, now=None):
+        now = now if now is not None else time.monotonic()
+        self._swept = now
+        for k in [k for k, b in self._buckets.items() if b.idle(now)]:
+            del self._buckets[k]
+            self._told.discard(k)
+        # কেউই অলস নয় — জায়গা খালি না করলে প্রতিটি নতুন key তে আবার পুরো sweep হতো।
+        # dict এ ঢোকানোর ক্রম থাকে, তাই শুরুর দিকেরগুলোই সবচেয়ে পুরনো।
+        extra = len(self._buckets) - self.max_keys * 9 // 10
+        if extra > 0:
+            for k in list(islice(self._buckets, extra)):
+                del self._buckets[k]
+                self._told.discard(k)
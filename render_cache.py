@@ -0,0 +1,37 @@
+import metrics
+
+# ════════════════════════════════════════════════════════
+#        RENDER CACHE (versioned screen/keyboard)
+# ════════════════════════════════════════════════════════
+LOOKUPS = metrics.Counter("bot_render_cache_total", "Screen render cache lookups", ("screen", "result"))
+
+
+class RenderCache:
+    """
+    key → (version, value)। key এর প্রথম অংশ screen এর নাম (metrics label)।
+    version মিললে আগের render ফেরত দেয়, নাহলে build() চালিয়ে নতুনটা রাখে।
+    """
+
+    def __init__(self):
+        self._items = {}
+        self.hits   = 0
+        self.misses = 0
+
+    def get(self, key, version, build):
+        item = self._items.get(key)
+        if item is not None and item[0] == version:
+            self.hits += 1
+            LOOKUPS.inc(key[0], "hit")
+            return item[1]
+        self.misses += 1
+        LOOKUPS.inc(key[0], "miss")
+        value = build()
+        self._items[key] = (version, value)
+        return value
+
+    def hit_rate(self):
+        n = self.hits + self.misses
+        return self.hits / n if n else 0.0
+
+    def clear(self):
+        self._items.clear()
@@ -0,0 +1,311 @@
+import os, json, time, sqlite3, threading, argparse
+import config
+
+# ════════════════════════════════════════════════════════
+#              SQLITE (WAL) STORAGE BACKEND
+# ════════════════════════════════════════════════════════
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    uid         INTEGER PRIMARY KEY,
+    last_active TEXT
+);
+CREATE TABLE IF NOT EXISTS bans   (uid INTEGER PRIMARY KEY);
+CREATE TABLE IF NOT EXISTS admins (uid INTEGER PRIMARY KEY);
+CREATE TABLE IF NOT EXISTS settings (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS user_totals (
+    uid   INTEGER PRIMARY KEY,
+    total INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_user_totals_total ON user_totals(total DESC);
+CREATE TABLE IF NOT EXISTS user_stats (
+    uid     INTEGER NOT NULL,
+    service TEXT    NOT NULL,
+    country TEXT    NOT NULL,
+    count   INTEGER NOT NULL,
+    PRIMARY KEY (uid, service, country)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS last_numbers (
+    uid    INTEGER NOT NULL,
+    pos    INTEGER NOT NULL,
+    number TEXT    NOT NULL,
+    PRIMARY KEY (uid, pos)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS history (
+    id      INTEGER PRIMARY KEY AUTOINCREMENT,
+    uid     INTEGER NOT NULL,
+    service TEXT    NOT NULL,
+    country TEXT    NOT NULL,
+    number  TEXT    NOT NULL,
+    time    TEXT    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_history_uid ON history(uid, id);
+CREATE TABLE IF NOT EXISTS otp_log (
+    id      INTEGER PRIMARY KEY AUTOINCREMENT,
+    time    TEXT    NOT NULL,
+    number  TEXT    NOT NULL,
+    otp     TEXT    NOT NULL,
+    uid     INTEGER NOT NULL,
+    service TEXT    NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS numbers (
+    service TEXT NOT NULL,
+    country TEXT NOT NULL,
+    number  TEXT NOT NULL,
+    PRIMARY KEY (service, country, number)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS allocations (
+    service TEXT NOT NULL,
+    country TEXT NOT NULL,
+    number  TEXT NOT NULL,
+    ts      REAL NOT NULL,
+    PRIMARY KEY (service, country, number)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_allocations_ts ON allocations(ts);
+"""
+
+# history/otp_log এর time কলামে এখন epoch (পুরনো row এ "01 Jan 2026 10:00" ধরনের লেখা — লোডের সময় রূপান্তর হয়)
+class SQLiteStore:
+    """
+    users/bans/admins/stats/history/OTP log এবং নম্বর pool এর SQLite ব্যাকএন্ড।
+    WAL মোড, parameterised (cached) statements; একটাই connection, lock দিয়ে সুরক্ষিত
+    যাতে write-behind thread আর ইভেন্ট লুপ দুটো থেকেই ব্যবহার করা যায়।
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.db   = sqlite3.connect(path, check_same_thread=False, cached_statements=256)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("PRAGMA foreign_keys=OFF")
+        self.db.executescript(SCHEMA)
+        if "service" not in [r[1] for r in self.db.execute("PRAGMA table_info(otp_log)")]:
+            self.db.execute("ALTER TABLE otp_log ADD COLUMN service TEXT NOT NULL DEFAULT ''")
+        self._otp_written = 0   # OTP_LOG.total এর কত পর্যন্ত লেখা হয়েছে
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+    # ── user state ────────────────────────────
+    def load_state(self):
+        """JSON ফাইলের মতো একই কী সহ dict রিটার্ন করে"""
+        with self.lock:
+            c = self.db
+            stats = {}
+            for uid, total in c.execute("SELECT uid, total FROM user_totals"):
+                stats[str(uid)] = {"total": total, "services": {}}
+            for uid, svc, country, n in c.execute("SELECT uid, service, country, count FROM user_stats"):
+                s = stats.setdefault(str(uid), {"total": 0, "services": {}})
+                s["services"].setdefault(svc, {})[country] = n
+            last = {}
+            for uid, number in c.execute("SELECT uid, number FROM last_numbers ORDER BY uid, pos"):
+                last.setdefault(str(uid), []).append(number)
+            hist = {}
+            for uid, svc, country, number, t in c.execute(
+                "SELECT uid, service, country, number, time FROM history ORDER BY uid, id"
+            ):
+                hist.setdefault(str(uid), []).append((t, svc, country, number))
+            active = {str(uid): t for uid, t in c.execute("SELECT uid, last_active FROM users") if t}
+            otp_log = c.execute(
+                "SELECT time, service, number, otp, uid FROM otp_log ORDER BY id DESC LIMIT ?", (config.OTP_LOG_SIZE,)
+            ).fetchall()[::-1]
+            self._otp_written = len(otp_log)
+            settings = dict(c.execute("SELECT key, value FROM settings"))
+            d = {
+                "USER_STATS":        stats,
+                "USER_LAST_NUMBERS": last,
+                "USER_LAST_ACTIVE":  active,
+                "USER_HISTORY":      hist,
+                "BANNED":            [r[0] for r in c.execute("SELECT uid FROM bans")],
+                "ADMINS":            [r[0] for r in c.execute("SELECT uid FROM admins")],
+                "USERS":             [r[0] for r in c.execute("SELECT uid FROM users")],
+                "OTP_LOG":           otp_log,
+            }
+            for k in ("NUMBER_LIMIT", "SERVICES", "AGGREGATES"):
+                if k in settings:
+                    d[k] = json.loads(settings[k])
+        return d
+
+    def snapshot(self, keys, state):
+        """
+        ইভেন্ট লুপে চলে: শুধু dirty ইউজারদের (keys) row কপি করে, আর একটা
+        writer রিটার্ন করে যেটা thread এ এক transaction এ লিখে দেয়।
+        """
+        users, known = [], state["USERS"]
+        for s in keys:
+            uid  = int(s)
+            st   = state["USER_STATS"].get(s)
+            hist = list(state["USER_HISTORY"].get(s) or ())[-config.HISTORY_SIZE:]
+            users.append((
+                uid,
+                uid in known,
+                state["USER_LAST_ACTIVE"].get(s),
+                st["total"] if st else None,
+                [(uid, svc, c, n) for svc, cs in (st or {}).get("services", {}).items() for c, n in cs.items()],
+                [(uid, i, n) for i, n in enumerate(state["USER_LAST_NUMBERS"].get(s) or [])],
+                [(uid, h.service, h.country, h.number, h.ts) for h in hist],
+            ))
+        log      = state["OTP_LOG"]
+        new_otps = [(e.ts, e.number, e.otp, e.uid, e.service) for e in log.after(self._otp_written)]
+        self._otp_written = log.total
+        bans     = [(u,) for u in state["BANNED"]]
+        admins   = [(u,) for u in state["ADMINS"]]
+        settings = [("NUMBER_LIMIT", json.dumps(state["NUMBER_LIMIT"])),
+                    ("SERVICES",     json.dumps(state["SERVICES"], ensure_ascii=False))]
+
+        def write():
+            with self.lock, self.db:
+                c = self.db
+                for uid, listed, active, total, stats, last, hist in users:
+                    if listed:
+                        c.execute(
+                            "INSERT INTO users(uid, last_active) VALUES(?, ?) "
+                            "ON CONFLICT(uid) DO UPDATE SET last_active=excluded.last_active",
+                            (uid, active),
+                        )
+                    else:
+                        # USERS থেকে বাদ (বট block করেছে) — stats/history থাকে, তালিকায় না
+                        c.execute("DELETE FROM users WHERE uid=?", (uid,))
+                    if total is not None:
+                        c.execute("INSERT OR REPLACE INTO user_totals(uid, total) VALUES(?, ?)", (uid, total))
+                        c.executemany("INSERT OR REPLACE INTO user_stats VALUES(?, ?, ?, ?)", stats)
+                    c.execute("DELETE FROM last_numbers WHERE uid=?", (uid,))
+                    c.executemany("INSERT INTO last_numbers VALUES(?, ?, ?)", last)
+                    c.execute("DELETE FROM history WHERE uid=?", (uid,))
+                    c.executemany(
+                        "INSERT INTO history(uid, service, country, number, time) VALUES(?, ?, ?, ?, ?)", hist
+                    )
+                c.executemany("INSERT INTO otp_log(time, number, otp, uid, service) VALUES(?, ?, ?, ?, ?)", new_otps)
+                c.execute("DELETE FROM bans")
+                c.executemany("INSERT INTO bans VALUES(?)", bans)
+                c.execute("DELETE FROM admins")
+                c.executemany("INSERT INTO admins VALUES(?)", admins)
+                c.executemany("INSERT OR REPLACE INTO settings VALUES(?, ?)", settings)
+        return write
+
+    def save_setting(self, key, value):
+        with self.lock, self.db:
+            self.db.execute("INSERT OR REPLACE INTO settings VALUES(?, ?)", (key, value))
+
+    # ── number pools ──────────────────────────
+    def countries(self, service):
+        with self.lock:
+            return [r[0] for r in self.db.execute(
+                "SELECT DISTINCT country FROM numbers WHERE service=?", (service,)
+            )]
+
+    def numbers(self, service, country):
+        with self.lock:
+            return [r[0] for r in self.db.execute(
+                "SELECT number FROM numbers WHERE service=? AND country=?", (service, country)
+            )]
+
+    def seen(self, service, country, cutoff=0):
+        """{number: allocation ts} — cutoff এর পরের গুলো (JSON ব্যাকএন্ডের get_seen এর মতো)"""
+        with self.lock:
+            return dict(self.db.execute(
+                "SELECT number, ts FROM allocations WHERE service=? AND country=? AND ts > ?",
+                (service, country, cutoff),
+            ))
+
+    def add_numbers(self, service, country, numbers):
+        with self.lock, self.db:
+            cur = self.db.executemany(
+                "INSERT OR IGNORE INTO numbers VALUES(?, ?, ?)",
+                ((service, country, n) for n in numbers),
+            )
+            return cur.rowcount
+
+    def clear_country(self, service, country):
+        with self.lock, self.db:
+            return self.db.execute(
+                "DELETE FROM numbers WHERE service=? AND country=?", (service, country)
+            ).rowcount
+
+    def add_allocations(self, service, country, numbers, ts=None):
+        ts = ts or time.time()
+        with self.lock, self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO allocations VALUES(?, ?, ?, ?)",
+                ((service, country, n, ts) for n in numbers),
+            )
+
+    def expire_allocations(self, cutoff):
+        """cutoff এর আগের allocation মুছে দেয়; প্রভাবিত (service, country) রিটার্ন করে"""
+        with self.lock, self.db:
+            pairs = self.db.execute(
+                "SELECT DISTINCT service, country FROM allocations WHERE ts < ?", (cutoff,)
+            ).fetchall()
+            if pairs:
+                self.db.execute("DELETE FROM allocations WHERE ts < ?", (cutoff,))
+        return pairs
+
+
+# ════════════════════════════════════════════════════════
+#          ONE-SHOT MIGRATION (JSON + txt → SQLite)
+# ════════════════════════════════════════════════════════
+def migrate(store, journal, number_dir, seen_dir):
+    """journal = bot এর Journal — snapshot (.bin বা পুরনো JSON) আর তার পরের segment replay করে পড়া হয়"""
+    counts = {"users": 0, "numbers": 0, "seen": 0}
+    if os.path.exists(journal.path) or os.path.exists(journal.legacy or "") or journal.segments():
+        state = journal.load()
+        keys  = set(map(str, state["USERS"]))
+        keys |= set(state["USER_STATS"]) | set(state["USER_LAST_NUMBERS"]) | set(state["USER_HISTORY"])
+        store.snapshot(keys, state)()
+        store.save_setting("AGGREGATES", json.dumps(state["AGGREGATES"].dump(), ensure_ascii=False))
+        counts["users"] = len(keys)
+
+    if os.path.isdir(number_dir):
+        for service in sorted(os.listdir(number_dir)):
+            sdir = os.path.join(number_dir, service)
+            if not os.path.isdir(sdir):
+                continue
+            for fn in os.listdir(sdir):
+                if not fn.endswith(".txt") or fn.endswith("_Backup.txt"):
+                    continue
+                with open(os.path.join(sdir, fn)) as f:
+                    nums = [x.strip() for x in f if x.strip()]
+                counts["numbers"] += store.add_numbers(service, fn[:-4], nums)
+
+    if os.path.isdir(seen_dir):
+        for service in sorted(os.listdir(seen_dir)):
+            sdir = os.path.join(seen_dir, service)
+            if not os.path.isdir(sdir):
+                continue
+            for fn in os.listdir(sdir):
+                if not (fn.startswith("global_") and fn.endswith(".txt")):
+                    continue
+                p = os.path.join(sdir, fn)
+                mtime, seen = os.path.getmtime(p), {}
+                with open(p) as f:
+                    for line in f:
+                        n, _, ts = line.strip().partition("\t")
+                        if n:
+                            # পুরনো লাইনে টাইমস্ট্যাম্প নেই, তখন ফাইলের mtime ধরে নিচ্ছি
+                            seen[n] = float(ts) if ts else mtime
+                by_ts = {}
+                for n, ts in seen.items():
+                    by_ts.setdefault(ts, []).append(n)
+                for ts, nums in by_ts.items():
+                    store.add_allocations(service, fn[7:-4], nums, ts=ts)
+                    counts["seen"] += len(nums)
+    return counts
+
+
+if __name__ == "__main__":
+    import bot
+    from journal import Journal
+    ap = argparse.ArgumentParser(description="user_data (snapshot + journal) আর numbers/seen ফোল্ডার SQLite এ মাইগ্রেট করে")
+    ap.add_argument("command", choices=["migrate"])
+    ap.add_argument("--db",   default=config.SQLITE_PATH)
+    ap.add_argument("--data", default=bot.STATE_FILE, help="snapshot; না থাকলে পুরনো user_data.json")
+    args = ap.parse_args()
+    st = SQLiteStore(args.db)
+    c  = migrate(st, Journal(args.data, bot._apply, bot._prepare, legacy=bot.DATA_FILE),
+                 config.NUMBER_DIR, config.SEEN_DIR)
+    st.close()
+    print(f"✅ Migrated → {args.db}: {c['users']} users, {c['numbers']} numbers, {c['seen']} seen")
@@ -0,0 +1,51 @@
+import pickle
+
+from aggregates import Aggregates, Rolling, TopN, sparkline
+
+
+def test_rolling_buckets_and_window():
+    r = Rolling(60, 3)
+    r.add(0, "a")
+    r.add(59, "a", 2)
+    r.add(60, "b")
+    assert r.series(3, now=60) == [{}, {"a": 3}, {"b": 1}]
+    r.add(180, "c")                      # slot 0 আবার ব্যবহার — পুরনো bucket মুছে যায়
+    assert r.series(3, now=180) == [{"b": 1}, {}, {"c": 1}]
+    r.add(0, "late")                     # window এর বাইরে — বাদ
+    assert r.sum(3, now=180) == {"b": 1, "c": 1}
+
+
+def test_rolling_series_skips_stale_slots():
+    r = Rolling(60, 3)
+    r.add(60, "a")
+    assert r.series(3, now=240) == [{}, {}, {}]
+
+
+def test_topn_incremental_matches_rebuild():
+    stats = {}
+    t = TopN(3)
+    for uid, n in [("1", 5), ("2", 1), ("3", 7), ("4", 2), ("2", 9), ("5", 6), ("4", 8)]:
+        stats[uid] = {"total": n}
+        t.update(uid, n)
+    fresh = TopN(3)
+    fresh.rebuild(stats)
+    assert t.top(3) == fresh.top(3) == [("2", 9), ("4", 8), ("3", 7)]
+    assert t.top(1) == [("2", 9)]
+
+
+def test_aggregates_pickle_and_dump():
+    agg = Aggregates()
+    agg.on_assign(1760000000, "WhatsApp", "BD", 4)
+    agg.on_otp(1760000000, "WhatsApp")
+    agg.top.update("1", 4)
+    assert agg.hit_rate("WhatsApp") == 0.25 and agg.hit_rate() == 0.25
+    p = pickle.loads(pickle.dumps(agg))
+    assert p.assigned_total == {"WhatsApp": 4} and p.top.top(1) == []   # top লোডের পর rebuild হয়
+    d = Aggregates.restore(agg.dump())
+    assert d.otps["day"].sum(1, now=1760000000) == {"WhatsApp": 1}
+    assert Aggregates.restore(None).hit_rate() == 0.0
+
+
+def test_sparkline():
+    assert sparkline([0, 0]) == "▁▁"
+    assert sparkline([0, 7, 14]) == "▁▅█"
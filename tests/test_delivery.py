@@ -0,0 +1,40 @@
+import asyncio
+
+import pytest
+
+from delivery import Delivery, DeliveryFailed
+
+
+class Bot:
+    def __init__(self):
+        self.sent = []
+
+    async def send_message(self, chat_id, text, **kw):
+        self.sent.append((chat_id, text))
+
+
+def test_deferred_jobs_are_pending_and_failed_on_stop():
+    async def go():
+        out = Delivery(workers=1, global_rate=1000, chat_rate=0.01, chat_burst=1)
+        bot = Bot()
+        out.start(bot)
+        first  = out.submit(1, "a")
+        second = out.submit(1, "b")    # একই চ্যাট, কোটা শেষ — অনেক পরে আবার queue তে
+        assert await first >= 0
+        for _ in range(10):
+            await asyncio.sleep(0)
+        assert out.pending == 1 and not second.done()
+        await out.stop()
+        assert out.pending == 0
+        with pytest.raises(DeliveryFailed):
+            await second
+        return bot.sent
+    assert asyncio.run(go()) == [(1, "a")]
+
+
+def test_chat_buckets_capped_while_busy():
+    out = Delivery(chat_rate=0.01, chat_burst=1, max_chats=100)
+    for chat in range(1000):
+        out._chat_bucket(chat).try_take()   # কেউই অলস নয়
+        assert len(out._chats) <= 100
+    assert 999 in out._chats and 0 not in out._chats   # পুরনোগুলো আগে বাদ
@@ -0,0 +1,46 @@
+import pickle
+
+from history import HistoryEntry, Ring, history_ring, otp_ring, to_ts
+
+
+def test_ring_overwrites_oldest():
+    r = Ring(3, range(5))
+    assert list(r) == [2, 3, 4]
+    assert (r[0], r[2]) == (2, 4)
+    assert r.newest(2) == [4, 3]
+    assert r.newest(10) == [4, 3, 2]
+    assert r.total == 5 and len(r) == 3
+
+
+def test_ring_after_counts_dropped_items():
+    r = Ring(3, range(2))
+    mark = r.total
+    r.extend(range(2, 4))
+    assert r.after(mark) == [2, 3]
+    r.extend(range(4, 10))
+    assert r.after(mark) == [7, 8, 9]   # মাঝের গুলো আর নেই
+    assert r.after(r.total) == []
+
+
+def test_ring_since_binary_search():
+    r = Ring(4, [(t,) for t in (10, 20, 30, 40, 50, 60)])
+    assert r.since(35) == [(40,), (50,), (60,)]
+    assert r.since(0) == [(30,), (40,), (50,), (60,)]
+    assert r.since(61) == []
+
+
+def test_ring_pickle_roundtrip():
+    r = Ring(3, range(7))
+    r2 = pickle.loads(pickle.dumps(r))
+    assert list(r2) == list(r) and r2.total == 7 and r2.cap == 3
+    r2.append(7)
+    assert list(r2) == [5, 6, 7]
+
+
+def test_legacy_dicts_become_tuples():
+    h = history_ring([{"service": "WhatsApp", "country": "BD", "number": "+88017", "time": "01 Jan 2026 10:00"}], 5)
+    assert h[0] == HistoryEntry(to_ts("01 Jan 2026 10:00"), "WhatsApp", "BD", "+88017")
+    assert h[0].ts > 0
+    o = otp_ring([{"time": 1760000000, "number": "88017", "otp": "1234", "uid": 7}], 5)
+    assert tuple(o[0]) == (1760000000, "", "88017", "1234", 7)
+    assert history_ring(h, 5) is h
@@ -0,0 +1,80 @@
+import pytest
+
+import journal
+from journal import Journal
+
+
+def apply(state, rec):
+    op, k, v = rec
+    state.setdefault("kv", {})[k] = v
+
+
+def make(tmp_path, **kw):
+    return Journal(str(tmp_path / "user_data.bin"), apply, **kw)
+
+
+def test_failed_write_keeps_records(tmp_path, monkeypatch):
+    j = make(tmp_path)
+    j.load()
+    j.append(("s", "a", 1))
+    j.take()()
+
+    def fail(fd):
+        raise OSError(28, "No space left on device")
+    j.append(("s", "b", 2))
+    with monkeypatch.context() as m:
+        m.setattr(journal.os, "fsync", fail)
+        with pytest.raises(OSError):
+            j.take()()
+    assert j.pending == 1
+    j.append(("s", "c", 3))
+    j.take()()
+    with open(j.segment_path(0)) as f:
+        assert len(f.read().splitlines()) == 3   # ব্যর্থ লেখার অর্ধেক লাইন রয়ে যায়নি
+    j.close()
+    assert make(tmp_path).load()["kv"] == {"a": 1, "b": 2, "c": 3}
+
+
+def test_failed_write_after_checkpoint_is_dropped(tmp_path, monkeypatch):
+    j = make(tmp_path)
+    state = j.load()
+    apply(state, ("s", "a", 1))
+    j.append(("s", "a", 1))
+    write = j.take()
+    j.checkpoint(state)
+
+    def fail(self, lines, seq=None):
+        raise OSError(5, "Input/output error")
+    monkeypatch.setattr(Journal, "write", fail)
+    with pytest.raises(OSError):
+        write()
+    assert j.pending == 0
+
+
+def test_replay_skips_torn_tail(tmp_path):
+    j = make(tmp_path)
+    j.load()
+    for i in range(3):
+        j.append(("s", f"k{i}", i))
+    j.take()()
+    with open(j.segment_path(0), "a") as f:
+        f.write('["s", "k3", ')        # crash এ অর্ধেক লেখা শেষ লাইন
+    j2 = make(tmp_path)
+    assert j2.load()["kv"] == {"k0": 0, "k1": 1, "k2": 2}
+    assert j2.replayed == 3
+    # নতুন লেখা নতুন segment এ — ভাঙা লাইনের সাথে জোড়া লাগে না
+    j2.append(("s", "k4", 4))
+    j2.take()()
+    assert j2.seq == 1
+    assert make(tmp_path).load()["kv"] == {"k0": 0, "k1": 1, "k2": 2, "k4": 4}
+
+
+def test_snapshot_plus_segments_after_compaction(tmp_path):
+    j = make(tmp_path, compact_every=2)
+    j.load()
+    for i in range(5):
+        j.append(("s", f"k{i}", i))
+        j.take()()
+    j.close()
+    assert j.compactions >= 1
+    assert make(tmp_path).load()["kv"] == {f"k{i}": i for i in range(5)}
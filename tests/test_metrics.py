@@ -0,0 +1,24 @@
+import asyncio
+from types import SimpleNamespace
+
+import metrics
+
+
+def test_last_seen_pruned_without_scrape(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(metrics.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(metrics, "_last_seen", {})
+    monkeypatch.setattr(metrics, "_prune_at", 1024)
+
+    @metrics.handler("test")
+    async def h(update, context):
+        pass
+
+    async def go():
+        for uid in range(20_000):
+            clock[0] += 1   # প্রতি সেকেন্ডে নতুন ইউজার — window এ থাকে শেষ ৯০০ জন
+            await h(SimpleNamespace(effective_user=SimpleNamespace(id=uid)), None)
+    asyncio.run(go())
+    # active_users() (metrics scrape) একবারও ডাকা হয়নি
+    assert len(metrics._last_seen) <= 2048
+    assert metrics.active_users() == metrics.ACTIVE_WINDOW + 1
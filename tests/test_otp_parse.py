@@ -0,0 +1,64 @@
+import json, os, re
+
+import pytest
+
+from otp_parse import get_otp, parse, parse_masked_all
+
+CORPUS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "bench", "otp_corpus.jsonl")
+
+
+# ── আগের parser, হুবহু ──
+def legacy_parse_masked(text):
+    return [(m.group(1), len(m.group(2)), m.group(3)) for m in re.finditer(r'(\d+)([Ⓐ-ⓩ]+)(\d+)', text)]
+
+
+def legacy_get_otp(text):
+    for p in [
+        r'(?i)(?:otp|code|verification|pin|কোড)[:\s\-]+(\d{4,8})',
+        r'(?i)(?:is|হলো)\s*[:\-]?\s*(\d{4,8})',
+        r'\b(\d{4,8})\b',
+    ]:
+        m = re.search(p, text)
+        if m:
+            return m.group(1)
+    return None
+
+
+def corpus():
+    with open(CORPUS, encoding="utf-8") as f:
+        return [json.loads(line)["text"] for line in f if line.strip()]
+
+
+def test_corpus_matches_legacy():
+    for t in corpus():
+        masked, otp = parse(t)
+        old = legacy_parse_masked(t)
+        assert [(p, h, s) for p, h, s, fmt in masked if fmt == "circled"] == old, t
+        assert get_otp(t) == legacy_get_otp(t), t
+        if old:
+            assert otp == legacy_get_otp(t), t
+
+
+def test_single_pass_matches_two_scans():
+    extra = ["Code: 12345ⓐⓑ678", "12ⓐ34ⓑ56 is 4321", "1**2 1234", "23423****435 pin 9999", "ıs 123456 and 12ⓐ34"]
+    for t in corpus() + extra:
+        masked = parse_masked_all(t)
+        assert parse(t) == (masked, get_otp(t) if masked else None), t
+
+
+@pytest.mark.parametrize("text, otp", [
+    ("📱 23496ⓗⓙⓍⓖ457\n🔑 Code: 7313", "7313"),          # keyword আগের bare সংখ্যাকে হারায়
+    ("1234 then your pin is 5678", "5678"),
+    ("call 1234, code is 987654", "987654"),              # "is" আগের bare কে হারায়
+    ("OTP\n\n 4455", "4455"),
+    ("no digits here", None),
+])
+def test_otp_priority(text, otp):
+    assert get_otp(text) == otp == legacy_get_otp(text)
+
+
+def test_mask_formats():
+    got = parse_masked_all("88034••••143 and 88033XXXX141 and 23423****435 and 12Ⓐ3")
+    assert [f for *_, f in got] == ["bullet", "x", "star", "circled"]
+    assert got[0][:3] == ("88034", 4, "143")
+    assert parse_masked_all("1**2") == []   # star এ ন্যূনতম দৈর্ঘ্য
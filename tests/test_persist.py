@@ -0,0 +1,35 @@
+import asyncio, time
+
+from persist import WriteBehind
+
+
+def test_flush_interval_counts_from_first_change():
+    async def go():
+        flushed = []
+        wb = WriteBehind(lambda keys: lambda: flushed.append((time.monotonic(), keys)), interval=0.2, batch=1000)
+        wb.start()
+        t0 = time.monotonic()
+        for i in range(8):
+            wb.mark_dirty(i)
+            await asyncio.sleep(0.05)   # থামা ছাড়াই পরিবর্তন চলছে
+        await wb.stop()
+        return t0, flushed
+    t0, flushed = asyncio.run(go())
+    assert flushed[0][0] - t0 < 0.35      # শেষ পরিবর্তনের জন্য অপেক্ষা নয়
+    assert set().union(*(k for _, k in flushed)) == set(range(8))
+
+
+def test_batch_flushes_immediately():
+    async def go():
+        flushed = []
+        wb = WriteBehind(lambda keys: lambda: flushed.append(keys), interval=60, batch=3)
+        wb.start()
+        for i in range(3):
+            wb.mark_dirty(i)
+        for _ in range(20):
+            await asyncio.sleep(0.01)
+            if flushed:
+                break
+        await wb.stop()
+        return flushed
+    assert asyncio.run(go())[0] == {0, 1, 2}
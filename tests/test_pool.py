@@ -0,0 +1,106 @@
+import threading
+
+from pool import NumberPool, PoolIndex
+
+NUMS = [f"88017000000{i:02d}" for i in range(20)]
+
+
+def test_take_hands_out_each_number_once():
+    pool = NumberPool(NUMS, {NUMS[0]: 1760000000, NUMS[1]: 1760000000})
+    got  = []
+    while True:
+        batch = pool.take(3)
+        if not batch:
+            break
+        got += batch
+    assert sorted(got) == NUMS[2:]
+    assert pool.counts() == (20, 20, 0)
+
+
+def test_take_skips_numbers_seen_elsewhere():
+    pool = NumberPool(NUMS, {})
+    pool.mark_seen(NUMS[:10], ts=1760000000)
+    assert len(pool) == 10
+    assert set(pool.take(20)) == set(NUMS[10:])
+
+
+def test_expire_releases_in_handout_order():
+    pool = NumberPool(NUMS, {NUMS[0]: 100, NUMS[1]: 200, NUMS[2]: 300})
+    assert pool.next_expiry() == 100
+    assert pool.expire(150) == [NUMS[0]]
+    assert pool.expire(150) == []
+    assert pool.counts() == (20, 2, 18)
+    assert sorted(pool.expire(300)) == NUMS[1:3]
+    assert len(pool) == 20
+
+
+def test_expire_ignores_entry_superseded_by_new_handout():
+    pool = NumberPool(NUMS[:1], {NUMS[0]: 100})
+    pool.release(NUMS[:1])
+    pool.mark_seen(NUMS[:1], ts=500)          # আবার দেওয়া হয়েছে — পুরনো এন্ট্রি বাতিল
+    assert pool.expire(200) == []
+    assert pool.seen_items() == [(NUMS[0], 500)]
+    assert pool.expire(500) == NUMS[:1]
+
+
+def test_seen_outside_stock_survives_clear_and_readd():
+    pool = NumberPool(NUMS[:3], {})
+    pool.take(3)
+    pool.clear()
+    assert pool.counts() == (0, 3, 0)
+    pool.add(NUMS[:5])
+    assert pool.counts() == (5, 3, 2)         # মুছে আবার আপলোড — আগের seen বহাল
+    assert sorted(pool.take(5)) == NUMS[3:5]
+
+
+def test_load_does_not_block_other_pools():
+    gate, loading = threading.Event(), threading.Event()
+
+    def load_seen(service, country):
+        if country == "slow":
+            loading.set()
+            gate.wait(5)
+        return {}
+    idx = PoolIndex(lambda s, c: NUMS, load_seen)
+    idx.get("WhatsApp", "fast")
+    warm = threading.Thread(target=idx.get, args=("WhatsApp", "slow"))
+    warm.start()
+    assert loading.wait(5)
+
+    got = []
+    t = threading.Thread(target=lambda: got.append(idx.take("WhatsApp", "fast", 2)))
+    t.start()
+    t.join(1)
+    assert len(got) == 1 and len(got[0]) == 2   # ধীর লোড lock ধরে রাখেনি
+    gate.set()
+    warm.join()
+    assert idx.service_counts("WhatsApp") == (40, 2, 38)
+
+
+def test_check_rebuilds_from_disk():
+    seen = {}
+    idx  = PoolIndex(lambda s, c: NUMS, lambda s, c: dict(seen))
+    idx.take("WhatsApp", "BD", 3)
+    seen.update(dict.fromkeys(NUMS[:5], 1760000000))   # ডিস্ক বদলেছে, index জানে না
+    got = idx.check(["WhatsApp"], lambda s: ["BD", "IN"])
+    assert got == [("WhatsApp", "BD", (20, 3, 17), (20, 5, 15))]
+    assert idx.service_counts("WhatsApp") == (40, 10, 30)
+
+
+def test_check_rereads_pool_changed_while_reading():
+    seen = {}
+    idx  = PoolIndex(lambda s, c: NUMS, lambda s, c: dict(seen))
+    idx.get("WhatsApp", "BD")
+    real, calls = idx._load, []
+
+    def load(service, country):
+        pool = real(service, country)
+        calls.append(country)
+        if len(calls) == 1:
+            # পড়ার মাঝে বরাদ্দ (bot এ add_seen আগে ডিস্কে লেখে) — এই পড়াটা পুরনো
+            seen.update(dict.fromkeys(idx.take("WhatsApp", "BD", 2), 1760000000))
+        return pool
+    idx._load = load
+    assert idx.check(["WhatsApp"], lambda s: ["BD"]) == []
+    assert calls == ["BD", "BD"]
+    assert idx.service_counts("WhatsApp") == (20, 2, 18)
@@ -0,0 +1,52 @@
+import time
+
+from ratelimit import ALLOW, DROP, NOTIFY, KeyedLimiter, TokenBucket
+
+
+def test_token_bucket_refill():
+    b = TokenBucket(2, 2)
+    b.last = 0.0
+    assert b.try_take(now=0.0) and b.try_take(now=0.0)
+    assert not b.try_take(now=0.0)
+    assert b.delay(now=0.25) == 0.25
+    assert b.try_take(now=0.5)
+
+
+def test_notify_once_then_drop():
+    t   = time.monotonic() + 100
+    lim = KeyedLimiter({"default": (1, 2)})
+    got = [lim.check(1, "number", now=t) for _ in range(5)]
+    assert got == [ALLOW, ALLOW, NOTIFY, DROP, DROP]
+    assert lim.check(2, "number", now=t) == ALLOW          # অন্য ইউজার আলাদা
+    assert lim.check(1, "stock", now=t) == ALLOW           # অন্য অ্যাকশন আলাদা
+    assert lim.check(1, "number", now=t + 1) == ALLOW      # টোকেন ফিরেছে
+    assert lim.check(1, "number", now=t + 1) == NOTIFY     # নতুন দফা, আবার একবার জানাও
+
+
+def test_sweep_drops_idle_buckets():
+    t   = time.monotonic() + 100
+    lim = KeyedLimiter({"default": (1, 1)}, sweep_every=10)
+    lim.check(1, "a", now=t)
+    lim.check(2, "a", now=t + 9.5)
+    lim.sweep(now=t + 10)
+    assert len(lim) == 1   # 1 আবার ভরে গেছে, 2 এখনো খালি
+
+
+def test_full_limiter_evicts_oldest_not_every_time():
+    lim = KeyedLimiter({"default": (0.001, 1)}, sweep_every=1e9, max_keys=100)
+    t   = time.monotonic() + 100
+    for uid in range(100):
+        lim.check(uid, "a", now=t)
+    sweeps = 0
+    real = lim.sweep
+
+    def counted(now=None):
+        nonlocal sweeps
+        sweeps += 1
+        real(now)
+    lim.sweep = counted
+    for uid in range(100, 150):
+        assert lim.check(uid, "a", now=t) == ALLOW
+    assert sweeps == 5            # প্রতি ১০টা নতুন key তে একবার, প্রতিবার নয়
+    assert len(lim) <= 100
+    assert (0, "a") not in lim._buckets and (149, "a") in lim._buckets
@@ -0,0 +1,81 @@
+import os
+
+import pytest
+
+from journal import Journal
+from storage_sqlite import SQLiteStore, migrate
+
+
+@pytest.fixture
+def bot():
+    import bot
+    return bot
+
+
+def journal(bot, path):
+    return Journal(str(path / "user_data.bin"), bot._apply, bot._prepare, legacy=str(path / "user_data.json"))
+
+
+def test_migrate_seen_with_timestamps(tmp_path, bot):
+    numbers, seen = tmp_path / "numbers" / "WhatsApp", tmp_path / "seen" / "WhatsApp"
+    numbers.mkdir(parents=True)
+    seen.mkdir(parents=True)
+    (numbers / "Bangladesh.txt").write_text("8801700000001\n8801700000002\n8801700000003\n")
+    (seen / "global_Bangladesh.txt").write_text("8801700000001\t1760000000\n8801700000002\n")
+    os.utime(seen / "global_Bangladesh.txt", (1750000000, 1750000000))
+
+    store = SQLiteStore(str(tmp_path / "bot.db"))
+    c = migrate(store, journal(bot, tmp_path), str(tmp_path / "numbers"), str(tmp_path / "seen"))
+    assert c["numbers"] == 3 and c["seen"] == 2
+    assert store.seen("WhatsApp", "Bangladesh") == {"8801700000001": 1760000000.0, "8801700000002": 1750000000.0}
+    store.close()
+
+
+def test_migrate_replays_journal(tmp_path, bot):
+    j = journal(bot, tmp_path)
+    state = j.load()
+    for rec in (("u+", 7), ("t", "7", "WhatsApp", "Bangladesh", 1, ["8801700000001"], 1760000000)):
+        bot._apply(state, rec)
+        j.append(rec)
+    j.checkpoint(state)
+    # snapshot এর পরের পরিবর্তন শুধু segment এ
+    for rec in (("u+", 8), ("t", "8", "Telegram", "India", 1, ["919800000001"], 1760000100),
+                ("o", 1760000200, "Telegram", "919800000001", "123456", 8)):
+        j.append(rec)
+    j.take()()
+
+    store = SQLiteStore(str(tmp_path / "bot.db"))
+    c = migrate(store, journal(bot, tmp_path), str(tmp_path / "numbers"), str(tmp_path / "seen"))
+    d = bot._prepare(store.load_state())
+    store.close()
+    assert c["users"] == 2
+    assert sorted(d["USERS"]) == [7, 8]
+    assert d["USER_STATS"]["8"] == {"total": 1, "services": {"Telegram": {"India": 1}}}
+    assert [tuple(e) for e in d["OTP_LOG"]] == [(1760000200, "Telegram", "919800000001", "123456", 8)]
+    assert d["AGGREGATES"].otp_total == {"Telegram": 1}
+
+
+def test_dropped_user_stays_dropped(tmp_path, bot):
+    path  = str(tmp_path / "bot.db")
+    store = SQLiteStore(path)
+    state = bot._prepare(store.load_state())
+    for rec in (("u+", 7), ("u+", 8), ("t", "8", "WhatsApp", "Bangladesh", 1, ["8801700000001"], 1760000000)):
+        bot._apply(state, rec)
+    store.snapshot({"7", "8"}, state)()
+    bot._apply(state, ("u-", 8))
+    store.snapshot({"8"}, state)()
+    store.close()
+
+    store = SQLiteStore(path)
+    d = bot._prepare(store.load_state())
+    store.close()
+    assert sorted(d["USERS"]) == [7]
+    assert d["USER_STATS"]["8"]["total"] == 1
+
+
+def test_seen_skips_expired(tmp_path):
+    store = SQLiteStore(str(tmp_path / "bot.db"))
+    store.add_allocations("WhatsApp", "Bangladesh", ["8801700000001"], ts=1000)
+    store.add_allocations("WhatsApp", "Bangladesh", ["8801700000002"], ts=2000)
+    assert store.seen("WhatsApp", "Bangladesh", cutoff=1500) == {"8801700000002": 2000.0}
+    store.close()
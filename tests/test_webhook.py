@@ -0,0 +1,64 @@
+import asyncio
+
+from httpserver import HttpServer
+from webhook import SECRET_HEADER, WebhookServer
+
+
+class App:
+    def __init__(self):
+        self.bot          = None
+        self.update_queue = asyncio.Queue()
+
+
+async def request(port, head, body=b""):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(head.encode("latin-1") + b"\r\n\r\n" + body)
+    await writer.drain()
+    data = await asyncio.wait_for(reader.read(), 5)
+    writer.close()
+    status = int(data.split(b" ", 2)[1])
+    return status, data.partition(b"\r\n\r\n")[2]
+
+
+def test_secret_checked_before_body():
+    async def go():
+        server = WebhookServer(App(), "/telegram", "s3cret", port=0)
+        await server.http.start()
+        try:
+            # body কখনো পাঠানো হয় না — উত্তর না এলে wait_for timeout হতো
+            status, _ = await request(server.http.port,
+                                      "POST /telegram HTTP/1.1\r\nContent-Length: 40000000")
+            assert status == 403 and server.rejected == 1
+            status, _ = await request(server.http.port,
+                                      f"POST /telegram HTTP/1.1\r\n{SECRET_HEADER}: s3cret\r\n"
+                                      f"Content-Length: 2000000")
+            assert status == 413
+        finally:
+            await server.http.stop()
+    asyncio.run(go())
+
+
+def test_500_does_not_leak_exception(capsys):
+    def handler(req):
+        raise RuntimeError("db password is hunter2")
+
+    async def go():
+        http = await HttpServer(handler).start()
+        try:
+            return await request(http.port, "GET /x HTTP/1.1\r\nConnection: close")
+        finally:
+            await http.stop()
+    status, body = asyncio.run(go())
+    assert status == 500 and b"hunter2" not in body
+    assert "hunter2" in capsys.readouterr().out
+
+
+def test_bad_content_length():
+    async def go():
+        http = await HttpServer(lambda req: (200, "ok"), max_body=1024).start()
+        try:
+            return [(await request(http.port, f"POST /x HTTP/1.1\r\nContent-Length: {v}"))[0]
+                    for v in ("abc", "-5", "1_000", "4096")]
+        finally:
+            await http.stop()
+    assert asyncio.run(go()) == [400, 400, 400, 413]
@@ -0,0 +1,102 @@
+import asyncio
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+
+# ════════════════════════════════════════════════════════
+#        CONCURRENT UPDATES (per-user ordering সহ)
+# ════════════════════════════════════════════════════════
+class OrderedUpdateProcessor(BaseUpdateProcessor):
+    """
+    আলাদা ইউজারের update একসাথে চলে (সর্বোচ্চ `limit` টা), কিন্তু একই ইউজার/চ্যাটের update
+    আসার ক্রমেই একটার পর একটা চলে — UPLOAD_MODE, user_data["mode"] এর ক্রম ঠিক থাকে।
+    OTP গ্রুপের পোস্ট আলাদা lane এ (`otp_lanes` টা), ইউজার ট্রাফিকের পেছনে কখনো দাঁড়ায় না।
+    """
+
+    # base class এর semaphore শুধু মোট টাস্কের একটা উপরের সীমা; আসল limit lane গুলোতে
+    BACKLOG = 10_000
+
+    def __init__(self, limit=16, otp_chat_id=None, otp_lanes=4):
+        super().__init__(self.BACKLOG)
+        self.limit       = limit
+        self.otp_chat_id = otp_chat_id
+        self._lane       = asyncio.BoundedSemaphore(limit)
+        self._otp        = asyncio.BoundedSemaphore(otp_lanes)
+        self._locks      = {}   # key → [Lock, অপেক্ষমাণ/চলমান update সংখ্যা]
+        self.processed   = 0
+        self.otp         = 0
+        self.contended   = 0    # একই ইউজারের আগের update শেষ হওয়ার অপেক্ষায় ছিল
+
+    async def initialize(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+    def _is_otp(self, update):
+        chat = update.effective_chat if isinstance(update, Update) else None
+        return chat is not None and chat.id == self.otp_chat_id
+
+    @staticmethod
+    def _keys(update):
+        if not isinstance(update, Update):
+            return ()
+        user, chat = update.effective_user, update.effective_chat
+        keys = []
+        if user is not None:
+            keys.append(("u", user.id))
+        if chat is not None and (user is None or chat.id != user.id):
+            keys.append(("c", chat.id))
+        return keys
+
+    def _ref(self, key):
+        entry = self._locks.get(key)
+        if entry is None:
+            entry = self._locks[key] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        return entry[0]
+
+    def _unref(self, key):
+        entry = self._locks[key]
+        entry[1] -= 1
+        if entry[1] == 0:
+            del self._locks[key]
+
+    async def do_process_update(self, update, coroutine):
+        if self._is_otp(update):
+            try:
+                async with self._otp:
+                    self.otp += 1
+                    await coroutine
+            except BaseException:
+                coroutine.close()
+                raise
+            return
+
+        keys  = self._keys(update)
+        locks = [self._ref(k) for k in keys]
+        held  = []
+        try:
+            # সবসময় একই ক্রমে (user → chat) নেওয়া হয়, তাই deadlock হয় না
+            for lock in locks:
+                if lock.locked():
+                    self.contended += 1
+                await lock.acquire()
+                held.append(lock)
+            async with self._lane:
+                self.processed += 1
+                await coroutine
+        except BaseException:
+            # await এর আগেই cancel হলে "never awaited" warning এড়াতে
+            coroutine.close()
+            raise
+        finally:
+            for lock in held:
+                lock.release()
+            for k in keys:
+                self._unref(k)
+
+    def stats(self):
+        return {
+            "processed": self.processed, "otp": self.otp, "contended": self.contended,
+            "active_keys": len(self._locks), "limit": self.limit,
+        }
@@ -0,0 +1,96 @@
+import asyncio, hmac, json, secrets, signal
+from telegram import Update
+
+from httpserver import HttpServer
+
+# ════════════════════════════════════════════════════════
+#              WEBHOOK MODE (run_polling এর বিকল্প)
+# ════════════════════════════════════════════════════════
+# Telegram সরাসরি আমাদের HTTP সার্ভারে update POST করে; সেটা যাচাই করে সোজা
+# app.update_queue তে দেওয়া হয়। /healthz = প্রসেস চলছে, /readyz = update নিতে প্রস্তুত।
+SECRET_HEADER = "x-telegram-bot-api-secret-token"
+MAX_UPDATE    = 1024 * 1024   # একটা update কয়েক KB — এর বেশি body পড়াই হয় না
+
+
+class WebhookServer:
+    def __init__(self, app, path="/telegram", secret="", host="127.0.0.1", port=8443):
+        self.app      = app
+        self.path     = path
+        self.secret   = secret
+        self.ready    = False
+        self.received = 0
+        self.rejected = 0
+        self.http     = HttpServer(self._handle, host, port, max_body=MAX_UPDATE, precheck=self._precheck)
+
+    def _precheck(self, req):
+        """secret token body পড়ার আগেই — অচেনা কেউ বড় body পাঠিয়ে মেমোরি/সময় নিতে পারে না"""
+        if req.path != self.path:
+            return None
+        if req.method != "POST":
+            return 405, {"ok": False}
+        token = req.headers.get(SECRET_HEADER, "")
+        if not (self.secret and hmac.compare_digest(token, self.secret)):
+            self.rejected += 1
+            return 403, {"ok": False}
+        return None
+
+    async def _handle(self, req):
+        if req.path == self.path:
+            return await self._update(req)
+        if req.path == "/healthz":
+            return 200, {"ok": True}
+        if req.path == "/readyz":
+            body = {"ready": self.ready, "queue": self.app.update_queue.qsize(), "received": self.received}
+            return (200 if self.ready else 503), body
+        return 404, {"ok": False}
+
+    async def _update(self, req):
+        # method আর secret _precheck এ যাচাই হয়ে গেছে
+        if not self.ready:
+            # Telegram পরে আবার পাঠাবে
+            return 503, {"ok": False}
+        try:
+            update = Update.de_json(json.loads(req.body), self.app.bot)
+        except ValueError:
+            return 400, {"ok": False}
+        self.received += 1
+        await self.app.update_queue.put(update)
+        return 200, {"ok": True}
+
+
+async def run(app, url, path="/telegram", secret="", host="127.0.0.1", port=8443,
+              allowed_updates=None):
+    """
+    run_polling এর মতোই পুরো lifecycle চালায় (initialize → post_init → start → … → post_shutdown),
+    শুধু update আসে webhook দিয়ে। SIGINT/SIGTERM এ থামে।
+    """
+    secret = secret or secrets.token_urlsafe(32)
+    server = WebhookServer(app, path, secret, host, port)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass
+
+    await server.http.start()
+    await app.initialize()
+    try:
+        if app.post_init:
+            await app.post_init(app)
+        await app.bot.set_webhook(url.rstrip("/") + path, secret_token=secret, allowed_updates=allowed_updates)
+        await app.start()
+        server.ready = True
+        print(f"[WEBHOOK] 🌐 listening on {host}:{server.http.port}{path}")
+        await stop.wait()
+    finally:
+        server.ready = False
+        if app.running:
+            await app.stop()
+            if app.post_stop:
+                await app.post_stop(app)
+        await server.http.stop()
+        await app.shutdown()
+        if app.post_shutdown:
+            await app.post_shutdown(app)